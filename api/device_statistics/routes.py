@@ -2,6 +2,8 @@ from flask import Blueprint, jsonify, request
 import os
 import pandas as pd
 from ..utils.auth import require_access
+from ..utils.response_cache import cached_response, cached_etag
+from ..utils.etag import conditional_response, content_hash
 
 # Create the blueprint
 device_statistics_bp = Blueprint('device_statistics', __name__)
@@ -27,6 +29,8 @@ print(f"[DEBUG] Using data source: {data_source}")
 
 @device_statistics_bp.route('/device-data', methods=['GET'])
 @require_access
+@conditional_response(cached_etag)
+@cached_response(ttl=300)
 def get_device_data():
     """
     Get device statistics data.
@@ -132,8 +136,38 @@ def get_other_fab_device_data(fac_id):
     return jsonify(result)
 
 
+def get_tool_options_data(fac_id):
+    """
+    Tool options for a fab: categories for R3, tools for M* fabs.
+
+    Returns:
+        dict or None: Options response, or None for an unsupported facility
+    """
+    # For R3, return category-based options
+    if fac_id == 'R3':
+        return {
+            "type": "categories",
+            "options": device_info.get_r3_options()
+        }
+
+    # For M* fabs, return tool-based options
+    elif fac_id.startswith('M'):
+        return {
+            "type": "tools",
+            "options": device_info.get_other_fab_tools(fac_id)
+        }
+
+    return None
+
+
+def tool_options_version():
+    """Content hash of the requested fab's tool options, computed without serializing a response"""
+    return content_hash(repr(get_tool_options_data(request.args.get('fac_id', ''))).encode())
+
+
 @device_statistics_bp.route('/tool-options', methods=['GET'])
 @require_access
+@conditional_response(tool_options_version)
 def get_tool_options():
     """
     Get available tool options for a specific fab.
@@ -148,21 +182,10 @@ def get_tool_options():
     
     if not fac_id:
         return jsonify({"error": "fac_id is required"}), 400
-    
-    # For R3, return category-based options
-    if fac_id == 'R3':
-        return jsonify({
-            "type": "categories",
-            "options": device_info.get_r3_options()
-        })
-    
-    # For M* fabs, return tool-based options
-    elif fac_id.startswith('M'):
-        return jsonify({
-            "type": "tools",
-            "options": device_info.get_other_fab_tools(fac_id)
-        })
-    
-    else:
+
+    data = get_tool_options_data(fac_id)
+    if data is None:
         return jsonify({"error": f"Unsupported facility: {fac_id}"}), 400
 
+    return jsonify(data)
+
@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify
 import os
 from ..utils.auth import require_access
+from ..utils.response_cache import cached_response
+from ..utils.etag import conditional_response, dataframe_version
 
 # Create blueprint
 equipment_status_bp = Blueprint('equipment_status', __name__, url_prefix='/equipment-status')
@@ -26,6 +28,7 @@ else:
 
 @equipment_status_bp.route('/current-status', methods=['GET'])
 @require_access
+@conditional_response(lambda: dataframe_version(sem_lists.df))
 def get_equipment_status():
     """Get current equipment status using environment-aware data loading"""
     try:
@@ -53,6 +56,8 @@ def get_equipment_status():
 
 @equipment_status_bp.route('/storage', methods=['GET'])
 @require_access
+@conditional_response(lambda: dataframe_version(storage.df))
+@cached_response(ttl=300)
 def get_equipment_storage():
     """Get equipment storage information using environment-aware data loading"""
     try:
@@ -89,6 +94,8 @@ def get_equipment_storage():
 
 @equipment_status_bp.route('/not_available', methods=['GET'])
 @require_access
+@conditional_response(lambda: dataframe_version(sem_lists.df, storage.df) if data_source == 'dummy' else None)
+@cached_response(ttl=300)
 def get_not_available_equipment():
     """Get equipment that is not available (Off status, empty version, or empty storage)"""
     try:
@@ -0,0 +1,198 @@
+"""
+Rolling fail-ratio anomaly detection per (eqp_id, Recipe).
+
+Each run's fail_ratio is compared with a p-chart style control limit built from
+the EWMA of the preceding runs of the same tool and recipe:
+
+    center = EWMA(previous fail ratios)
+    UCL    = center + SIGMA_LIMIT * sqrt(center * (1 - center) / total_images)
+
+All groups are processed in one grouped pass over the time-sorted history.
+Results are computed by a scheduled job and published to the job result
+store, from which every worker serves the latest version; if there is none,
+or it is older than RESULT_MAX_AGE, one worker recomputes and publishes it
+under a Redis lock while the others serve the stale version or wait for it.
+"""
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from redis.exceptions import RedisError
+from ..utils.app_logger import logger
+from ..utils.job_results import job_results
+from ..utils.redis_lock import RedisLock
+
+MEAS_HIST_COLUMNS = ['Timestamp', 'eqp_id', 'Recipe', 'MSR', 'LotID', 'Align_fail',
+                     'fail_images', 'total_images', 'fail_ratio']
+GROUP_KEYS = ['eqp_id', 'Recipe']
+
+EWMA_SPAN = 20
+ROLLING_WINDOW = 20
+SIGMA_LIMIT = 3.0
+CRITICAL_SIGMA = 6.0
+MIN_HISTORY = 3  # Previous runs needed before a run can be flagged
+
+RESULT_JOB = 'fail_ratio_analysis'
+RESULT_MAX_AGE = 1800  # seconds before a published result is recomputed on read
+REFRESH_LOCK = 'fail_ratio:refresh:lock'
+REFRESH_WAIT = 60  # seconds a reader without any result waits for another worker's refresh
+
+
+def compute_fail_ratio_stats(meas_hist_df):
+    """
+    Compute EWMA/rolling fail ratios and control limits for every run.
+
+    Args:
+        meas_hist_df: Measurement history with MEAS_HIST_COLUMNS
+
+    Returns:
+        pd.DataFrame: One row per run in Timestamp order with ewma, rolling_mean,
+            center, ucl, sigma_excess and flagged columns
+    """
+    df = meas_hist_df[MEAS_HIST_COLUMNS].sort_values('Timestamp', kind='stable').reset_index(drop=True)
+    ratio = df['fail_ratio'].astype('float64')
+    grouped = ratio.groupby([df[key] for key in GROUP_KEYS], sort=False, observed=True)
+
+    df['ewma'] = grouped.ewm(span=EWMA_SPAN, adjust=True).mean().droplevel(list(range(len(GROUP_KEYS))))
+    df['rolling_mean'] = grouped.rolling(ROLLING_WINDOW, min_periods=1).mean().droplevel(
+        list(range(len(GROUP_KEYS))))
+
+    # Center line from previous runs only, so a spike does not raise its own limit
+    group_ids = df.groupby(GROUP_KEYS, sort=False, observed=True).ngroup()
+    df['history'] = df.groupby(group_ids, sort=False).cumcount()
+    df['center'] = df['ewma'].groupby(group_ids, sort=False).shift(1)
+
+    center = df['center'].clip(lower=1e-6, upper=1 - 1e-6)
+    sigma = np.sqrt(center * (1 - center) / df['total_images'].clip(lower=1))
+    df['ucl'] = (df['center'] + SIGMA_LIMIT * sigma).clip(upper=1.0)
+    df['sigma_excess'] = (ratio - df['center']) / sigma
+    df['flagged'] = (df['history'] >= MIN_HISTORY) & (ratio > df['ucl'])
+    return df
+
+
+def summarize(stats_df):
+    """
+    Build the cached payload: flagged runs, per (eqp_id, Recipe) stats and a summary.
+
+    Returns:
+        dict: JSON-serializable result
+    """
+    flagged = stats_df[stats_df['flagged']].sort_values('Timestamp', ascending=False)
+    flagged_runs = pd.DataFrame({
+        'Timestamp': flagged['Timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S'),
+        'eqp_id': flagged['eqp_id'],
+        'Recipe': flagged['Recipe'],
+        'MSR': flagged['MSR'],
+        'LotID': flagged['LotID'],
+        'Align_fail': flagged['Align_fail'],
+        'fail_images': flagged['fail_images'],
+        'total_images': flagged['total_images'],
+        'fail_ratio': flagged['fail_ratio'].round(4),
+        'center': flagged['center'].round(4),
+        'ucl': flagged['ucl'].round(4),
+        'sigma_excess': flagged['sigma_excess'].round(2),
+        'severity': np.where(flagged['sigma_excess'] >= CRITICAL_SIGMA, 'critical', 'warning'),
+    })
+
+    grouped = stats_df.assign(align_fail=stats_df['Align_fail'] == 'Fail').groupby(
+        GROUP_KEYS, sort=True, observed=True)
+    group_stats = grouped.agg(
+        runs=('fail_ratio', 'size'),
+        mean_fail_ratio=('fail_ratio', 'mean'),
+        ewma=('ewma', 'last'),
+        rolling_mean=('rolling_mean', 'last'),
+        flagged_runs=('flagged', 'sum'),
+        align_fail_runs=('align_fail', 'sum'),
+        last_run=('Timestamp', 'max'),
+    ).reset_index()
+    group_stats['last_run'] = group_stats['last_run'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    for column in ['mean_fail_ratio', 'ewma', 'rolling_mean']:
+        group_stats[column] = group_stats[column].round(4)
+
+    return {
+        'flagged': flagged_runs.to_dict('records'),
+        'stats': group_stats.to_dict('records'),
+        'summary': {
+            'runs': int(len(stats_df)),
+            'groups': int(len(group_stats)),
+            'flagged': int(len(flagged_runs)),
+            'critical': int((flagged_runs['severity'] == 'critical').sum()),
+            'warning': int((flagged_runs['severity'] == 'warning').sum()),
+            'align_fail': int((stats_df['Align_fail'] == 'Fail').sum()),
+        },
+        'parameters': {
+            'ewma_span': EWMA_SPAN,
+            'rolling_window': ROLLING_WINDOW,
+            'sigma_limit': SIGMA_LIMIT,
+            'min_history': MIN_HISTORY,
+        },
+        'computed_at': datetime.now().isoformat(),
+    }
+
+
+class FailRatioService:
+    """
+    Computes fail-ratio results and publishes them to the job result store.
+
+    Args:
+        loader: Callable(columns) returning measurement history
+        store: JobResultStore shared by all workers
+    """
+
+    def __init__(self, loader, store=job_results, max_age=RESULT_MAX_AGE):
+        self.loader = loader
+        self.store = store
+        self.max_age = max_age
+
+    def compute(self):
+        return summarize(compute_fail_ratio_stats(self.loader(columns=MEAS_HIST_COLUMNS)))
+
+    def refresh(self):
+        """Recompute from the measurement history and publish a new result version"""
+        started = time.perf_counter()
+        result = self.compute()
+        published = self.store.publish(RESULT_JOB, result, meta=result['summary'])
+
+        logger.info("Fail ratio analysis updated",
+                    version=published['version'],
+                    runs=result['summary']['runs'],
+                    flagged=result['summary']['flagged'],
+                    duration=round(time.perf_counter() - started, 3))
+        return result
+
+    def _is_fresh(self, result):
+        return result is not None and time.time() - result['created_at'] <= self.max_age
+
+    def get(self):
+        """
+        Return the latest published result, computing one if it is missing or too old.
+        Only the worker holding the refresh lock recomputes; others serve the stale
+        result, or wait for the new one if there is none.
+        """
+        try:
+            latest = self.store.get(RESULT_JOB)
+            if self._is_fresh(latest):
+                return latest['payload']
+
+            lock = RedisLock(REFRESH_LOCK)
+            if latest is not None:
+                acquired = lock.acquire(retry_times=0)
+            else:
+                acquired = lock.acquire(retry_times=REFRESH_WAIT, retry_delay=1)
+            if not acquired:
+                if latest is not None:
+                    return latest['payload']
+                logger.warning("Fail ratio refresh still running elsewhere, computing locally")
+                return self.compute()
+
+            try:
+                # Another worker may have published while this one waited for the lock
+                latest = self.store.get(RESULT_JOB)
+                if self._is_fresh(latest):
+                    return latest['payload']
+                return self.refresh()
+            finally:
+                lock.release()
+        except RedisError as e:
+            logger.warning("Job result store unavailable, computing fail ratios locally", error=str(e))
+            return self.compute()
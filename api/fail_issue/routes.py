@@ -0,0 +1,76 @@
+from flask import Blueprint, jsonify, request
+import os
+from ..utils.auth import require_access
+from .fail_ratio import FailRatioService
+
+# Create blueprint
+fail_issue_bp = Blueprint('fail_issue', __name__)
+
+# Environment detection
+def get_data_source():
+    """Determine data source based on DATA_SOURCE_MODE environment variable"""
+    env_mode = os.environ.get('DATA_SOURCE_MODE')
+    if env_mode in ['dummy', 'real']:
+        return env_mode
+
+    # Default to dummy if no environment variable is set
+    return 'dummy'
+
+# Import appropriate data modules based on environment
+data_source = get_data_source()
+if data_source == 'real':
+    # TODO: Add real measurement history loader for work environment
+    fail_ratio_service = None
+else:
+    from ..skewvoir_beta.dummy.sample_data import load_meas_hist
+    fail_ratio_service = FailRatioService(load_meas_hist)
+
+
+def _not_implemented():
+    return jsonify({
+        'status': 'error',
+        'message': 'Real data source not implemented'
+    }), 501
+
+
+@fail_issue_bp.route('/fail-ratio', methods=['GET'])
+@require_access
+def get_fail_ratio():
+    """
+    Get runs flagged above their fail-ratio control limit and per (eqp_id, Recipe) statistics.
+
+    Query Parameters:
+        eqp_id (str): Optional equipment filter
+        recipe (str): Optional recipe filter
+    """
+    if fail_ratio_service is None:
+        return _not_implemented()
+
+    try:
+        result = fail_ratio_service.get()
+        flagged = result['flagged']
+        stats = result['stats']
+
+        eqp_id = request.args.get('eqp_id')
+        recipe = request.args.get('recipe')
+        if eqp_id:
+            flagged = [run for run in flagged if run['eqp_id'] == eqp_id]
+            stats = [group for group in stats if group['eqp_id'] == eqp_id]
+        if recipe:
+            flagged = [run for run in flagged if run['Recipe'] == recipe]
+            stats = [group for group in stats if group['Recipe'] == recipe]
+
+        return jsonify({
+            'status': 'success',
+            'data': flagged,
+            'stats': stats,
+            'summary': result['summary'],
+            'parameters': result['parameters'],
+            'computed_at': result['computed_at'],
+            'total': len(flagged)
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
@@ -0,0 +1,82 @@
+"""
+Dummy measurement images for development environment.
+Image names referenced by the dummy MSR and recipe data do not exist on disk,
+so a deterministic SEM-like grayscale image is generated for a referenced
+name on first access. Other names are not found, which keeps the number of
+generated files bounded by the dummy data.
+"""
+import os
+import hashlib
+import threading
+import numpy as np
+from config import Config
+
+SAMPLE_IMAGE_ROOT = os.path.join(Config.SKEWVOIR_DATA_DIR, 'dummy', 'images')
+SAMPLE_IMAGE_SIZE = 1024
+IMAGE_FORMATS = {'.tif': 'TIFF', '.tiff': 'TIFF', '.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG'}
+RECIPE_IMAGE_COLUMNS = {
+    'wafer_mp_df': ['img_meas2'],
+    'idp_image_df': ['img_add1', 'img_add2', 'img_meas1', 'img_meas2', 'image_add3'],
+}
+
+_known_names = None
+_known_names_mtime = None
+_known_names_lock = threading.Lock()
+
+
+def known_names():
+    """Image names referenced by the dummy MSR and recipe data (re-read when the MSR data is regenerated)"""
+    global _known_names, _known_names_mtime
+    from ...recipe_search.dummy import recipe_open_data
+    from ...skewvoir_beta.dummy import sample_data
+
+    with _known_names_lock:
+        sample_data.ensure_parquet()
+        mtime = os.path.getmtime(sample_data.MSR_PARQUET)
+        if _known_names is None or mtime != _known_names_mtime:
+            msr_df = sample_data.load_msr_data(columns=['mp_image_name_01'])
+            names = set(msr_df['mp_image_name_01'].dropna())
+            for frame_name, columns in RECIPE_IMAGE_COLUMNS.items():
+                frame = getattr(recipe_open_data, frame_name)
+                for column in columns:
+                    names.update(frame[column].dropna())
+            _known_names = frozenset(names)
+            _known_names_mtime = mtime
+        return _known_names
+
+
+def _render(name):
+    seed = int(hashlib.md5(name.encode()).hexdigest()[:8], 16)
+    rng = np.random.default_rng(seed)
+
+    # Periodic line pattern with noise, roughly like a CD-SEM line/space image
+    pitch = rng.integers(40, 120)
+    width = pitch * rng.uniform(0.3, 0.6)
+    x = np.arange(SAMPLE_IMAGE_SIZE)
+    lines = ((x % pitch) < width).astype(np.float64)
+    edges = np.abs(np.diff(lines, prepend=lines[0]))
+    profile = 60 + 90 * lines + 80 * np.convolve(edges, np.ones(5) / 5, mode='same')
+    image = np.tile(profile, (SAMPLE_IMAGE_SIZE, 1)) + rng.normal(0, 18, (SAMPLE_IMAGE_SIZE, SAMPLE_IMAGE_SIZE))
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def get_image_path(name):
+    """
+    Return the path of the dummy image for `name`, generating it if needed.
+
+    Returns:
+        str or None: Image path, or None if name is not an image referenced by the dummy data
+    """
+    from PIL import Image
+
+    image_format = IMAGE_FORMATS.get(os.path.splitext(name)[1].lower())
+    if image_format is None or name not in known_names():
+        return None
+
+    path = os.path.join(SAMPLE_IMAGE_ROOT, name)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        Image.fromarray(_render(name)).save(tmp_path, format=image_format)
+        os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,108 @@
+from flask import Blueprint, jsonify, request, send_file
+from werkzeug.security import safe_join
+import os
+from config import Config
+from ..utils.auth import require_access
+from .thumbnails import (thumbnail_cache, THUMBNAIL_FORMATS, DEFAULT_THUMBNAIL_SIZE,
+                         DEFAULT_THUMBNAIL_FORMAT)
+
+# Create blueprint
+images_bp = Blueprint('images', __name__)
+
+# Environment detection
+def get_data_source():
+    """Determine data source based on DATA_SOURCE_MODE environment variable"""
+    env_mode = os.environ.get('DATA_SOURCE_MODE')
+    if env_mode in ['dummy', 'real']:
+        return env_mode
+
+    # Default to dummy if no environment variable is set
+    return 'dummy'
+
+# Import appropriate data modules based on environment
+data_source = get_data_source()
+if data_source == 'dummy':
+    from .dummy import sample_images
+
+ORIGINAL_MAX_AGE = 3600
+THUMBNAIL_MAX_AGE = 7 * 24 * 3600  # Thumbnail URLs are tied to the source file's mtime via the cache key
+
+
+def resolve_image_path(filename):
+    """
+    Map an image name relative to the image root to a file path.
+
+    Raises:
+        FileNotFoundError: If the name escapes the image root or the file does not exist
+    """
+    if data_source == 'real':
+        if not Config.IMAGE_ROOT:
+            raise FileNotFoundError("IMAGE_ROOT is not configured")
+        path = safe_join(Config.IMAGE_ROOT, filename)
+    else:
+        path = safe_join(sample_images.SAMPLE_IMAGE_ROOT, filename) and sample_images.get_image_path(filename)
+
+    if path is None or not os.path.isfile(path):
+        raise FileNotFoundError(f"Image not found: {filename}")
+    return path
+
+
+@images_bp.route('/<path:filename>', methods=['GET'])
+@require_access
+def get_image(filename):
+    """Serve an original measurement image (supports Range and conditional requests)"""
+    try:
+        path = resolve_image_path(filename)
+        return send_file(path, conditional=True, max_age=ORIGINAL_MAX_AGE)
+    except FileNotFoundError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@images_bp.route('/thumbnail/<path:filename>', methods=['GET'])
+@require_access
+def get_thumbnail(filename):
+    """
+    Serve a downscaled copy of a measurement image.
+
+    Query Parameters:
+        size (int): Longest edge in pixels, rounded up to 64/128/256/512/1024 (default: 256)
+        format (str): webp (default) or png
+    """
+    try:
+        size = request.args.get('size', DEFAULT_THUMBNAIL_SIZE, type=int)
+        image_format = request.args.get('format', DEFAULT_THUMBNAIL_FORMAT).lower()
+        if image_format not in THUMBNAIL_FORMATS:
+            raise ValueError(f"Unsupported format: {image_format}")
+
+        path = resolve_image_path(filename)
+        thumbnail_path = thumbnail_cache.get(path, size, image_format)
+        return send_file(thumbnail_path, mimetype=THUMBNAIL_FORMATS[image_format][1],
+                         conditional=True, max_age=THUMBNAIL_MAX_AGE)
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except FileNotFoundError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 404
+    except TimeoutError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 504
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
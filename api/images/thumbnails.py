@@ -0,0 +1,235 @@
+"""
+Thumbnail generation with a size-capped on-disk LRU cache.
+
+Thumbnails are rendered in a bounded process pool (Pillow decoding is CPU
+bound and would otherwise hold the GIL in request threads) and written under
+THUMBNAIL_CACHE_DIR, keyed by source path, mtime, size and format. Cache hits
+refresh the file's access time (mtime is left alone so ETags stay stable);
+when the cache grows past THUMBNAIL_CACHE_MAX_BYTES the least recently used
+files are deleted. A pool broken by a crashed worker is replaced on the next
+render.
+"""
+import os
+import time
+import hashlib
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+from ..utils.app_logger import logger
+from ..utils.cache_stats import register_memo_cache
+
+THUMBNAIL_SIZES = [64, 128, 256, 512, 1024]
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'png': ('PNG', 'image/png'),
+}
+DEFAULT_THUMBNAIL_SIZE = 256
+DEFAULT_THUMBNAIL_FORMAT = 'webp'
+
+
+def render_thumbnail(source_path, target_path, size, image_format):
+    """
+    Render a downscaled copy of source_path to target_path (runs in a worker process).
+
+    16-bit SEM TIFFs are scaled to 8 bits; only the first frame of multi-page files is used.
+    """
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(source_path) as image:
+        image.draft('RGB', (size, size))  # Lets JPEG decode at reduced scale
+        image.seek(0)
+        if image.mode in ('I;16', 'I;16B', 'I;16L', 'I', 'F'):
+            pixels = np.asarray(image, dtype=np.float64)
+            low, high = pixels.min(), pixels.max()
+            scaled = (pixels - low) * (255.0 / (high - low)) if high > low else np.zeros_like(pixels)
+            image = Image.fromarray(scaled.astype(np.uint8))
+        elif image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('RGB')
+
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        tmp_path = f"{target_path}.{os.getpid()}.tmp"
+        image.save(tmp_path, THUMBNAIL_FORMATS[image_format][0])
+        os.replace(tmp_path, target_path)
+    return os.path.getsize(target_path)
+
+
+def snap_size(size):
+    """Round a requested size up to the nearest cached thumbnail size"""
+    for candidate in THUMBNAIL_SIZES:
+        if size <= candidate:
+            return candidate
+    return THUMBNAIL_SIZES[-1]
+
+
+class ThumbnailCache:
+    """
+    On-disk LRU cache of thumbnails rendered in a bounded process pool.
+
+    Args:
+        cache_dir: Directory for cached thumbnails
+        max_bytes: Total size above which least recently used thumbnails are evicted
+        max_processes: Size of the rendering process pool
+    """
+
+    def __init__(self, cache_dir=Config.THUMBNAIL_CACHE_DIR, max_bytes=Config.THUMBNAIL_CACHE_MAX_BYTES,
+                 max_processes=Config.MAX_PROCESSES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_processes = max_processes
+        self._executor = None
+        self._pending = {}
+        self._abandoned = set()  # Timed-out renders whose output is not accounted
+        self._cache_bytes = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Caller holds self._lock
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_processes,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _discard_broken_executor(self, broken):
+        # Caller holds self._lock; the next submit starts a new pool
+        if self._executor is broken:
+            logger.warning("Thumbnail process pool is broken, replacing it")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, *args):
+        # Caller holds self._lock
+        executor = self._get_executor()
+        try:
+            return executor, executor.submit(render_thumbnail, *args)
+        except BrokenProcessPool:
+            self._discard_broken_executor(executor)
+            executor = self._get_executor()
+            return executor, executor.submit(render_thumbnail, *args)
+
+    def _cache_path(self, source_path, size, image_format):
+        stat = os.stat(source_path)
+        key = f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}|{size}|{image_format}"
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.{image_format}")
+
+    def _scan(self):
+        """(atime, size, path) for every cached file"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+        return entries
+
+    def _account(self, added_bytes, keep_path):
+        """Track the cache size and evict least recently used files (except keep_path) past max_bytes"""
+        with self._lock:
+            if self._cache_bytes is None:
+                self._cache_bytes = sum(size for _, size, _ in self._scan())
+            self._cache_bytes += added_bytes
+            if self._cache_bytes <= self.max_bytes:
+                return
+
+            # Rescan so files written by other workers are counted too
+            entries = sorted(self._scan())
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * 0.9
+            evicted = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                if path == keep_path:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+            self._cache_bytes = total
+        logger.info("Thumbnail cache pruned", evicted=evicted, cache_bytes=total)
+
+    def get(self, source_path, size=DEFAULT_THUMBNAIL_SIZE, image_format=DEFAULT_THUMBNAIL_FORMAT,
+            timeout=Config.THUMBNAIL_TIMEOUT):
+        """
+        Return the path of a cached thumbnail for source_path, rendering it if needed.
+
+        Raises:
+            FileNotFoundError: If source_path does not exist
+            ValueError: If image_format is not supported
+            TimeoutError: If rendering takes longer than timeout seconds
+            BrokenProcessPool: If the render's worker process died
+        """
+        if image_format not in THUMBNAIL_FORMATS:
+            raise ValueError(f"Unsupported thumbnail format: {image_format}")
+        size = snap_size(size)
+        cache_path = self._cache_path(source_path, size, image_format)
+
+        try:
+            # Mark as recently used
+            os.utime(cache_path, ns=(time.time_ns(), os.stat(cache_path).st_mtime_ns))
+            return cache_path
+        except FileNotFoundError:
+            pass
+
+        # One render per thumbnail, however many requests ask for it at once
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with self._lock:
+            future = self._pending.get(cache_path)
+            submitted = future is None
+            if submitted:
+                executor, future = self._submit(source_path, cache_path, size, image_format)
+                self._pending[cache_path] = future
+        if submitted:
+            future.add_done_callback(functools.partial(self._rendered, executor, cache_path))
+
+        try:
+            future.result(timeout=timeout)
+        except TimeoutError:
+            self._abandon(cache_path, future)
+            raise TimeoutError(f"Thumbnail rendering timed out after {timeout}s: {os.path.basename(source_path)}")
+        return cache_path
+
+    def _abandon(self, cache_path, future):
+        """Give up on a timed-out render: cancel it if it has not started, and let the next request resubmit"""
+        future.cancel()
+        with self._lock:
+            if not future.done():
+                self._abandoned.add(future)
+            if self._pending.get(cache_path) is future:
+                del self._pending[cache_path]
+
+    def _rendered(self, executor, cache_path, future):
+        with self._lock:
+            if self._pending.get(cache_path) is future:
+                del self._pending[cache_path]
+            if future in self._abandoned:
+                self._abandoned.discard(future)
+                return
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self._discard_broken_executor(executor)
+                return
+        if not future.cancelled() and future.exception() is None:
+            self._account(future.result(), cache_path)
+
+    def cache_info(self):
+        return {'bytes': self._cache_bytes, 'max_bytes': self.max_bytes, 'rendering': len(self._pending)}
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Shared cache instance, process pool started on first use
+thumbnail_cache = ThumbnailCache()
+register_memo_cache('images.thumbnails', thumbnail_cache.cache_info)
@@ -0,0 +1,402 @@
+"""
+Real recipe file parser for production/work environment.
+Parses .idw (wafer layout) and .idp (image/parameter) recipe files into the same
+DataFrame shapes as the dummy recipe_open_data module.
+
+Parsing runs in separate processes so a malformed or huge recipe file can be
+killed on timeout without blocking the Flask worker that requested it.
+"""
+import os
+import time
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from collections import deque
+from datetime import datetime
+import pandas as pd
+from werkzeug.security import safe_join
+from config import Config
+from ...utils.app_logger import logger
+
+# Column layouts matching generate_wafer_mp_info / generate_wafer_align_info / generate_idp_image_info
+WAFER_MP_COLUMNS = {
+    "ChipNo_X": "int64",
+    "ChipNo_Y": "int64",
+    "Coordinate_X": "float64",
+    "Coordinate_Y": "float64",
+    "P_No": "int64",
+    "D_No": "int64",
+    "Diff": "bool",
+    "Rel": "bool",
+    "Rel_MoveX": "float64",
+    "RelMoveY": "float64",
+    "Coordinate_X_r": "float64",
+    "Coordinate_Y_r": "float64",
+    "Parameter": "string",
+    "img_meas2": "string",
+}
+
+WAFER_ALIGN_COLUMNS = {
+    "Align_No": "int64",
+    "Chip.X": "int64",
+    "Chip.Y": "int64",
+    "Coordinate.X": "float64",
+    "Coordinate.Y": "float64",
+    "P.No": "int64",
+}
+
+IDP_IMAGE_COLUMNS = {
+    "Parameter": "string",
+    "img_add1": "string",
+    "img_add2": "string",
+    "img_meas1": "string",
+    "img_meas2": "string",
+    "SEQ": "int64",
+    "Last_SEQ": "int64",
+    "Region": "int64",
+    "image_add3": "string",
+    "Addressing": "string",
+    "Mother_Para": "string",
+    "Double_Addressing": "bool",
+    "Meas_Counting": "int64",
+    "dnumber_removed": "int64",
+}
+
+# Section name in the recipe file -> (result key, column layout)
+IDW_SECTIONS = {
+    "MP": ("wafer_mp_info", WAFER_MP_COLUMNS),
+    "ALIGN": ("wafer_align_info", WAFER_ALIGN_COLUMNS),
+}
+
+IDP_SECTIONS = {
+    "IMAGE": ("idp_image_info", IDP_IMAGE_COLUMNS),
+}
+
+_TRUE_VALUES = {"true", "yes", "1", "on"}
+
+# Parse processes are spawned, not forked: the worker runs scheduler, watchdog and other threads
+_MP_CONTEXT = multiprocessing.get_context('spawn')
+
+
+class RecipeParseError(Exception):
+    """Raised when a recipe file cannot be parsed"""
+
+
+class RecipeParseTimeout(RecipeParseError, TimeoutError):
+    """Raised when parsing a recipe file exceeds its time budget"""
+
+
+class RecipeParseCancelled(RecipeParseError):
+    """Raised when a parse is cancelled before it completes"""
+
+
+def _read_sections(path):
+    """
+    Split a recipe file into its tabular sections.
+
+    Recipe exports are laid out as `[SECTION]` headers, each followed by a
+    comma-separated header row and data rows. Blank lines and lines starting
+    with '#' or ';' are ignored.
+
+    Returns:
+        dict: Section name -> (header list, list of row lists)
+    """
+    sections = {}
+    current = None
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line_no, raw_line in enumerate(f, 1):
+            line = raw_line.strip()
+            if not line or line[0] in '#;':
+                continue
+
+            if line.startswith('[') and line.endswith(']'):
+                current = line[1:-1].strip().upper()
+                sections[current] = (None, [])
+                continue
+
+            if current is None:
+                raise RecipeParseError(f"{path}:{line_no}: data found before any [SECTION] header")
+
+            header, rows = sections[current]
+            fields = [field.strip() for field in line.split(',')]
+            if header is None:
+                sections[current] = (fields, rows)
+            else:
+                if len(fields) != len(header):
+                    raise RecipeParseError(
+                        f"{path}:{line_no}: expected {len(header)} fields in [{current}], got {len(fields)}")
+                rows.append(fields)
+
+    return sections
+
+
+def _to_frame(header, rows, columns):
+    """Build a DataFrame with the expected column layout and dtypes"""
+    df = pd.DataFrame(rows, columns=header or [])
+    df = df.reindex(columns=list(columns))
+
+    for column, dtype in columns.items():
+        if dtype == 'bool':
+            df[column] = df[column].fillna('').astype(str).str.lower().isin(_TRUE_VALUES)
+        elif dtype == 'string':
+            df[column] = df[column].fillna('').astype('string')
+        else:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+            if dtype == 'int64':
+                df[column] = df[column].fillna(0).astype('int64')
+            else:
+                df[column] = df[column].astype(dtype)
+
+    return df
+
+
+def _parse_recipe_file(path, section_map):
+    sections = _read_sections(path)
+    result = {}
+    for section, (key, columns) in section_map.items():
+        header, rows = sections.get(section, (None, []))
+        result[key] = _to_frame(header, rows, columns)
+    return result
+
+
+def parse_idw_file(path):
+    """
+    Parse a .idw recipe file.
+
+    Returns:
+        dict: 'wafer_mp_info' and 'wafer_align_info' DataFrames
+    """
+    return _parse_recipe_file(path, IDW_SECTIONS)
+
+
+def parse_idp_file(path):
+    """
+    Parse a .idp recipe file.
+
+    Returns:
+        dict: 'idp_image_info' DataFrame
+    """
+    return _parse_recipe_file(path, IDP_SECTIONS)
+
+
+def get_parser_for_file(path):
+    """Select the parser function based on the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.idw':
+        return parse_idw_file
+    if ext == '.idp':
+        return parse_idp_file
+    raise RecipeParseError(f"Unsupported recipe file type: {path}")
+
+
+def _parse_in_child(parser, path, conn):
+    """Entry point of the parse process. Sends ('ok', result) or ('error', message)."""
+    try:
+        conn.send(('ok', parser(path)))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class RecipeParserPool:
+    """
+    Runs recipe parses in child processes, at most `max_processes` at a time.
+
+    Each file gets its own process so an overrunning parse can be terminated
+    without affecting the others. The process slots are shared by every
+    request thread in this worker, so concurrent requests cannot exceed the cap.
+    """
+
+    def __init__(self, max_processes=None, timeout=None):
+        self.max_processes = max_processes or Config.MAX_PROCESSES
+        self.timeout = timeout or Config.RECIPE_PARSE_TIMEOUT
+        self._slots = threading.BoundedSemaphore(self.max_processes)
+
+    def parse_files(self, paths, timeout=None, cancel_event=None):
+        """
+        Parse several recipe files concurrently.
+
+        Args:
+            paths: Iterable of recipe file paths (.idw / .idp)
+            timeout: Per-file time budget in seconds (defaults to Config.RECIPE_PARSE_TIMEOUT);
+                files that get no free process slot within it time out as well
+            cancel_event: Optional threading.Event; when set, running parses are
+                terminated and pending ones are skipped
+
+        Returns:
+            dict: path -> parsed result dict, or the RecipeParseError raised for that file
+        """
+        timeout = timeout or self.timeout
+        pending = deque(paths)
+        running = {}  # path -> (process, connection, deadline)
+        results = {}
+        slot_deadline = time.monotonic() + timeout  # Files still waiting for a slot then time out
+
+        def start_next():
+            # Caller has acquired a slot for the next pending file
+            path = pending.popleft()
+            try:
+                running[path] = self._start(path, timeout)
+            except RecipeParseError as e:
+                self._slots.release()
+                results[path] = e
+
+        try:
+            while pending or running:
+                if cancel_event is not None and cancel_event.is_set():
+                    for path in list(running):
+                        self._stop(running.pop(path))
+                        results[path] = RecipeParseCancelled(f"Parse cancelled: {path}")
+                    while pending:
+                        path = pending.popleft()
+                        results[path] = RecipeParseCancelled(f"Parse cancelled: {path}")
+                    break
+
+                # Start as many parses as there are free process slots
+                while pending and self._slots.acquire(blocking=False):
+                    start_next()
+
+                if pending and time.monotonic() >= slot_deadline:
+                    logger.warning("No free recipe parse process", files=len(pending), timeout=timeout)
+                    while pending:
+                        path = pending.popleft()
+                        results[path] = RecipeParseTimeout(f"{path}: no free parse process within {timeout}s")
+
+                now = time.monotonic()
+                for path, entry in list(running.items()):
+                    process, conn, deadline = entry
+                    if conn.poll():
+                        try:
+                            status, payload = conn.recv()
+                        except EOFError:
+                            status, payload = 'error', 'Parse process exited without a result'
+                        self._stop(running.pop(path))
+                        results[path] = payload if status == 'ok' else RecipeParseError(f"{path}: {payload}")
+                    elif not process.is_alive():
+                        self._stop(running.pop(path))
+                        results[path] = RecipeParseError(
+                            f"{path}: parse process exited with code {process.exitcode}")
+                    elif now >= deadline:
+                        self._stop(running.pop(path))
+                        results[path] = RecipeParseTimeout(f"{path}: parse exceeded {timeout}s")
+                        logger.warning("Recipe parse timed out", path=path, timeout=timeout)
+
+                if running:
+                    next_deadline = min(deadline for _, _, deadline in running.values())
+                    wait_for = max(0.0, min(next_deadline - time.monotonic(), 0.5))
+                    handles = [conn for _, conn, _ in running.values()]
+                    handles += [process.sentinel for process, _, _ in running.values()]
+                    wait(handles, timeout=wait_for)
+                elif pending:
+                    # Other request threads hold every slot; wait for one to free up (rechecking cancellation)
+                    wait_for = max(0.0, min(slot_deadline - time.monotonic(), 0.5))
+                    if self._slots.acquire(timeout=wait_for):
+                        start_next()
+        finally:
+            for path in list(running):
+                self._stop(running.pop(path))
+
+        return results
+
+    def parse_file(self, path, timeout=None, cancel_event=None):
+        """Parse a single recipe file, raising RecipeParseError on failure"""
+        result = self.parse_files([path], timeout=timeout, cancel_event=cancel_event)[path]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _start(self, path, timeout):
+        parser = get_parser_for_file(path)
+        parent_conn, child_conn = _MP_CONTEXT.Pipe(duplex=False)
+        process = _MP_CONTEXT.Process(
+            target=_parse_in_child,
+            args=(parser, path, child_conn),
+            name=f"recipe-parse:{os.path.basename(path)}",
+            daemon=True
+        )
+        try:
+            process.start()
+        except Exception as e:
+            parent_conn.close()
+            raise RecipeParseError(f"{path}: could not start parse process: {e}") from e
+        finally:
+            child_conn.close()
+        return process, parent_conn, time.monotonic() + timeout
+
+    def _stop(self, entry):
+        process, conn, _ = entry
+        try:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            conn.close()
+        finally:
+            self._slots.release()
+
+
+# Shared pool instance for this worker
+parser_pool = RecipeParserPool()
+
+
+def find_recipe_files(recipe_id, fac_id, tool_category):
+    """
+    Locate the .idw/.idp pair for a recipe under Config.RECIPE_ROOT.
+
+    Expected layout: <RECIPE_ROOT>/<fac_id>/<tool_category>/<recipe_id>.idw|.idp
+    Segments that would resolve outside RECIPE_ROOT ('..', separators, symlinks) are rejected.
+    """
+    if not Config.RECIPE_ROOT:
+        raise FileNotFoundError("RECIPE_ROOT is not configured")
+
+    base = safe_join(Config.RECIPE_ROOT, fac_id, tool_category, recipe_id)
+    if base is None:
+        raise FileNotFoundError(f"Recipe not found: {fac_id}/{tool_category}/{recipe_id}")
+
+    missing = [path for path in (f"{base}.idw", f"{base}.idp") if not os.path.isfile(path)]
+    if missing:
+        raise FileNotFoundError(f"Recipe files not found: {', '.join(missing)}")
+
+    # Check the files that will actually be opened, after resolving symlinks
+    root = os.path.realpath(Config.RECIPE_ROOT)
+    idw_path = os.path.realpath(f"{base}.idw")
+    idp_path = os.path.realpath(f"{base}.idp")
+    if any(os.path.commonpath([root, path]) != root for path in (idw_path, idp_path)):
+        raise FileNotFoundError(f"Recipe not found: {fac_id}/{tool_category}/{recipe_id}")
+
+    return idw_path, idp_path
+
+
+def get_recipe_open_data(recipe_id=None, fac_id=None, tool_category=None, timeout=None):
+    """
+    Parse the recipe files and return all three tables as dictionaries,
+    in the same format as the dummy recipe_open_data.get_recipe_open_data.
+
+    Raises:
+        FileNotFoundError: If the recipe files do not exist
+        RecipeParseTimeout: If a file could not be parsed within the time budget
+        RecipeParseError: If a file is malformed
+    """
+    idw_path, idp_path = find_recipe_files(recipe_id, fac_id, tool_category)
+    parsed = parser_pool.parse_files([idw_path, idp_path], timeout=timeout)
+
+    for path in (idw_path, idp_path):
+        if isinstance(parsed[path], Exception):
+            raise parsed[path]
+
+    idw_data = parsed[idw_path]
+    idp_data = parsed[idp_path]
+
+    return {
+        "wafer_mp_info": idw_data["wafer_mp_info"].to_dict("records"),
+        "wafer_align_info": idw_data["wafer_align_info"].to_dict("records"),
+        "idp_image_info": idp_data["idp_image_info"].to_dict("records"),
+        "recipe_id": recipe_id,
+        "fac_id": fac_id,
+        "tool_category": tool_category,
+        "timestamp": datetime.now().isoformat()
+    }
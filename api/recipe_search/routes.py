@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify, request
 import platform
 import os
+from ..utils.response_cache import cached_response, cached_etag
+from ..utils.etag import conditional_response, dataframe_version
+from ..warmup import track_popularity
 
 # Create blueprint
 recipe_search_bp = Blueprint('recipe_search', __name__)
@@ -22,14 +25,16 @@ def get_data_source():
 # Import appropriate data modules based on environment
 data_source = get_data_source()
 if data_source == 'real':
-    # Import real data modules when implemented
-    pass
+    from .real import recipe_parser
 else:
     from .dummy import meas_hist
     from .dummy import recipe_open_data
     from .dummy import recipe_list
 
 @recipe_search_bp.route('/<fac_id>/<tool_category>/recipe-open/<recipe_id>', methods=['GET'])
+@track_popularity('recipe_open')
+@conditional_response(cached_etag)
+@cached_response(ttl=600)
 def get_recipe_open_data(fac_id, tool_category, recipe_id):
     """Get recipe open data including wafer_mp_info, wafer_align_info, and idp_image_info"""
     try:
@@ -41,12 +46,23 @@ def get_recipe_open_data(fac_id, tool_category, recipe_id):
                 'data': data
             })
         else:
-            # Real data implementation would go here
+            # Parse the recipe files in the bounded process pool
+            data = recipe_parser.get_recipe_open_data(recipe_id, fac_id, tool_category)
             return jsonify({
-                'success': False,
-                'error': 'Real data source not implemented'
-            }), 501
-            
+                'success': True,
+                'data': data
+            })
+
+    except FileNotFoundError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+    except TimeoutError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 504
     except Exception as e:
         return jsonify({
             'success': False,
@@ -54,6 +70,8 @@ def get_recipe_open_data(fac_id, tool_category, recipe_id):
         }), 500
 
 @recipe_search_bp.route('/<fac_id>/<tool_category>', methods=['GET'])
+@conditional_response(cached_etag)
+@cached_response(ttl=600)
 def get_recipe_list(fac_id, tool_category):
     """Get recipe list for a specific facility and tool category"""
     try:
@@ -76,6 +94,8 @@ def get_recipe_list(fac_id, tool_category):
         }), 500
 
 @recipe_search_bp.route('/meas-hist', methods=['GET'])
+@conditional_response(lambda: dataframe_version(meas_hist.df) if data_source == 'dummy' else None)
+@cached_response(ttl=300)
 def get_meas_hist():
     """Get measurement history data"""
     try:
@@ -1,9 +1,28 @@
 from flask import Blueprint, jsonify, request
+import os
+import json
 from datetime import datetime
 from .utils.redis_client import redis_client
+from .utils.auth import require_access, require_admin
+from .utils.two_tier_cache import get_all_stats, find_cache
+from .utils.cache_stats import memo_cache_stats, redis_pool_stats
+from .utils.job_metrics import get_job_metrics
+from .utils.job_watchdog import get_running
+from .utils.job_results import job_results, describe
+from .utils import job_history
+from .utils.scheduler import scheduler_manager
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+FAB_LIST = {
+    "R3": ["R3", "R4"],
+    "M16": ["M16A", "M16B", "M16E"],
+    "M15": ["M15A", "M15B"],
+    "M14": ["M14A", "M14B"],
+    "M11": ["M11A", "M11B"],
+    "M10": ["M10A", "M10B"]
+}
+
 
 @api_bp.route('/health', methods=['GET'])
 def health_check():
@@ -22,40 +41,187 @@ def health_check():
     })
 
 
+@api_bp.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 503 until this worker's cache warm-up has finished"""
+    from .warmup import is_ready
+
+    if not is_ready():
+        return jsonify({'status': 'warming_up', 'pid': os.getpid()}), 503
+    return jsonify({'status': 'ready', 'pid': os.getpid()})
+
+
 @api_bp.route('/fab-list', methods=['GET'])
 def get_fab_list():
-    fab_list_dict = {
-        "R3": ["R3", "R4"],
-        "M16": ["M16A", "M16B", "M16E"],
-        "M15": ["M15A", "M15B"],
-        "M14": ["M14A", "M14B"],
-        "M11": ["M11A", "M11B"],
-        "M10": ["M10A", "M10B"]
-    }
-
     """Get fab list dictionary"""
-    return jsonify(fab_list_dict)
+    return jsonify(FAB_LIST)
 
 
 @api_bp.route('/jobs/status', methods=['GET'])
 def get_jobs_status():
-    """Get status of all scheduled jobs"""
+    """Get status of all scheduled jobs with run metrics and current runs across all workers; stalled lists jobs past their timeout"""
     from flask import current_app
 
-    if hasattr(current_app, 'scheduler'):
+    if hasattr(current_app, 'scheduler') and current_app.scheduler is not None:
         jobs = []
         for job in current_app.scheduler.get_jobs():
             jobs.append({
                 'id': job.id,
                 'name': job.name,
                 'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
-                'trigger': str(job.trigger)
+                'trigger': str(job.trigger),
+                'metrics': get_job_metrics(scheduler_manager.job_keys.get(job.id, job.id)),
+                'running': get_running(scheduler_manager.job_keys.get(job.id, job.id))
             })
-        return jsonify({'jobs': jobs})
+            pipeline = scheduler_manager.pipelines.get(job.id)
+            if pipeline is not None:
+                jobs[-1]['pipeline'] = {
+                    'steps': {name: dict(depends_on=step['depends_on'], executor=step['executor'],
+                                         timeout=step['timeout'],
+                                         metrics=get_job_metrics(pipeline.step_key(name)),
+                                         running=get_running(pipeline.step_key(name)))
+                              for name, step in pipeline.steps.items()},
+                    'last_run': pipeline.last_run
+                }
+        runs = [(job['id'], job['running']) for job in jobs]
+        runs += [(f"{job['id']}.{name}", step['running'])
+                 for job in jobs if 'pipeline' in job for name, step in job['pipeline']['steps'].items()]
+        stalled = [run_id for run_id, running in runs
+                   if running and running['state'] in ('cancelling', 'stalled')]
+        return jsonify({'jobs': jobs, 'stalled': stalled})
     else:
         return jsonify({'error': 'Scheduler not available'}), 503
 
 
+@api_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """
+    Get the latest (or a given) published result of a scheduled job.
+
+    Query Parameters:
+        version (int): Result version (default: latest)
+    """
+    try:
+        result = job_results.get(job_id, request.args.get('version', type=int))
+        if result is None:
+            return jsonify({
+                'status': 'error',
+                'message': f"No result published for job: {job_id}"
+            }), 404
+
+        payload = result['payload']
+        if result['kind'] == 'dataframe':
+            payload = json.loads(payload.to_json(orient='records', date_format='iso'))
+        return jsonify({
+            'status': 'success',
+            'data': payload,
+            'result': describe(result)
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api_bp.route('/jobs/<job_id>/results', methods=['GET'])
+def get_job_result_versions(job_id):
+    """List the stored result versions of a scheduled job, newest first"""
+    try:
+        versions = job_results.versions(job_id)
+        return jsonify({
+            'status': 'success',
+            'data': versions,
+            'total': len(versions)
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api_bp.route('/jobs/<job_id>/history', methods=['GET'])
+def get_job_history(job_id):
+    """
+    Get the latest runs of a scheduled job or pipeline step (<pipeline>.<step>)
+    from the run history kept with SCHEDULER_JOBSTORE=sqlite, newest first.
+
+    Query Parameters:
+        limit (int): Maximum number of runs (default: 20)
+    """
+    if not job_history.history_enabled():
+        return jsonify({
+            'status': 'error',
+            'message': 'Job run history is disabled, set SCHEDULER_JOBSTORE=sqlite'
+        }), 503
+
+    try:
+        runs = job_history.recent_runs(scheduler_manager.job_keys.get(job_id, job_id),
+                                       request.args.get('limit', 20, type=int))
+        return jsonify({
+            'status': 'success',
+            'data': runs,
+            'total': len(runs)
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@api_bp.route('/cache/stats', methods=['GET'])
+@require_access
+def get_cache_stats():
+    """
+    Get cache statistics per namespace: hits, misses, stale serves, evictions,
+    entries, bytes and p50/p99 fill latency across all workers ('cluster') and
+    for this worker, plus in-process memo caches and Redis pool usage.
+    """
+    return jsonify({
+        'pid': os.getpid(),
+        'timestamp': datetime.now().isoformat(),
+        'caches': get_all_stats(),
+        'memo_caches': memo_cache_stats(),
+        'redis_pools': redis_pool_stats()
+    })
+
+
+@api_bp.route('/cache/invalidate', methods=['POST'])
+@require_admin
+def invalidate_cache():
+    """
+    Drop a cache namespace, or the keys under a prefix, in Redis and every worker.
+    Restricted to Config.ADMIN_USERS or requests carrying Config.ADMIN_TOKEN.
+
+    JSON Body:
+        namespace (str): Cache namespace (see /api/cache/stats)
+        prefix (str): Key prefix within the namespace (default: every key)
+    """
+    body = request.get_json(silent=True) or {}
+    namespace = body.get('namespace')
+    if not namespace:
+        return jsonify({
+            'status': 'error',
+            'message': 'namespace is required'
+        }), 400
+
+    cache = find_cache(namespace)
+    if cache is None:
+        return jsonify({
+            'status': 'error',
+            'message': f"Unknown cache namespace: {namespace}"
+        }), 404
+
+    prefix = body.get('prefix', '')
+    deleted = cache.invalidate_prefix(prefix)
+    return jsonify({
+        'status': 'success',
+        'data': {'namespace': namespace, 'prefix': prefix, 'deleted': deleted}
+    })
+
+
 @api_bp.route('/users', methods=['GET'])
 def get_users():
     """Example API endpoint"""
@@ -6,7 +6,9 @@ import time
 import random
 from datetime import datetime
 from .utils.app_logger import get_task_logger
-from .utils.scheduler import add_scheduled_job
+from .utils.job_results import job_results
+from .utils.job_watchdog import check_cancelled
+from .utils.scheduler import add_scheduled_job, add_scheduled_pipeline, JobPipeline, PROCESS_EXECUTOR
 
 def data_sync_task():
     """Example task: Sync data from external sources"""
@@ -16,8 +18,10 @@ def data_sync_task():
     
     # Simulate data sources
     data_sources = ["Database A", "API B", "File System C"]
+    sync_results = []
     
     for source in data_sources:
+        check_cancelled()
         try:
             # Simulate processing time
             process_time = random.uniform(0.1, 0.5)
@@ -32,14 +36,32 @@ def data_sync_task():
                        source=source,
                        records=records,
                        duration=process_time)
+            sync_results.append({'source': source, 'status': 'success', 'records': records,
+                                 'duration': round(process_time, 3)})
             
         except Exception as e:
             logger.error(f"Error syncing from {source}: {str(e)}",
                         source=source,
                         error=str(e))
+            sync_results.append({'source': source, 'status': 'error', 'error': str(e)})
     
+    # Publish the outcome so any worker can serve it from /api/jobs/data_sync/result
+    job_results.publish('data_sync', {'sources': sync_results, 'synced_at': datetime.now().isoformat()},
+                        meta={'failed': sum(1 for result in sync_results if result['status'] == 'error')})
     logger.success("Data synchronization completed")
 
+def cache_warmup_task():
+    """Recompute the most-requested cached responses from the refreshed data"""
+    from .warmup import rewarm_cache
+
+    logger = get_task_logger("cache_warmup")
+
+    result = rewarm_cache()
+    if result is None:
+        logger.debug("Cache warm-up skipped, warm-up is disabled or not started")
+        return
+    logger.info("Cache re-warmed after data refresh", **result)
+
 def cleanup_old_logs_task():
     """Example task: Clean up old log entries"""
     logger = get_task_logger("log_cleanup")
@@ -104,8 +126,10 @@ def generate_report_task():
     logger.info("Starting report generation...")
     
     report_types = ["daily_summary", "performance_metrics", "error_analysis"]
+    reports = []
     
     for report_type in report_types:
+        check_cancelled()
         try:
             logger.debug(f"Generating {report_type} report...")
             
@@ -120,24 +144,72 @@ def generate_report_task():
                        report_type=report_type,
                        file_path=file_path,
                        file_size_kb=file_size)
+            reports.append({'report_type': report_type, 'file_path': file_path, 'file_size_kb': file_size})
             
         except Exception as e:
             logger.error(f"Failed to generate {report_type} report",
                         report_type=report_type,
                         error=str(e))
+    
+    job_results.publish('daily_report', {'reports': reports, 'generated_at': datetime.now().isoformat()},
+                        meta={'reports': len(reports)})
+
+def fail_ratio_analysis_task():
+    """Recompute rolling fail ratios per tool and recipe and refresh the cached results"""
+    from .fail_issue.routes import fail_ratio_service
+
+    logger = get_task_logger("fail_ratio_analysis")
+
+    if fail_ratio_service is None:
+        logger.info("Fail ratio analysis skipped, no data source configured")
+        return
+
+    logger.info("Starting fail ratio analysis...")
+    result = fail_ratio_service.refresh()
+    logger.success("Fail ratio analysis completed",
+                   runs=result['summary']['runs'],
+                   flagged=result['summary']['flagged'])
+
+def msr_ingest_task():
+    """Ingest new MSR result files into date-partitioned Parquet"""
+    from config import Config
+    from .skewvoir_beta.real.msr_ingest import run_ingest
+
+    logger = get_task_logger("msr_ingest")
+
+    if not Config.SKEWVOIR_INGEST_DIR:
+        logger.debug("MSR ingest skipped, SKEWVOIR_INGEST_DIR is not set")
+        return
+
+    logger.info("Starting MSR file ingest...", ingest_dir=Config.SKEWVOIR_INGEST_DIR)
+    result = run_ingest()
+    if result['failed']:
+        logger.warning("MSR file ingest completed with failures", **result)
+    else:
+        logger.success("MSR file ingest completed", **result)
+
+def build_data_refresh_pipeline():
+    """Raw data sync and ingest, then aggregates, then cache warm-up"""
+    pipeline = JobPipeline('data_refresh', name='Data Refresh')
+    pipeline.add_step('data_sync', data_sync_task)
+    # CSV parsing and pandas-heavy steps run in the process pool
+    pipeline.add_step('msr_ingest', msr_ingest_task, executor=PROCESS_EXECUTOR)
+    pipeline.add_step('fail_ratio_analysis', fail_ratio_analysis_task, depends_on=['data_sync'],
+                      executor=PROCESS_EXECUTOR)
+    pipeline.add_step('cache_warmup', cache_warmup_task, depends_on=['data_sync', 'fail_ratio_analysis'])
+    return pipeline
 
 def register_scheduled_tasks():
     """Register all scheduled tasks with the scheduler"""
     logger = get_task_logger("task_registration")
     
     try:
-        # Data sync every 5 minutes
-        add_scheduled_job(
-            data_sync_task,
+        # Data refresh every 5 minutes: sync and MSR ingest in parallel, then the
+        # fail ratio aggregates once the sync succeeded, then the cache warm-up
+        add_scheduled_pipeline(
+            build_data_refresh_pipeline(),
             'interval',
-            minutes=5,
-            id='data_sync',
-            name='Data Synchronization'
+            minutes=5
         )
         
         # Log cleanup every hour
@@ -0,0 +1,255 @@
+"""
+Columnar Parquet storage for SkewVoir measurement history and MSR data.
+
+CSV files are only an import format: they are converted once into typed Parquet
+files (datetimes as timestamps, "x, y" coordinate strings as integer column
+pairs), sorted so that row-group statistics can skip data on Timestamp and MSR
+filters. Reads load only the requested columns.
+"""
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from ..utils.app_logger import logger
+
+MEAS_HIST_DATETIME_COLUMNS = ['Timestamp', 'Start_Time', 'End_Time']
+MEAS_HIST_STRING_COLUMNS = [
+    'Fab', 'eqp_id', 'Tool', 'Model', 'LotID', 'FullName', 'Class', 'Recipe',
+    'MSR', 'MSR_Check', 'Align_fail', 'idp_name', 'idw_name'
+]
+
+# "x, y" string columns in MSR data, stored as <column>_x / <column>_y int32 pairs
+MSR_COORDINATE_COLUMNS = ['chip_number', 'chip_coordinate', 'stage_coordinate', 'dnum_group']
+MSR_STRING_COLUMNS = ['MSR', 'parameter', 'mp_image_name_01']
+
+MEAS_HIST_ROW_GROUP_SIZE = 50000
+MSR_ROW_GROUP_SIZE = 200000
+
+
+def split_coordinate_pairs(df, columns=MSR_COORDINATE_COLUMNS):
+    """
+    Replace "x, y" string columns with <column>_x / <column>_y int32 columns.
+
+    All columns are stacked into one Series so the split and numeric parse run
+    in a single vectorized pass rather than once per column.
+
+    Returns:
+        pd.DataFrame: Copy of df with the coordinate columns split
+    """
+    columns = [column for column in columns if column in df.columns]
+    if not columns:
+        return df.copy()
+
+    stacked = pd.Series(df[columns].to_numpy(dtype=object).ravel(order='F'), dtype=object).astype(str)
+    parts = stacked.str.split(',', n=1, expand=True)
+    values = np.column_stack([
+        pd.to_numeric(parts[0].str.strip()).to_numpy(),
+        pd.to_numeric(parts[1].str.strip()).to_numpy(),
+    ]).astype('int32').reshape(len(columns), len(df), 2)
+
+    pairs = {}
+    for i, column in enumerate(columns):
+        pairs[column] = {f'{column}_x': values[i, :, 0], f'{column}_y': values[i, :, 1]}
+
+    data = {}
+    for column in df.columns:
+        if column in pairs:
+            data.update(pairs[column])
+        else:
+            data[column] = df[column]
+    return pd.DataFrame(data, index=df.index)
+
+
+def _normalize_meas_hist(df):
+    for column in MEAS_HIST_DATETIME_COLUMNS:
+        df[column] = pd.to_datetime(df[column])
+    for column in MEAS_HIST_STRING_COLUMNS:
+        df[column] = df[column].astype('string')
+    return df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+
+
+def _normalize_msr(df):
+    if any(column in df.columns for column in MSR_COORDINATE_COLUMNS):
+        df = split_coordinate_pairs(df)
+    for column in MSR_STRING_COLUMNS:
+        df[column] = df[column].astype('string')
+    return df.sort_values('MSR', kind='stable').reset_index(drop=True)
+
+
+def _write_parquet(df, parquet_path, row_group_size):
+    """Write atomically so concurrent readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(parquet_path))
+    os.makedirs(directory, exist_ok=True)
+    # Dot prefix keeps in-progress files out of dataset directory scans
+    tmp_path = os.path.join(directory, f".{os.path.basename(parquet_path)}.{os.getpid()}.tmp")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, tmp_path, row_group_size=row_group_size, compression='zstd')
+    os.replace(tmp_path, parquet_path)
+
+
+def write_meas_hist(df, parquet_path):
+    """Write measurement history to Parquet, sorted by Timestamp"""
+    _write_parquet(_normalize_meas_hist(df.copy()), parquet_path, MEAS_HIST_ROW_GROUP_SIZE)
+
+
+def write_msr_data(df, parquet_path):
+    """Write MSR measurement data to Parquet, sorted by MSR"""
+    _write_parquet(_normalize_msr(df.copy()), parquet_path, MSR_ROW_GROUP_SIZE)
+
+
+def write_msr_partitions(df, root_dir, part_name, date_column='date'):
+    """
+    Write MSR measurement data into hive-style date partitions (<root_dir>/date=YYYY-MM-DD/<part_name>.parquet).
+
+    Args:
+        df: MSR measurement rows with a `date_column` of partition dates
+        root_dir: Partitioned dataset directory
+        part_name: File name (without extension) for this part; rewriting the
+            same part_name replaces the previous file, so writes are idempotent
+
+    Returns:
+        list: Paths of the written part files
+    """
+    paths = []
+    for date, part in df.groupby(date_column, sort=True):
+        path = os.path.join(root_dir, f"{date_column}={date}", f"{part_name}.parquet")
+        write_msr_data(part.drop(columns=date_column), path)
+        paths.append(path)
+    return paths
+
+
+def import_meas_hist_csv(csv_path, parquet_path):
+    """Convert a measurement history CSV file to Parquet"""
+    # keep_default_na=False keeps Align_fail "None" as a string instead of NaN
+    df = pd.read_csv(csv_path, keep_default_na=False)
+    write_meas_hist(df, parquet_path)
+    logger.info("Imported measurement history CSV", csv_path=csv_path, parquet_path=parquet_path, rows=len(df))
+
+
+def import_msr_csv(csv_path, parquet_path):
+    """Convert an MSR measurement data CSV file to Parquet"""
+    df = pd.read_csv(csv_path, keep_default_na=False)
+    write_msr_data(df, parquet_path)
+    logger.info("Imported MSR data CSV", csv_path=csv_path, parquet_path=parquet_path, rows=len(df))
+
+
+def is_stale(target_path, *source_paths):
+    """True if target_path is missing or older than any existing source path"""
+    if not os.path.exists(target_path):
+        return True
+    target_mtime = os.path.getmtime(target_path)
+    return any(os.path.exists(path) and os.path.getmtime(path) > target_mtime for path in source_paths)
+
+
+def _to_pandas(table):
+    return table.to_pandas(types_mapper={pa.string(): pd.StringDtype(), pa.large_string(): pd.StringDtype()}.get)
+
+
+def _read(parquet_path, columns=None, filters=None):
+    return _to_pandas(pq.read_table(parquet_path, columns=columns, filters=filters or None))
+
+
+def read_meas_hist(parquet_path, columns=None, start=None, end=None, msrs=None):
+    """
+    Read measurement history from Parquet.
+
+    Args:
+        parquet_path: Parquet file written by write_meas_hist
+        columns: Columns to read (None for all)
+        start: Optional inclusive lower bound on Timestamp
+        end: Optional exclusive upper bound on Timestamp
+        msrs: Optional collection of MSR IDs to keep
+
+    Returns:
+        pd.DataFrame: Matching rows in Timestamp order
+    """
+    filters = []
+    if start is not None:
+        filters.append(('Timestamp', '>=', pd.Timestamp(start)))
+    if end is not None:
+        filters.append(('Timestamp', '<', pd.Timestamp(end)))
+    if msrs is not None:
+        filters.append(('MSR', 'in', list(msrs)))
+    return _read(parquet_path, columns, filters)
+
+
+def iter_meas_hist(parquet_path, columns=None, start=None, end=None, equals=None, batch_size=1000):
+    """
+    Stream measurement history from Parquet in Timestamp order, one batch at a time.
+
+    Args:
+        parquet_path: Parquet file written by write_meas_hist
+        columns: Columns to read (None for all)
+        start: Optional inclusive lower bound on Timestamp
+        end: Optional exclusive upper bound on Timestamp
+        equals: Optional dict of column -> value to keep
+        batch_size: Maximum rows per yielded DataFrame
+
+    Yields:
+        pd.DataFrame: Matching rows, at most batch_size per batch
+    """
+    expression = None
+    conditions = []
+    if start is not None:
+        conditions.append(ds.field('Timestamp') >= pa.scalar(pd.Timestamp(start), type=pa.timestamp('ns')))
+    if end is not None:
+        conditions.append(ds.field('Timestamp') < pa.scalar(pd.Timestamp(end), type=pa.timestamp('ns')))
+    for column, value in (equals or {}).items():
+        conditions.append(ds.field(column) == value)
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    # Single-threaded scan keeps batches in file (Timestamp) order
+    dataset = ds.dataset(parquet_path, format='parquet')
+    for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=batch_size, use_threads=False):
+        if batch.num_rows:
+            yield _to_pandas(pa.Table.from_batches([batch]))
+
+
+def read_msr_partitions(root_dir, columns=None, start_date=None, end_date=None, msrs=None):
+    """
+    Read MSR measurement data from date partitions written by write_msr_partitions.
+    Partitions outside [start_date, end_date] are never opened.
+
+    Args:
+        root_dir: Partitioned dataset directory
+        columns: Columns to read (None for all)
+        start_date: Optional inclusive first partition date (YYYY-MM-DD)
+        end_date: Optional inclusive last partition date (YYYY-MM-DD)
+        msrs: Optional collection of MSR IDs to keep
+
+    Returns:
+        pd.DataFrame: Matching rows
+    """
+    conditions = []
+    if start_date is not None:
+        conditions.append(ds.field('date') >= str(start_date))
+    if end_date is not None:
+        conditions.append(ds.field('date') <= str(end_date))
+    if msrs is not None:
+        conditions.append(ds.field('MSR').isin(list(msrs)))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    dataset = ds.dataset(root_dir, format='parquet', partitioning=ds.partitioning(
+        pa.schema([('date', pa.string())]), flavor='hive'))
+    return _to_pandas(dataset.to_table(columns=columns, filter=expression))
+
+
+def read_msr_data(parquet_path, columns=None, msrs=None):
+    """
+    Read MSR measurement data from Parquet.
+
+    Args:
+        parquet_path: Parquet file written by write_msr_data
+        columns: Columns to read (None for all)
+        msrs: Optional collection of MSR IDs to keep
+
+    Returns:
+        pd.DataFrame: Matching rows in MSR order
+    """
+    filters = [('MSR', 'in', list(msrs))] if msrs is not None else None
+    return _read(parquet_path, columns, filters)
@@ -0,0 +1,157 @@
+"""
+Benchmark for the MSR measurement data generator.
+
+Compares the vectorized generator (msr_data.iter_msr_data) against the previous
+row-by-row implementation at 500, 50k and 500k measurement history rows.
+The row-by-row baseline is timed on at most LEGACY_MAX_ROWS rows and
+extrapolated linearly beyond that, since it takes tens of minutes at 500k.
+
+Usage (from the repository root):
+    python -m api.skewvoir_beta.dummy.benchmark_msr_data [500 50000 500000]
+"""
+import os
+import sys
+import time
+import random
+import hashlib
+import numpy as np
+import pandas as pd
+from .msr_data import iter_msr_data, PARAMETER_MAPPING
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_data', 'meas_hist_dummy_data.csv')
+DEFAULT_SIZES = [500, 50000, 500000]
+LEGACY_MAX_ROWS = 2000
+CHUNK_SIZE = 10000
+
+
+def build_meas_hist(n_rows):
+    """Tile the sample measurement history to n_rows, keeping MSR IDs unique"""
+    sample = pd.read_csv(SAMPLE_CSV, usecols=['MSR', 'Class', 'total_images'])
+    repeats = -(-n_rows // len(sample))
+    df = pd.concat([sample] * repeats, ignore_index=True).iloc[:n_rows].copy()
+    copy_no = (np.arange(n_rows) // len(sample)).astype(str)
+    df['MSR'] = df['MSR'] + '_' + copy_no
+    return df
+
+
+def legacy_generate_msr_data(meas_hist_df, seed_offset=0):
+    """Previous implementation: iterrows, global RNG reseeding and one dict per record"""
+    chip_positions = []
+    for x in range(-10, 11):
+        for y in range(-10, 11):
+            if abs(x) + abs(y) <= 15:
+                chip_positions.append((x, y))
+
+    all_msr_data = []
+
+    for idx, meas_record in meas_hist_df.iterrows():
+        msr = meas_record['MSR']
+        class_name = meas_record['Class']
+        total_images = meas_record['total_images']
+
+        msr_seed = int(hashlib.md5(msr.encode()).hexdigest()[:8], 16) + seed_offset
+        np.random.seed(msr_seed % (2 ** 31))
+        random.seed(msr_seed % (2 ** 31))
+
+        num_measurements = min(random.randint(20, 80), total_images // 2)
+        available_params = PARAMETER_MAPPING.get(class_name, ['WAFER', 'EDGE', 'LEVEL'])
+        num_params = min(random.randint(1, 3), len(available_params))
+        selected_params = random.sample(available_params, num_params)
+
+        for sequence in range(1, num_measurements + 1):
+            chip_idx = (sequence - 1) % len(chip_positions)
+            chip_x, chip_y = chip_positions[chip_idx]
+            chip_number = f"{chip_x}, {chip_y}"
+
+            base_chip_coord = 12000000 + (sequence * 1000) + (msr_seed % 1000000)
+            base_chip_coord_y = 250000 + (sequence * 100)
+            chip_coordinate = f"{base_chip_coord},{base_chip_coord_y}"
+
+            base_stage_x = 175000000 + (sequence * 10000) + (msr_seed % 100000)
+            base_stage_y = 147000000 + (sequence * 5000)
+            stage_coordinate = f"{base_stage_x}, {base_stage_y}"
+
+            if sequence % 20 == 0:
+                dnum_group = "-1, -1"
+                mp_number = -1
+            else:
+                mp_x = (sequence - 1) % 30
+                dnum_group = f"{mp_x}, -1"
+                mp_number = mp_x
+
+            for param_idx, param in enumerate(selected_params):
+                param_seed = msr_seed + sequence + param_idx * 1000
+                np.random.seed(param_seed % (2 ** 31))
+
+                if 'CD' in param or 'WIDTH' in param:
+                    cd_value = round(np.random.uniform(15.0, 45.0), 2)
+                elif 'HEIGHT' in param or 'DEPTH' in param:
+                    cd_value = round(np.random.uniform(50.0, 200.0), 2)
+                elif 'ANGLE' in param:
+                    cd_value = round(np.random.uniform(85.0, 95.0), 2)
+                elif 'OVERLAY' in param:
+                    cd_value = round(np.random.uniform(-5.0, 5.0), 2)
+                elif 'ROUGH' in param:
+                    cd_value = round(np.random.uniform(1.0, 5.0), 2)
+                elif 'THICK' in param:
+                    cd_value = round(np.random.uniform(10.0, 100.0), 2)
+                else:
+                    cd_value = round(np.random.uniform(10.0, 50.0), 2)
+
+                all_msr_data.append({
+                    'MSR': msr,
+                    'sequence': sequence,
+                    'chip_number': chip_number,
+                    'chip_coordinate': chip_coordinate,
+                    'stage_coordinate': stage_coordinate,
+                    'dnum_group': dnum_group,
+                    'mp_number': mp_number,
+                    'parameter': param,
+                    'cd_value': cd_value,
+                    'no_of_mp_image': 1 + (param_seed % 5),
+                    'mp_image_name_01': f"{msr}_{sequence:03d}_{param}_{param_seed % 10000:04d}.tif"
+                })
+
+    msr_df = pd.DataFrame(all_msr_data)
+    for column in ['MSR', 'chip_number', 'chip_coordinate', 'stage_coordinate',
+                   'dnum_group', 'parameter', 'mp_image_name_01']:
+        msr_df[column] = msr_df[column].astype('string')
+    return msr_df
+
+
+def time_legacy(meas_hist_df):
+    """Returns (seconds, output rows, extrapolated flag)"""
+    sample = meas_hist_df.iloc[:LEGACY_MAX_ROWS]
+    started = time.perf_counter()
+    rows = len(legacy_generate_msr_data(sample))
+    elapsed = time.perf_counter() - started
+
+    scale = len(meas_hist_df) / len(sample)
+    return elapsed * scale, int(rows * scale), scale > 1
+
+
+def time_vectorized(meas_hist_df):
+    """Returns (seconds, output rows). Generated in chunks so 500k rows fit in memory."""
+    started = time.perf_counter()
+    rows = 0
+    for chunk in iter_msr_data(meas_hist_df, chunk_size=CHUNK_SIZE):
+        rows += len(chunk)
+    return time.perf_counter() - started, rows
+
+
+def run(sizes):
+    print(f"{'meas_hist rows':>15} {'msr rows':>12} {'legacy (s)':>14} {'vectorized (s)':>15} {'speedup':>9}")
+    for n_rows in sizes:
+        meas_hist_df = build_meas_hist(n_rows)
+        legacy_seconds, _, extrapolated = time_legacy(meas_hist_df)
+        vectorized_seconds, rows = time_vectorized(meas_hist_df)
+
+        legacy_label = f"{legacy_seconds:.2f}{'*' if extrapolated else ''}"
+        print(f"{n_rows:>15,} {rows:>12,} {legacy_label:>14} {vectorized_seconds:>15.2f} "
+              f"{legacy_seconds / vectorized_seconds:>8.1f}x")
+
+    print(f"\n* legacy timed on {LEGACY_MAX_ROWS:,} rows and extrapolated linearly")
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -1,9 +1,224 @@
 import pandas as pd
 import numpy as np
-import random
-from datetime import datetime
 import hashlib
 
+# Measurement parameters by class type
+PARAMETER_MAPPING = {
+    'CD': ['CD_TOP', 'CD_BOTTOM', 'CD_MIDDLE', 'SIDEWALL_ANGLE'],
+    'OVL': ['OVERLAY_X', 'OVERLAY_Y', 'OVERLAY_R', 'OVERLAY_THETA'],
+    'PROF': ['HEIGHT', 'SIDEWALL_ANGLE', 'TOP_WIDTH', 'BOTTOM_WIDTH'],
+    'ROUGH': ['LWR', 'LER', 'RMS_ROUGHNESS', 'CORRELATION_LENGTH'],
+    'THICK': ['THICKNESS', 'UNIFORMITY', 'REFRACTIVE_INDEX'],
+    'GATE': ['GATE_CD', 'GATE_HEIGHT', 'GATE_PROFILE'],
+    'CONTACT': ['CONTACT_CD', 'CONTACT_DEPTH', 'ASPECT_RATIO'],
+    'VIA': ['VIA_CD', 'VIA_DEPTH', 'TAPER_ANGLE'],
+    'METAL': ['LINE_WIDTH', 'LINE_HEIGHT', 'PITCH', 'SPACE_WIDTH']
+}
+DEFAULT_PARAMETERS = ['WAFER', 'EDGE', 'LEVEL']
+
+MIN_MEASUREMENTS = 20
+MAX_MEASUREMENTS = 80
+MAX_PARAMS = 3
+MAX_CLASS_PARAMS = max(len(params) for params in list(PARAMETER_MAPPING.values()) + [DEFAULT_PARAMETERS])
+
+# Uniform draws per MSR stream:
+# [num_measurements, num_params, parameter order keys..., cd values (sequence-major)...]
+_PARAM_KEY_OFFSET = 2
+_VALUE_OFFSET = _PARAM_KEY_OFFSET + MAX_CLASS_PARAMS
+_DRAWS_PER_MSR = _VALUE_OFFSET + MAX_MEASUREMENTS * MAX_PARAMS
+
+
+def _build_chip_positions():
+    # Generate chip positions for a typical wafer (simplified grid)
+    chip_positions = []
+    for x in range(-10, 11):  # -10 to 10
+        for y in range(-10, 11):  # -10 to 10
+            # Skip corner positions (realistic wafer shape)
+            if abs(x) + abs(y) <= 15:
+                chip_positions.append((x, y))
+    return np.array(chip_positions, dtype=np.int64)
+
+
+def _value_range(param):
+    """Realistic value range for a parameter type (nm unless noted)"""
+    if 'CD' in param or 'WIDTH' in param:
+        return 15.0, 45.0
+    elif 'HEIGHT' in param or 'DEPTH' in param:
+        return 50.0, 200.0
+    elif 'ANGLE' in param:
+        return 85.0, 95.0  # degrees
+    elif 'OVERLAY' in param:
+        return -5.0, 5.0
+    elif 'ROUGH' in param:
+        return 1.0, 5.0
+    elif 'THICK' in param:
+        return 10.0, 100.0
+    else:
+        return 10.0, 50.0  # default range
+
+
+CHIP_POSITIONS = _build_chip_positions()
+
+# Parameter vocabulary and per-class candidate codes (padded with -1)
+PARAMETERS = list(dict.fromkeys(
+    param for params in list(PARAMETER_MAPPING.values()) + [DEFAULT_PARAMETERS] for param in params
+))
+_PARAM_CODES = {param: code for code, param in enumerate(PARAMETERS)}
+_CLASS_NAMES = list(PARAMETER_MAPPING) + [None]  # None -> DEFAULT_PARAMETERS
+_CLASS_CODES = {class_name: code for code, class_name in enumerate(_CLASS_NAMES)}
+_CLASS_PARAM_COUNTS = np.array(
+    [len(PARAMETER_MAPPING.get(class_name, DEFAULT_PARAMETERS)) for class_name in _CLASS_NAMES])
+_CLASS_PARAM_CODES = np.full((len(_CLASS_NAMES), MAX_CLASS_PARAMS), -1, dtype=np.int64)
+for _code, _class_name in enumerate(_CLASS_NAMES):
+    _params = PARAMETER_MAPPING.get(_class_name, DEFAULT_PARAMETERS)
+    _CLASS_PARAM_CODES[_code, :len(_params)] = [_PARAM_CODES[param] for param in _params]
+
+_PARAM_LOW, _PARAM_HIGH = (np.array(bounds) for bounds in zip(*(_value_range(param) for param in PARAMETERS)))
+
+# Pre-rendered string pieces, indexed by position/sequence/code
+_PARAMETER_STR = np.array(PARAMETERS, dtype=object)
+_IMAGE_SEQUENCE_STR = np.array([f"_{sequence:03d}_" for sequence in range(MAX_MEASUREMENTS + 1)], dtype=object)
+_IMAGE_PARAMETER_STR = np.array([f"{param}_" for param in PARAMETERS], dtype=object)
+_IMAGE_CODE_STR = np.array([f"{code:04d}.tif" for code in range(10000)], dtype=object)
+
+
+def msr_seed(msr, seed_offset=0):
+    """Deterministic seed for an MSR: the same MSR always generates the same measurement data"""
+    return int(hashlib.md5(msr.encode()).hexdigest()[:8], 16) + seed_offset
+
+
+def _draw_msr_streams(seeds):
+    """One row of uniform draws per MSR, each from its own np.random.Generator stream"""
+    draws = np.empty((len(seeds), _DRAWS_PER_MSR))
+    for i, seed in enumerate(seeds):
+        np.random.default_rng(seed).random(out=draws[i])
+    return draws
+
+
+def _generate_chunk(msrs, class_names, total_images, seed_offset):
+    """Vectorized generation for one block of measurement history rows"""
+    seeds = np.array([msr_seed(msr, seed_offset) for msr in msrs], dtype=np.int64)
+    draws = _draw_msr_streams(seeds)
+
+    # Per-MSR layout: number of sequences, parameters and which parameters
+    class_codes = np.array([_CLASS_CODES.get(class_name, _CLASS_CODES[None]) for class_name in class_names],
+                           dtype=np.int64)
+    candidate_counts = _CLASS_PARAM_COUNTS[class_codes]
+    num_measurements = (MIN_MEASUREMENTS
+                        + (draws[:, 0] * (MAX_MEASUREMENTS - MIN_MEASUREMENTS + 1)).astype(np.int64))
+    num_measurements = np.clip(np.minimum(num_measurements, total_images // 2), 0, None)
+    num_params = np.minimum(1 + (draws[:, 1] * MAX_PARAMS).astype(np.int64), candidate_counts)
+
+    order_keys = draws[:, _PARAM_KEY_OFFSET:_VALUE_OFFSET].copy()
+    order_keys[np.arange(MAX_CLASS_PARAMS) >= candidate_counts[:, None]] = np.inf
+    selected_params = np.take_along_axis(
+        _CLASS_PARAM_CODES[class_codes], np.argsort(order_keys, axis=1), axis=1)
+
+    # Measurement points: one per (MSR, sequence)
+    point_msr = np.repeat(np.arange(len(msrs)), num_measurements)
+    point_starts = np.cumsum(num_measurements) - num_measurements
+    point_sequence = np.arange(len(point_msr)) - point_starts[point_msr] + 1
+    point_seeds = seeds[point_msr]
+
+    # Coordinates are generated as integer x/y pairs (see columnar_store.MSR_COORDINATE_COLUMNS)
+    chip_position = CHIP_POSITIONS[(point_sequence - 1) % len(CHIP_POSITIONS)]
+    chip_coordinate_x = 12000000 + point_sequence * 1000 + point_seeds % 1000000
+    chip_coordinate_y = 250000 + point_sequence * 100
+    stage_x = 175000000 + point_sequence * 10000 + point_seeds % 100000
+    stage_y = 147000000 + point_sequence * 5000
+
+    # Every 20th measurement has no data
+    point_mp_number = np.where(point_sequence % 20 == 0, -1, (point_sequence - 1) % 30)
+
+    # Expand to one row per (MSR, sequence, parameter), sequence-major
+    point = np.repeat(np.arange(len(point_msr)), num_params[point_msr])
+    point_row_starts = np.cumsum(num_params[point_msr]) - num_params[point_msr]
+    param_idx = np.arange(len(point)) - point_row_starts[point]
+    msr_pos = point_msr[point]
+    sequence = point_sequence[point]
+
+    param_code = selected_params[msr_pos, param_idx]
+    value_draw = draws[msr_pos, _VALUE_OFFSET + (sequence - 1) * MAX_PARAMS + param_idx]
+    low = _PARAM_LOW[param_code]
+    cd_value = np.round(low + value_draw * (_PARAM_HIGH[param_code] - low), 2)
+
+    param_seed = point_seeds[point] + sequence + param_idx * 1000
+    msr_column = np.asarray(msrs, dtype=object)[msr_pos]
+    mp_image_name_01 = (msr_column + _IMAGE_SEQUENCE_STR[sequence]
+                        + _IMAGE_PARAMETER_STR[param_code] + _IMAGE_CODE_STR[param_seed % 10000])
+    mp_number = point_mp_number[point]
+
+    return pd.DataFrame({
+        'MSR': msr_column,
+        'sequence': sequence,
+        'chip_number_x': chip_position[point, 0],
+        'chip_number_y': chip_position[point, 1],
+        'chip_coordinate_x': chip_coordinate_x[point],
+        'chip_coordinate_y': chip_coordinate_y[point],
+        'stage_coordinate_x': stage_x[point],
+        'stage_coordinate_y': stage_y[point],
+        'dnum_group_x': mp_number,
+        'dnum_group_y': np.full(len(point), -1),
+        'mp_number': mp_number,
+        'parameter': _PARAMETER_STR[param_code],
+        'cd_value': cd_value,
+        'no_of_mp_image': 1 + param_seed % 5,  # 1-5 images
+        'mp_image_name_01': mp_image_name_01
+    })
+
+
+def _set_dtypes(msr_df):
+    # Set appropriate data types
+    msr_df['MSR'] = msr_df['MSR'].astype('string')
+    msr_df['sequence'] = msr_df['sequence'].astype('int64')
+    for column in ['chip_number', 'chip_coordinate', 'stage_coordinate', 'dnum_group']:
+        msr_df[f'{column}_x'] = msr_df[f'{column}_x'].astype('int32')
+        msr_df[f'{column}_y'] = msr_df[f'{column}_y'].astype('int32')
+    msr_df['mp_number'] = msr_df['mp_number'].astype('int64')
+    msr_df['parameter'] = msr_df['parameter'].astype('string')
+    msr_df['cd_value'] = msr_df['cd_value'].astype('float64')
+    msr_df['no_of_mp_image'] = msr_df['no_of_mp_image'].astype('int64')
+    msr_df['mp_image_name_01'] = msr_df['mp_image_name_01'].astype('string')
+    return msr_df
+
+
+def iter_msr_data(meas_hist_df, seed_offset=0, chunk_size=10000):
+    """
+    Generate MSR measurement data in blocks of `chunk_size` measurement history rows.
+    Each MSR has its own random stream, so the output does not depend on the chunk size.
+
+    Parameters:
+    meas_hist_df: measurement history data (needs MSR, Class and total_images columns)
+    seed_offset: offset for random seed to generate different variations if needed
+    chunk_size: number of measurement history rows per generated block
+
+    Yields:
+    pd.DataFrame: MSR measurement rows for each block
+    """
+    msrs = meas_hist_df['MSR'].astype(str).to_numpy(dtype=object)
+    class_names = meas_hist_df['Class'].astype(str).to_numpy(dtype=object)
+    total_images = meas_hist_df['total_images'].to_numpy(dtype=np.int64)
+
+    for start in range(0, len(msrs), chunk_size):
+        stop = start + chunk_size
+        yield _set_dtypes(_generate_chunk(msrs[start:stop], class_names[start:stop],
+                                          total_images[start:stop], seed_offset))
+
+
+def generate_msr_data(meas_hist_df, seed_offset=0):
+    """
+    Generate MSR measurement data for every row of a measurement history DataFrame.
+
+    Parameters:
+    meas_hist_df: measurement history data (needs MSR, Class and total_images columns)
+    seed_offset: offset for random seed to generate different variations if needed
+    """
+    chunks = list(iter_msr_data(meas_hist_df, seed_offset))
+    if not chunks:
+        return _set_dtypes(_generate_chunk(np.array([], dtype=object), np.array([], dtype=object),
+                                           np.array([], dtype=np.int64), seed_offset))
+    return pd.concat(chunks, ignore_index=True)
+
 
 def generate_msr_data_from_csv(meas_hist_csv_path, seed_offset=0):
     """
@@ -17,138 +232,13 @@ def generate_msr_data_from_csv(meas_hist_csv_path, seed_offset=0):
 
     # Read measurement history data from CSV
     try:
-        meas_hist_df = pd.read_csv(meas_hist_csv_path)
+        meas_hist_df = pd.read_csv(meas_hist_csv_path, usecols=['MSR', 'Class', 'total_images'])
         print(f"Loaded {len(meas_hist_df)} measurement history records from CSV")
     except FileNotFoundError:
         print(f"Error: Could not find {meas_hist_csv_path}")
         return None
 
-    # Measurement parameters by class type
-    parameter_mapping = {
-        'CD': ['CD_TOP', 'CD_BOTTOM', 'CD_MIDDLE', 'SIDEWALL_ANGLE'],
-        'OVL': ['OVERLAY_X', 'OVERLAY_Y', 'OVERLAY_R', 'OVERLAY_THETA'],
-        'PROF': ['HEIGHT', 'SIDEWALL_ANGLE', 'TOP_WIDTH', 'BOTTOM_WIDTH'],
-        'ROUGH': ['LWR', 'LER', 'RMS_ROUGHNESS', 'CORRELATION_LENGTH'],
-        'THICK': ['THICKNESS', 'UNIFORMITY', 'REFRACTIVE_INDEX'],
-        'GATE': ['GATE_CD', 'GATE_HEIGHT', 'GATE_PROFILE'],
-        'CONTACT': ['CONTACT_CD', 'CONTACT_DEPTH', 'ASPECT_RATIO'],
-        'VIA': ['VIA_CD', 'VIA_DEPTH', 'TAPER_ANGLE'],
-        'METAL': ['LINE_WIDTH', 'LINE_HEIGHT', 'PITCH', 'SPACE_WIDTH']
-    }
-
-    # Generate chip positions for a typical wafer (simplified grid)
-    chip_positions = []
-    for x in range(-10, 11):  # -10 to 10
-        for y in range(-10, 11):  # -10 to 10
-            # Skip corner positions (realistic wafer shape)
-            if abs(x) + abs(y) <= 15:
-                chip_positions.append((x, y))
-
-    all_msr_data = []
-
-    for idx, meas_record in meas_hist_df.iterrows():
-        msr = meas_record['MSR']
-        class_name = meas_record['Class']
-        total_images = meas_record['total_images']
-
-        # Use MSR as seed for consistent generation per measurement
-        # This ensures same MSR always generates same measurement data
-        msr_seed = int(hashlib.md5(msr.encode()).hexdigest()[:8], 16) + seed_offset
-        np.random.seed(msr_seed % (2 ** 31))  # Ensure seed is within valid range
-        random.seed(msr_seed % (2 ** 31))
-
-        # Determine number of measurement points (consistent per MSR)
-        num_measurements = min(random.randint(20, 80), total_images // 2)
-
-        # Select parameters for this measurement class
-        available_params = parameter_mapping.get(class_name, ['WAFER', 'EDGE', 'LEVEL'])
-        num_params = min(random.randint(1, 3), len(available_params))
-        selected_params = random.sample(available_params, num_params)
-
-        # Generate measurements for each sequence
-        for sequence in range(1, num_measurements + 1):
-            # Select chip position (consistent pattern per MSR)
-            chip_idx = (sequence - 1) % len(chip_positions)
-            chip_x, chip_y = chip_positions[chip_idx]
-            chip_number = f"{chip_x}, {chip_y}"
-
-            # Generate coordinates (deterministic based on sequence and MSR)
-            base_chip_coord = 12000000 + (sequence * 1000) + (msr_seed % 1000000)
-            base_chip_coord_y = 250000 + (sequence * 100)
-            chip_coordinate = f"{base_chip_coord},{base_chip_coord_y}"
-
-            base_stage_x = 175000000 + (sequence * 10000) + (msr_seed % 100000)
-            base_stage_y = 147000000 + (sequence * 5000)
-            stage_coordinate = f"{base_stage_x}, {base_stage_y}"
-
-            # Generate dnum_group (measurement point group)
-            if sequence % 20 == 0:  # Every 20th measurement has no data
-                dnum_group = "-1, -1"
-                mp_number = -1
-            else:
-                mp_x = (sequence - 1) % 30  # Cycle through 0-29
-                dnum_group = f"{mp_x}, -1"  # y is always -1
-                mp_number = mp_x
-
-            # Generate measurement data for each parameter
-            for param_idx, param in enumerate(selected_params):
-                # Generate realistic CD values based on parameter type (deterministic)
-                param_seed = msr_seed + sequence + param_idx * 1000
-                np.random.seed(param_seed % (2 ** 31))
-
-                if 'CD' in param or 'WIDTH' in param:
-                    cd_value = round(np.random.uniform(15.0, 45.0), 2)  # nm range
-                elif 'HEIGHT' in param or 'DEPTH' in param:
-                    cd_value = round(np.random.uniform(50.0, 200.0), 2)  # nm range
-                elif 'ANGLE' in param:
-                    cd_value = round(np.random.uniform(85.0, 95.0), 2)  # degrees
-                elif 'OVERLAY' in param:
-                    cd_value = round(np.random.uniform(-5.0, 5.0), 2)  # nm range
-                elif 'ROUGH' in param:
-                    cd_value = round(np.random.uniform(1.0, 5.0), 2)  # nm range
-                elif 'THICK' in param:
-                    cd_value = round(np.random.uniform(10.0, 100.0), 2)  # nm range
-                else:
-                    cd_value = round(np.random.uniform(10.0, 50.0), 2)  # default range
-
-                # Number of images for this measurement point
-                no_of_mp_image = 1 + (param_seed % 5)  # 1-5 images
-
-                # Generate image file name (deterministic)
-                mp_image_name_01 = f"{msr}_{sequence:03d}_{param}_{param_seed % 10000:04d}.tif"
-
-                # Add measurement record
-                all_msr_data.append({
-                    'MSR': msr,
-                    'sequence': sequence,
-                    'chip_number': chip_number,
-                    'chip_coordinate': chip_coordinate,
-                    'stage_coordinate': stage_coordinate,
-                    'dnum_group': dnum_group,
-                    'mp_number': mp_number,
-                    'parameter': param,
-                    'cd_value': cd_value,
-                    'no_of_mp_image': no_of_mp_image,
-                    'mp_image_name_01': mp_image_name_01
-                })
-
-    # Create DataFrame
-    msr_df = pd.DataFrame(all_msr_data)
-
-    # Set appropriate data types
-    msr_df['MSR'] = msr_df['MSR'].astype('string')
-    msr_df['sequence'] = msr_df['sequence'].astype('int64')
-    msr_df['chip_number'] = msr_df['chip_number'].astype('string')
-    msr_df['chip_coordinate'] = msr_df['chip_coordinate'].astype('string')
-    msr_df['stage_coordinate'] = msr_df['stage_coordinate'].astype('string')
-    msr_df['dnum_group'] = msr_df['dnum_group'].astype('string')
-    msr_df['mp_number'] = msr_df['mp_number'].astype('int64')
-    msr_df['parameter'] = msr_df['parameter'].astype('string')
-    msr_df['cd_value'] = msr_df['cd_value'].astype('float64')
-    msr_df['no_of_mp_image'] = msr_df['no_of_mp_image'].astype('int64')
-    msr_df['mp_image_name_01'] = msr_df['mp_image_name_01'].astype('string')
-
-    return msr_df
+    return generate_msr_data(meas_hist_df, seed_offset)
 
 
 def get_msr_data_for_msr_id(msr_id, meas_hist_csv_path):
@@ -156,107 +246,14 @@ def get_msr_data_for_msr_id(msr_id, meas_hist_csv_path):
     Get MSR measurement data for a specific MSR ID
     Useful for Flask API endpoints
     """
-    # Read measurement history to verify MSR exists
-    meas_hist_df = pd.read_csv(meas_hist_csv_path)
+    meas_hist_df = pd.read_csv(meas_hist_csv_path, usecols=['MSR', 'Class', 'total_images'])
+    meas_record = meas_hist_df[meas_hist_df['MSR'] == msr_id]
 
-    if msr_id not in meas_hist_df['MSR'].values:
+    if meas_record.empty:
         return None
 
-    # Get the specific measurement record
-    meas_record = meas_hist_df[meas_hist_df['MSR'] == msr_id].iloc[0]
-
-    # Generate MSR data for just this MSR (same logic as above but for single MSR)
-    class_name = meas_record['Class']
-    total_images = meas_record['total_images']
-
-    # Use MSR as seed for consistent generation
-    msr_seed = int(hashlib.md5(msr_id.encode()).hexdigest()[:8], 16)
-    np.random.seed(msr_seed % (2 ** 31))
-    random.seed(msr_seed % (2 ** 31))
-
-    parameter_mapping = {
-        'CD': ['CD_TOP', 'CD_BOTTOM', 'CD_MIDDLE', 'SIDEWALL_ANGLE'],
-        'OVL': ['OVERLAY_X', 'OVERLAY_Y', 'OVERLAY_R', 'OVERLAY_THETA'],
-        'PROF': ['HEIGHT', 'SIDEWALL_ANGLE', 'TOP_WIDTH', 'BOTTOM_WIDTH'],
-        'ROUGH': ['LWR', 'LER', 'RMS_ROUGHNESS', 'CORRELATION_LENGTH'],
-        'THICK': ['THICKNESS', 'UNIFORMITY', 'REFRACTIVE_INDEX'],
-        'GATE': ['GATE_CD', 'GATE_HEIGHT', 'GATE_PROFILE'],
-        'CONTACT': ['CONTACT_CD', 'CONTACT_DEPTH', 'ASPECT_RATIO'],
-        'VIA': ['VIA_CD', 'VIA_DEPTH', 'TAPER_ANGLE'],
-        'METAL': ['LINE_WIDTH', 'LINE_HEIGHT', 'PITCH', 'SPACE_WIDTH']
-    }
-
-    chip_positions = []
-    for x in range(-10, 11):
-        for y in range(-10, 11):
-            if abs(x) + abs(y) <= 15:
-                chip_positions.append((x, y))
-
-    num_measurements = min(random.randint(20, 80), total_images // 2)
-    available_params = parameter_mapping.get(class_name, ['WAFER', 'EDGE', 'LEVEL'])
-    num_params = min(random.randint(1, 3), len(available_params))
-    selected_params = random.sample(available_params, num_params)
-
-    msr_data = []
-
-    for sequence in range(1, num_measurements + 1):
-        chip_idx = (sequence - 1) % len(chip_positions)
-        chip_x, chip_y = chip_positions[chip_idx]
-        chip_number = f"{chip_x}, {chip_y}"
-
-        base_chip_coord = 12000000 + (sequence * 1000) + (msr_seed % 1000000)
-        base_chip_coord_y = 250000 + (sequence * 100)
-        chip_coordinate = f"{base_chip_coord},{base_chip_coord_y}"
-
-        base_stage_x = 175000000 + (sequence * 10000) + (msr_seed % 100000)
-        base_stage_y = 147000000 + (sequence * 5000)
-        stage_coordinate = f"{base_stage_x}, {base_stage_y}"
-
-        if sequence % 20 == 0:
-            dnum_group = "-1, -1"
-            mp_number = -1
-        else:
-            mp_x = (sequence - 1) % 30
-            dnum_group = f"{mp_x}, -1"
-            mp_number = mp_x
-
-        for param_idx, param in enumerate(selected_params):
-            param_seed = msr_seed + sequence + param_idx * 1000
-            np.random.seed(param_seed % (2 ** 31))
-
-            if 'CD' in param or 'WIDTH' in param:
-                cd_value = round(np.random.uniform(15.0, 45.0), 2)
-            elif 'HEIGHT' in param or 'DEPTH' in param:
-                cd_value = round(np.random.uniform(50.0, 200.0), 2)
-            elif 'ANGLE' in param:
-                cd_value = round(np.random.uniform(85.0, 95.0), 2)
-            elif 'OVERLAY' in param:
-                cd_value = round(np.random.uniform(-5.0, 5.0), 2)
-            elif 'ROUGH' in param:
-                cd_value = round(np.random.uniform(1.0, 5.0), 2)
-            elif 'THICK' in param:
-                cd_value = round(np.random.uniform(10.0, 100.0), 2)
-            else:
-                cd_value = round(np.random.uniform(10.0, 50.0), 2)
-
-            no_of_mp_image = 1 + (param_seed % 5)
-            mp_image_name_01 = f"{msr_id}_{sequence:03d}_{param}_{param_seed % 10000:04d}.tif"
-
-            msr_data.append({
-                'MSR': msr_id,
-                'sequence': sequence,
-                'chip_number': chip_number,
-                'chip_coordinate': chip_coordinate,
-                'stage_coordinate': stage_coordinate,
-                'dnum_group': dnum_group,
-                'mp_number': mp_number,
-                'parameter': param,
-                'cd_value': cd_value,
-                'no_of_mp_image': no_of_mp_image,
-                'mp_image_name_01': mp_image_name_01
-            })
-
-    return pd.DataFrame(msr_data)
+    # Generate MSR data for just this MSR (same generator as the full table)
+    return generate_msr_data(meas_record.iloc[:1])
 
 
 # Example usage:
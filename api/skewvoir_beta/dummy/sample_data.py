@@ -0,0 +1,80 @@
+"""
+Dummy SkewVoir data source for development environment.
+Imports the sample measurement history CSV into Parquet once, generates the
+matching MSR measurement data from it, and serves both through a reloading
+MSR index. The CSV is only re-read when it changes.
+"""
+import os
+from config import Config
+from .msr_data import generate_msr_data
+from .. import columnar_store
+from ..msr_index import ReloadingMsrIndex
+
+SAMPLE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_data')
+MEAS_HIST_CSV = os.path.join(SAMPLE_DATA_DIR, 'meas_hist_dummy_data.csv')
+
+MEAS_HIST_PARQUET = os.path.join(Config.SKEWVOIR_DATA_DIR, 'dummy', 'meas_hist.parquet')
+MSR_PARQUET = os.path.join(Config.SKEWVOIR_DATA_DIR, 'dummy', 'msr_data.parquet')
+
+
+def ensure_parquet():
+    """Convert the sample CSV and generate MSR data if the Parquet files are missing or stale"""
+    if columnar_store.is_stale(MEAS_HIST_PARQUET, MEAS_HIST_CSV):
+        columnar_store.import_meas_hist_csv(MEAS_HIST_CSV, MEAS_HIST_PARQUET)
+
+    if columnar_store.is_stale(MSR_PARQUET, MEAS_HIST_PARQUET):
+        meas_hist_df = columnar_store.read_meas_hist(MEAS_HIST_PARQUET, columns=['MSR', 'Class', 'total_images'])
+        columnar_store.write_msr_data(generate_msr_data(meas_hist_df), MSR_PARQUET)
+
+
+def load_meas_hist(columns=None, start=None, end=None, msrs=None):
+    """
+    Load measurement history, reading only the requested columns/rows.
+
+    Returns:
+        pd.DataFrame: Measurement history data in Timestamp order
+    """
+    ensure_parquet()
+    return columnar_store.read_meas_hist(MEAS_HIST_PARQUET, columns=columns, start=start, end=end, msrs=msrs)
+
+
+def iter_meas_hist(columns=None, start=None, end=None, equals=None, batch_size=1000):
+    """
+    Stream measurement history in Timestamp order without loading it all.
+
+    Yields:
+        pd.DataFrame: Batches of at most batch_size rows
+    """
+    ensure_parquet()
+    return columnar_store.iter_meas_hist(MEAS_HIST_PARQUET, columns=columns, start=start, end=end,
+                                         equals=equals, batch_size=batch_size)
+
+
+def load_msr_data(columns=None, msrs=None):
+    """
+    Load MSR measurement data, reading only the requested columns/rows.
+
+    Returns:
+        pd.DataFrame: MSR measurement data in MSR order
+    """
+    ensure_parquet()
+    return columnar_store.read_msr_data(MSR_PARQUET, columns=columns, msrs=msrs)
+
+
+def load_data():
+    """
+    Load measurement history and MSR measurement data.
+
+    Returns:
+        tuple: (meas_hist_df, msr_df)
+    """
+    return load_meas_hist(), load_msr_data()
+
+
+def source_files():
+    """Files whose changes should trigger a reload"""
+    return [MEAS_HIST_CSV]
+
+
+# Shared index instance, loaded on first access
+msr_store = ReloadingMsrIndex(load_data, source_files())
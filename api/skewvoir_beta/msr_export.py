@@ -0,0 +1,70 @@
+"""
+Streaming export of MSR measurement data.
+
+Walks measurement history in Timestamp order a batch of runs at a time, reads
+only those MSRs' measurement rows and serializes each chunk before fetching
+the next, so memory stays bounded by the batch size rather than the range.
+"""
+import io
+import json
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+MEAS_HIST_EXPORT_COLUMNS = ['Timestamp', 'eqp_id', 'Recipe', 'LotID', 'MSR']
+EXPORT_BATCH_SIZE = 500  # measurement history rows per chunk
+
+
+def iter_export_frames(meas_hist_batches, load_msr_data, parameter=None):
+    """
+    Join each measurement history batch with its MSR measurement rows.
+
+    Args:
+        meas_hist_batches: Iterable of measurement history DataFrames in Timestamp order
+        load_msr_data: Callable(msrs=...) returning MSR measurement rows for those MSRs
+        parameter: Optional parameter to keep
+
+    Yields:
+        pd.DataFrame: MSR rows with the run's MEAS_HIST_EXPORT_COLUMNS, in run order
+    """
+    for meas_hist_df in meas_hist_batches:
+        meas_hist_df = meas_hist_df[MEAS_HIST_EXPORT_COLUMNS].drop_duplicates('MSR')
+        msr_df = load_msr_data(msrs=meas_hist_df['MSR'].tolist())
+        if parameter:
+            msr_df = msr_df[msr_df['parameter'] == parameter]
+        if msr_df.empty:
+            continue
+
+        # Merge keeps the left (run) order and the sequence order within each MSR
+        yield meas_hist_df.merge(msr_df, on='MSR', how='inner', sort=False)
+
+
+def iter_ndjson(frames):
+    """Serialize frames as newline-delimited JSON records"""
+    for df in frames:
+        yield df.to_json(orient='records', lines=True, date_format='iso')
+
+
+def iter_csv(frames):
+    """Serialize frames as one CSV document with a single header row"""
+    header = True
+    for df in frames:
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=header, date_format='%Y-%m-%dT%H:%M:%S.%f')
+        header = False
+        yield buffer.getvalue()
+
+
+def iter_export(export_format, frames):
+    """Serialize frames in the requested format"""
+    if export_format == 'csv':
+        return iter_csv(frames)
+    return iter_ndjson(frames)
+
+
+def export_error_line(export_format, message):
+    """Trailing marker for an error raised after streaming has started"""
+    if export_format == 'csv':
+        return f"# export aborted: {message}\n"
+    return json.dumps({'status': 'error', 'message': message}) + '\n'
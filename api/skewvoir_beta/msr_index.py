@@ -0,0 +1,110 @@
+"""
+In-memory index over measurement history and MSR measurement data.
+Builds a hash index from MSR to its row range so lookups are O(1) slices
+instead of repeated CSV reads and linear scans.
+"""
+import os
+import time
+import threading
+import numpy as np
+import pandas as pd
+from ..utils.app_logger import logger
+
+
+class MsrIndex:
+    """Immutable snapshot of meas_hist and MSR data with an MSR -> row range index"""
+
+    def __init__(self, meas_hist_df, msr_df, version=None):
+        # Stable sort keeps the original sequence/parameter order within each MSR
+        msr_df = msr_df.sort_values('MSR', kind='stable').reset_index(drop=True)
+        msr_values = msr_df['MSR'].to_numpy(dtype=object)
+
+        if len(msr_values):
+            starts = np.flatnonzero(np.r_[True, msr_values[1:] != msr_values[:-1]])
+            stops = np.r_[starts[1:], len(msr_values)]
+            self.msr_ranges = dict(zip(msr_values[starts], zip(starts.tolist(), stops.tolist())))
+        else:
+            self.msr_ranges = {}
+
+        meas_hist_df = meas_hist_df.reset_index(drop=True)
+        # First meas_hist row per MSR, mirroring the previous `.iloc[0]` lookup
+        first_rows = meas_hist_df.drop_duplicates('MSR', keep='first')
+        self.meas_hist_positions = dict(zip(first_rows['MSR'], first_rows.index))
+
+        self.meas_hist_df = meas_hist_df
+        self.msr_df = msr_df
+        self.version = version
+
+    def __contains__(self, msr_id):
+        return msr_id in self.meas_hist_positions
+
+    def get_msr_rows(self, msr_id):
+        """Return the MSR measurement rows for an MSR ID, or None if unknown"""
+        if msr_id not in self.meas_hist_positions:
+            return None
+        start, stop = self.msr_ranges.get(msr_id, (0, 0))
+        return self.msr_df.iloc[start:stop]
+
+    def get_meas_hist_row(self, msr_id):
+        """Return the measurement history row for an MSR ID as a one-row DataFrame, or None if unknown"""
+        position = self.meas_hist_positions.get(msr_id)
+        if position is None:
+            return None
+        return self.meas_hist_df.iloc[position:position + 1]
+
+
+class ReloadingMsrIndex:
+    """
+    Holds the current MsrIndex and rebuilds it when a source file changes.
+
+    Args:
+        loader: Callable returning (meas_hist_df, msr_df)
+        source_paths: Files whose modification time determines the data version
+        check_interval: Minimum seconds between source file stat checks
+    """
+
+    def __init__(self, loader, source_paths, check_interval=1.0):
+        self.loader = loader
+        self.source_paths = list(source_paths)
+        self.check_interval = check_interval
+        self._index = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+
+    def _source_version(self):
+        return tuple(
+            (path, os.stat(path).st_mtime_ns, os.stat(path).st_size) if os.path.exists(path) else (path, None, None)
+            for path in self.source_paths
+        )
+
+    def get(self):
+        """Return the current index, reloading first if the source files changed"""
+        index = self._index
+        now = time.monotonic()
+        if index is not None and now - self._last_check < self.check_interval:
+            return index
+
+        with self._lock:
+            self._last_check = time.monotonic()
+            version = self._source_version()
+            if self._index is None or self._index.version != version:
+                started = time.perf_counter()
+                meas_hist_df, msr_df = self.loader()
+                self._index = MsrIndex(meas_hist_df, msr_df, version=version)
+                logger.info("MSR index loaded",
+                            meas_hist_rows=len(meas_hist_df),
+                            msr_rows=len(msr_df),
+                            msr_count=len(self._index.msr_ranges),
+                            duration=round(time.perf_counter() - started, 3))
+            return self._index
+
+
+def records_for_json(df):
+    """Convert a DataFrame to records with datetime columns as ISO format strings and NaN as None"""
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].map(lambda value: value.isoformat() if pd.notna(value) else None)
+        elif pd.api.types.is_float_dtype(df[column]) and df[column].isna().any():
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
+    return df.to_dict('records')
@@ -0,0 +1,172 @@
+"""
+Statistics cube over MSR measurement data.
+
+The base cube holds additive measures of cd_value (count, sum, sum of squares,
+min, max) per (MSR, parameter), annotated with the Recipe, eqp_id and week of
+the measurement. Any rollup (per Recipe, eqp_id, week, parameter or a mix)
+is an exact re-aggregation of those measures, from which mean, std, 3 sigma
+and range are derived. New MSRs are added incrementally; existing cells are
+never recomputed.
+"""
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from ..utils.app_logger import logger
+
+DIMENSIONS = ['MSR', 'parameter', 'Recipe', 'eqp_id', 'week']
+MEASURES = ['count', 'sum', 'sum_sq', 'min', 'max']
+DEFAULT_GROUP_BY = ['MSR', 'parameter']
+ROLLUP_CACHE_SIZE = 64
+
+
+def compute_base_cells(meas_hist_df, msr_df):
+    """
+    Aggregate cd_value per (MSR, parameter) in one groupby pass and attach the
+    measurement history dimensions.
+
+    Returns:
+        pd.DataFrame: One row per (MSR, parameter) with DIMENSIONS and MEASURES columns
+    """
+    values = msr_df[['MSR', 'parameter', 'cd_value']].copy()
+    values['cd_sq'] = values['cd_value'] ** 2
+
+    cells = values.groupby(['MSR', 'parameter'], sort=False, observed=True).agg(
+        count=('cd_value', 'count'),
+        sum=('cd_value', 'sum'),
+        sum_sq=('cd_sq', 'sum'),
+        min=('cd_value', 'min'),
+        max=('cd_value', 'max'),
+    ).reset_index()
+
+    dims = meas_hist_df[['MSR', 'Recipe', 'eqp_id', 'Timestamp']].drop_duplicates('MSR')
+    cells = cells.merge(dims, on='MSR', how='left')
+    cells['week'] = cells['Timestamp'].dt.to_period('W').dt.start_time.dt.strftime('%Y-%m-%d')
+    return cells[DIMENSIONS + MEASURES]
+
+
+def derive_statistics(cells):
+    """Add mean, std (sample), 3 sigma and range columns from the additive measures"""
+    cells = cells.copy()
+    count = cells['count'].astype('float64')
+    cells['mean'] = cells['sum'] / count
+    variance = (cells['sum_sq'] - cells['sum'] ** 2 / count) / (count - 1)
+    cells['std'] = np.sqrt(variance.clip(lower=0)).where(count > 1)
+    cells['three_sigma'] = 3 * cells['std']
+    cells['range'] = cells['max'] - cells['min']
+    return cells.drop(columns=['sum', 'sum_sq'])
+
+
+class StatisticsCube:
+    """Base (MSR, parameter) cells plus cached rollups"""
+
+    def __init__(self):
+        self.cells = pd.DataFrame(columns=DIMENSIONS + MEASURES)
+        self.msrs = set()
+        self.revision = 0
+        self._rollups = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, meas_hist_df, msr_df, known_msrs=None):
+        """
+        Add cells for MSRs not yet in the cube.
+
+        Args:
+            meas_hist_df: Measurement history (MSR, Recipe, eqp_id, Timestamp)
+            msr_df: MSR measurement data (MSR, parameter, cd_value)
+            known_msrs: Optional set of MSRs still present in the source; cells
+                for MSRs outside it are dropped
+
+        Returns:
+            int: Number of MSRs added
+        """
+        with self._lock:
+            cells = self.cells
+            if known_msrs is not None and self.msrs - known_msrs:
+                cells = cells[cells['MSR'].isin(known_msrs)]
+                self.msrs &= known_msrs
+
+            new_msrs = set(meas_hist_df['MSR']) - self.msrs
+            if new_msrs:
+                new_cells = compute_base_cells(
+                    meas_hist_df[meas_hist_df['MSR'].isin(new_msrs)],
+                    msr_df[msr_df['MSR'].isin(new_msrs)]
+                )
+                cells = new_cells if cells.empty else pd.concat([cells, new_cells], ignore_index=True)
+                self.msrs |= new_msrs
+
+            if cells is not self.cells:
+                self.cells = cells.reset_index(drop=True)
+                self.revision += 1
+                self._rollups.clear()
+
+            return len(new_msrs)
+
+    def rollup(self, group_by=None, filters=None):
+        """
+        Aggregate the cube to the requested dimensions.
+
+        Args:
+            group_by: List of DIMENSIONS to group by (defaults to MSR, parameter)
+            filters: Optional dict of dimension -> value to filter on first
+
+        Returns:
+            pd.DataFrame: Grouped statistics with count, mean, std, three_sigma, min, max, range
+        """
+        group_by = list(group_by or DEFAULT_GROUP_BY)
+        filters = filters or {}
+        invalid = [dim for dim in group_by + list(filters) if dim not in DIMENSIONS]
+        if invalid:
+            raise ValueError(f"Unknown dimensions: {', '.join(invalid)}")
+
+        key = (self.revision, tuple(group_by), tuple(sorted(filters.items())))
+        with self._lock:
+            cached = self._rollups.get(key)
+            if cached is not None:
+                self._rollups.move_to_end(key)
+                return cached
+            cells = self.cells
+
+        for dim, value in filters.items():
+            cells = cells[cells[dim] == value]
+
+        grouped = cells.groupby(group_by, sort=True, observed=True).agg(
+            count=('count', 'sum'),
+            sum=('sum', 'sum'),
+            sum_sq=('sum_sq', 'sum'),
+            min=('min', 'min'),
+            max=('max', 'max'),
+        ).reset_index()
+        result = derive_statistics(grouped)
+
+        with self._lock:
+            if key[0] == self.revision:
+                self._rollups[key] = result
+                if len(self._rollups) > ROLLUP_CACHE_SIZE:
+                    self._rollups.popitem(last=False)
+        return result
+
+    def cache_info(self):
+        return {'entries': len(self._rollups), 'max_entries': ROLLUP_CACHE_SIZE}
+
+
+class StatisticsService:
+    """Keeps a StatisticsCube in step with a ReloadingMsrIndex"""
+
+    def __init__(self, msr_store):
+        self.msr_store = msr_store
+        self.cube = StatisticsCube()
+        self._index_version = None
+        self._lock = threading.Lock()
+
+    def get_cube(self):
+        """Return the cube, adding any MSRs that are new since the last call"""
+        index = self.msr_store.get()
+        if index.version != self._index_version:
+            with self._lock:
+                if index.version != self._index_version:
+                    added = self.cube.update(index.meas_hist_df, index.msr_df,
+                                             known_msrs=set(index.meas_hist_positions))
+                    self._index_version = index.version
+                    logger.info("Statistics cube updated", added_msrs=added, total_msrs=len(self.cube.msrs))
+        return self.cube
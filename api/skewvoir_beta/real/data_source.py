@@ -0,0 +1,80 @@
+"""
+Real SkewVoir data source for the work environment.
+Measurement history is imported from the SKEWVOIR_MEAS_HIST_CSV export into
+Parquet once per change; MSR measurement data is read from the date partitions
+written by the scheduled MSR ingest (see msr_ingest), never from the raw files.
+The MSR index reloads when the export changes or the ingest watermark moves.
+"""
+import os
+import pandas as pd
+from config import Config
+from .. import columnar_store
+from ..msr_index import ReloadingMsrIndex
+from . import msr_ingest
+
+MEAS_HIST_CSV = Config.SKEWVOIR_MEAS_HIST_CSV
+MEAS_HIST_PARQUET = os.path.join(Config.SKEWVOIR_DATA_DIR, 'meas_hist.parquet')
+
+
+def ensure_parquet():
+    """Convert the measurement history export if the Parquet file is missing or stale"""
+    if not MEAS_HIST_CSV:
+        raise FileNotFoundError("SKEWVOIR_MEAS_HIST_CSV is not configured")
+    if columnar_store.is_stale(MEAS_HIST_PARQUET, MEAS_HIST_CSV):
+        columnar_store.import_meas_hist_csv(MEAS_HIST_CSV, MEAS_HIST_PARQUET)
+
+
+def load_meas_hist(columns=None, start=None, end=None, msrs=None):
+    """
+    Load measurement history, reading only the requested columns/rows.
+
+    Returns:
+        pd.DataFrame: Measurement history data in Timestamp order
+    """
+    ensure_parquet()
+    return columnar_store.read_meas_hist(MEAS_HIST_PARQUET, columns=columns, start=start, end=end, msrs=msrs)
+
+
+def iter_meas_hist(columns=None, start=None, end=None, equals=None, batch_size=1000):
+    """
+    Stream measurement history in Timestamp order without loading it all.
+
+    Yields:
+        pd.DataFrame: Batches of at most batch_size rows
+    """
+    ensure_parquet()
+    return columnar_store.iter_meas_hist(MEAS_HIST_PARQUET, columns=columns, start=start, end=end,
+                                         equals=equals, batch_size=batch_size)
+
+
+def load_msr_data(columns=None, msrs=None):
+    """
+    Load ingested MSR measurement data, reading only the requested columns/rows.
+
+    Returns:
+        pd.DataFrame: MSR measurement data in MSR order (empty, with an MSR column, before the first ingest)
+    """
+    msr_df = msr_ingest.load_msr_data(columns=columns, msrs=msrs)
+    msr_df = msr_df.drop(columns='date', errors='ignore')
+    if 'MSR' not in msr_df.columns:
+        msr_df['MSR'] = pd.Series(dtype='string')
+    return msr_df.sort_values('MSR', kind='stable').reset_index(drop=True)
+
+
+def load_data():
+    """
+    Load measurement history and MSR measurement data.
+
+    Returns:
+        tuple: (meas_hist_df, msr_df)
+    """
+    return load_meas_hist(), load_msr_data()
+
+
+def source_files():
+    """Files whose changes should trigger a reload"""
+    return [MEAS_HIST_CSV, msr_ingest.WATERMARK_PATH]
+
+
+# Shared index instance, loaded on first access
+msr_store = ReloadingMsrIndex(load_data, source_files())
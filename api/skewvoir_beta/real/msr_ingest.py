@@ -0,0 +1,192 @@
+"""
+Ingestion of real per-lot MSR result files into date-partitioned Parquet.
+
+Runs on the scheduler: new files under SKEWVOIR_INGEST_DIR are read in chunks,
+normalized (typed columns, "x, y" coordinates as int32 pairs) and written to
+<SKEWVOIR_DATA_DIR>/msr/date=YYYY-MM-DD/ partitions. Request handlers only read
+those partitions.
+
+A JSON watermark records each ingested file's size and mtime, so every file
+version is processed exactly once. Part files are named after the source file
+and chunk number, so re-running an interrupted ingest overwrites its own
+partial output instead of duplicating rows.
+"""
+import os
+import glob
+import json
+import time
+import hashlib
+from datetime import datetime
+import pandas as pd
+from config import Config
+from .. import columnar_store
+from ...utils.app_logger import logger
+from ...utils.job_watchdog import check_cancelled, JobCancelled
+
+MSR_PARTITION_DIR = os.path.join(Config.SKEWVOIR_DATA_DIR, 'msr')
+WATERMARK_PATH = os.path.join(MSR_PARTITION_DIR, '_watermark.json')
+INGEST_PATTERNS = ['*.csv', '*.csv.gz']
+SETTLE_SECONDS = 60  # Files modified more recently may still be being written
+
+CSV_DTYPES = {
+    'MSR': 'string',
+    'parameter': 'string',
+    'mp_image_name_01': 'string',
+    'chip_number': 'string',
+    'chip_coordinate': 'string',
+    'stage_coordinate': 'string',
+    'dnum_group': 'string',
+    'sequence': 'int64',
+    'mp_number': 'int64',
+    'no_of_mp_image': 'int64',
+    'cd_value': 'float64',
+}
+INT_COLUMNS = [column for column, dtype in CSV_DTYPES.items() if dtype == 'int64']
+
+
+def load_watermark(path=WATERMARK_PATH):
+    """Return {relative file path: {mtime_ns, size, rows, ingested_at}}"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('files', {})
+
+
+def save_watermark(files, path=WATERMARK_PATH):
+    """Write the watermark atomically"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'files': files, 'updated_at': datetime.now().isoformat()}, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def find_new_files(ingest_dir, watermark, settle_seconds=SETTLE_SECONDS):
+    """
+    List files not yet ingested in their current version, oldest first.
+
+    Returns:
+        list: (relative path, absolute path, stat) tuples
+    """
+    now = time.time()
+    candidates = []
+    for pattern in INGEST_PATTERNS:
+        for path in glob.glob(os.path.join(ingest_dir, '**', pattern), recursive=True):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # Removed or renamed since the glob
+            if now - stat.st_mtime < settle_seconds:
+                continue
+            relative_path = os.path.relpath(path, ingest_dir)
+            seen = watermark.get(relative_path)
+            if seen and seen['mtime_ns'] == stat.st_mtime_ns and seen['size'] == stat.st_size:
+                continue
+            candidates.append((relative_path, path, stat))
+    return sorted(candidates, key=lambda candidate: candidate[2].st_mtime_ns)
+
+
+def partition_dates(chunk, fallback_date):
+    """Measurement date per row from the MSR ID prefix (YYYYMMDD_...), else fallback_date"""
+    dates = pd.to_datetime(chunk['MSR'].str.slice(0, 8), format='%Y%m%d', errors='coerce')
+    return dates.dt.strftime('%Y-%m-%d').fillna(fallback_date)
+
+
+def _file_id(relative_path):
+    return hashlib.sha1(relative_path.encode()).hexdigest()[:16]
+
+
+def remove_file_parts(file_id, root_dir=MSR_PARTITION_DIR):
+    """Delete every part previously written for a source file"""
+    for path in glob.glob(os.path.join(root_dir, 'date=*', f"part-{file_id}-*.parquet")):
+        os.remove(path)
+
+
+def ingest_file(relative_path, path, stat, chunk_size=Config.SKEWVOIR_INGEST_CHUNK_SIZE,
+                root_dir=MSR_PARTITION_DIR):
+    """
+    Read one MSR result file in chunks and write its rows to date partitions.
+
+    Returns:
+        int: Number of rows ingested
+    """
+    file_id = _file_id(relative_path)
+    # A changed file replaces its previous version, which may have had more chunks
+    remove_file_parts(file_id, root_dir)
+
+    fallback_date = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d')
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [column for column in CSV_DTYPES if column not in header]
+    if missing:
+        logger.error("MSR file is missing columns", file=relative_path, missing=missing)
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    # Integer columns are read as nullable so a blank field drops its row instead of failing the file
+    dtypes = {column: 'Int64' if dtype == 'int64' else dtype for column, dtype in CSV_DTYPES.items()}
+    na_values = {column: [''] for column in ['cd_value'] + INT_COLUMNS}
+
+    rows = 0
+    reader = pd.read_csv(path, chunksize=chunk_size, dtype=dtypes, keep_default_na=False, na_values=na_values)
+    for chunk_number, chunk in enumerate(reader):
+        check_cancelled()
+        blank = chunk[INT_COLUMNS].isna().any(axis=1)
+        if blank.any():
+            logger.warning("Skipping MSR rows with blank integer fields", file=relative_path,
+                           chunk=chunk_number, rows=int(blank.sum()))
+            chunk = chunk[~blank]
+        chunk = chunk.astype({column: 'int64' for column in INT_COLUMNS})
+        chunk['date'] = partition_dates(chunk, fallback_date)
+        columnar_store.write_msr_partitions(chunk, root_dir, f"part-{file_id}-{chunk_number:05d}")
+        rows += len(chunk)
+    return rows
+
+
+def run_ingest(ingest_dir=Config.SKEWVOIR_INGEST_DIR, chunk_size=Config.SKEWVOIR_INGEST_CHUNK_SIZE):
+    """
+    Ingest every new or changed file under ingest_dir.
+    The watermark is saved after each file, so an interrupted run resumes where it stopped.
+
+    Returns:
+        dict: Counts of processed and failed files and ingested rows
+    """
+    watermark = load_watermark()
+    result = {'files': 0, 'failed': 0, 'rows': 0}
+
+    for relative_path, path, stat in find_new_files(ingest_dir, watermark):
+        check_cancelled()
+        started = time.perf_counter()
+        try:
+            rows = ingest_file(relative_path, path, stat, chunk_size)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            result['failed'] += 1
+            logger.error("MSR file ingest failed", file=relative_path, error=str(e))
+            continue
+
+        watermark[relative_path] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'rows': rows,
+            'ingested_at': datetime.now().isoformat(),
+        }
+        save_watermark(watermark)
+        result['files'] += 1
+        result['rows'] += rows
+        logger.info("MSR file ingested", file=relative_path, rows=rows,
+                    duration=round(time.perf_counter() - started, 3))
+
+    return result
+
+
+def load_msr_data(columns=None, start_date=None, end_date=None, msrs=None):
+    """
+    Load ingested MSR measurement data from the date partitions.
+
+    Returns:
+        pd.DataFrame: Matching MSR measurement rows
+    """
+    if not glob.glob(os.path.join(MSR_PARTITION_DIR, 'date=*', '*.parquet')):
+        return pd.DataFrame(columns=columns or [])
+    return columnar_store.read_msr_partitions(MSR_PARTITION_DIR, columns=columns, start_date=start_date,
+                                              end_date=end_date, msrs=msrs)
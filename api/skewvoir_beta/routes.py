@@ -0,0 +1,339 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+import os
+import math
+import pandas as pd
+from ..utils.auth import require_access
+from .msr_index import records_for_json
+from .msr_statistics import StatisticsService, DIMENSIONS, DEFAULT_GROUP_BY
+from .wafer_map import WaferMapService
+from .spatial_index import SpatialIndexService, result_rows
+from .msr_export import (EXPORT_FORMATS, EXPORT_BATCH_SIZE, MEAS_HIST_EXPORT_COLUMNS, iter_export_frames,
+                         iter_export, export_error_line)
+from ..utils.app_logger import logger
+from ..utils.cache_stats import register_memo_cache
+
+# Create blueprint
+skewvoir_bp = Blueprint('skewvoir', __name__)
+
+# Environment detection
+def get_data_source():
+    """Determine data source based on DATA_SOURCE_MODE environment variable"""
+    env_mode = os.environ.get('DATA_SOURCE_MODE')
+    if env_mode in ['dummy', 'real']:
+        return env_mode
+
+    # Default to dummy if no environment variable is set
+    return 'dummy'
+
+# Import appropriate data modules based on environment
+data_source = get_data_source()
+if data_source == 'real':
+    from .real.data_source import msr_store, iter_meas_hist, load_msr_data
+else:
+    from .dummy.sample_data import msr_store, iter_meas_hist, load_msr_data
+
+statistics_service = StatisticsService(msr_store) if msr_store is not None else None
+wafer_map_service = WaferMapService(msr_store) if msr_store is not None else None
+spatial_index_service = SpatialIndexService(msr_store) if msr_store is not None else None
+if msr_store is not None:
+    register_memo_cache('skewvoir.statistics_rollups', lambda: statistics_service.cube.cache_info())
+    register_memo_cache('skewvoir.wafer_maps', wafer_map_service.cache_info)
+    register_memo_cache('skewvoir.spatial_indexes', spatial_index_service.cache_info)
+
+
+def _not_implemented():
+    return jsonify({
+        'status': 'error',
+        'message': 'Real data source not implemented'
+    }), 501
+
+
+def _float_arg(name, default=None):
+    value = request.args.get(name, default)
+    if value is None:
+        raise ValueError(f"Missing query parameter: {name}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid number for {name}: {value}")
+    # inf/nan would overflow the spatial grid's cell arithmetic and int() conversions
+    if not math.isfinite(number):
+        raise ValueError(f"Invalid number for {name}: {value}")
+    return number
+
+
+def _spatial_query(query):
+    """Run a spatial query against the MSR or recipe named in the query string"""
+    if spatial_index_service is None:
+        return _not_implemented()
+
+    try:
+        msr_id = request.args.get('msr')
+        recipe = request.args.get('recipe')
+        x = _float_arg('x')
+        y = _float_arg('y')
+
+        grid, msr_df = spatial_index_service.get_index(msr_id=msr_id, recipe=recipe)
+        if grid is None:
+            return jsonify({
+                'status': 'error',
+                'message': f"{'MSR' if msr_id is not None else 'Recipe'} not found: {msr_id or recipe}"
+            }), 404
+
+        rows, distances = query(grid, x, y)
+        spatial_data = records_for_json(result_rows(msr_df, rows, distances))
+        return jsonify({
+            'status': 'success',
+            'data': spatial_data,
+            'total': len(spatial_data)
+        })
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@skewvoir_bp.route('/meas-hist', methods=['GET'])
+@require_access
+def get_meas_hist():
+    """
+    Get measurement history records.
+
+    Query Parameters:
+        eqp_id (str): Optional equipment filter
+        recipe (str): Optional recipe filter
+    """
+    if msr_store is None:
+        return _not_implemented()
+
+    try:
+        df = msr_store.get().meas_hist_df
+
+        eqp_id = request.args.get('eqp_id')
+        recipe = request.args.get('recipe')
+        if eqp_id:
+            df = df[df['eqp_id'] == eqp_id]
+        if recipe:
+            df = df[df['Recipe'] == recipe]
+
+        meas_hist_data = records_for_json(df)
+        return jsonify({
+            'status': 'success',
+            'data': meas_hist_data,
+            'total': len(meas_hist_data)
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@skewvoir_bp.route('/msr/<msr_id>', methods=['GET'])
+@require_access
+def get_msr_data(msr_id):
+    """Get MSR measurement data and its measurement history record for one MSR ID"""
+    if msr_store is None:
+        return _not_implemented()
+
+    try:
+        index = msr_store.get()
+        msr_rows = index.get_msr_rows(msr_id)
+        if msr_rows is None:
+            return jsonify({
+                'status': 'error',
+                'message': f'MSR not found: {msr_id}'
+            }), 404
+
+        meas_hist_record = records_for_json(index.get_meas_hist_row(msr_id))[0]
+        msr_data = records_for_json(msr_rows)
+        return jsonify({
+            'status': 'success',
+            'meas_hist': meas_hist_record,
+            'data': msr_data,
+            'total': len(msr_data)
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@skewvoir_bp.route('/msr/<msr_id>/wafer-map', methods=['GET'])
+@require_access
+def get_wafer_map(msr_id):
+    """
+    Get cd_value aggregated per chip (mean, std, count) as a dense grid for an ECharts heatmap.
+
+    Query Parameters:
+        parameter (str): Parameter to map (defaults to the MSR's first parameter)
+    """
+    if wafer_map_service is None:
+        return _not_implemented()
+
+    try:
+        wafer_map = wafer_map_service.get_wafer_map(msr_id, request.args.get('parameter'))
+        if wafer_map is None:
+            return jsonify({
+                'status': 'error',
+                'message': f'MSR not found: {msr_id}'
+            }), 404
+
+        return jsonify({
+            'status': 'success',
+            'data': wafer_map
+        })
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@skewvoir_bp.route('/spatial/within', methods=['GET'])
+@require_access
+def get_points_within():
+    """
+    Get measurement rows whose stage coordinate lies within a radius of a point, nearest first.
+
+    Query Parameters:
+        msr (str) or recipe (str): Search one MSR or every MSR of a recipe
+        x, y (float): Stage coordinate of the query point
+        radius (float): Search radius, in stage coordinate units
+        limit (int): Maximum number of rows to return (default: 1000)
+    """
+    def query(grid, x, y):
+        radius = _float_arg('radius')
+        limit = int(_float_arg('limit', 1000))
+        if radius < 0 or limit < 1:
+            raise ValueError("radius must be >= 0 and limit >= 1")
+        rows, distances = grid.within(x, y, radius)
+        return rows[:limit], distances[:limit]
+
+    return _spatial_query(query)
+
+
+@skewvoir_bp.route('/spatial/nearest', methods=['GET'])
+@require_access
+def get_nearest_points():
+    """
+    Get the measurement rows nearest to a stage coordinate (e.g. a defect location).
+    Rows at the same location as the k-th nearest are included, so every parameter
+    measured at a point is returned.
+
+    Query Parameters:
+        msr (str) or recipe (str): Search one MSR or every MSR of a recipe
+        x, y (float): Stage coordinate of the query point
+        k (int): Number of nearest rows (default: 1)
+    """
+    def query(grid, x, y):
+        k = int(_float_arg('k', 1))
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        return grid.nearest(x, y, k)
+
+    return _spatial_query(query)
+
+
+@skewvoir_bp.route('/export', methods=['GET'])
+@require_access
+def export_msr_data():
+    """
+    Stream MSR measurement rows for a time range as NDJSON or CSV.
+    Runs are exported in Timestamp order, each with its measurement rows in sequence order.
+
+    Query Parameters:
+        start (str): Inclusive start time (ISO format)
+        end (str): Exclusive end time (ISO format)
+        eqp_id (str): Optional equipment filter
+        recipe (str): Optional recipe filter
+        parameter (str): Optional parameter filter
+        format (str): ndjson (default) or csv
+    """
+    if iter_meas_hist is None:
+        return _not_implemented()
+
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {export_format}")
+
+        start = request.args.get('start')
+        end = request.args.get('end')
+        start_ts = pd.Timestamp(start) if start else None
+        end_ts = pd.Timestamp(end) if end else None
+
+        equals = {}
+        if request.args.get('eqp_id'):
+            equals['eqp_id'] = request.args['eqp_id']
+        if request.args.get('recipe'):
+            equals['Recipe'] = request.args['recipe']
+        parameter = request.args.get('parameter')
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+    def generate():
+        batches = iter_meas_hist(columns=MEAS_HIST_EXPORT_COLUMNS, start=start_ts, end=end_ts,
+                                 equals=equals, batch_size=EXPORT_BATCH_SIZE)
+        try:
+            yield from iter_export(export_format, iter_export_frames(batches, load_msr_data, parameter))
+        except Exception as e:
+            # Headers are already sent, so report the failure in the body
+            logger.exception("MSR export failed", start=start, end=end)
+            yield export_error_line(export_format, str(e))
+
+    filename = f"msr_export_{start or 'all'}_{end or 'all'}.{export_format}".replace(':', '')
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@skewvoir_bp.route('/statistics', methods=['GET'])
+@require_access
+def get_statistics():
+    """
+    Get cd_value statistics (count, mean, std, 3 sigma, min, max, range).
+
+    Query Parameters:
+        group_by (str): Comma-separated dimensions out of MSR, parameter, Recipe,
+            eqp_id, week (default: MSR,parameter)
+        MSR, parameter, Recipe, eqp_id, week (str): Optional filters on a dimension
+    """
+    if statistics_service is None:
+        return _not_implemented()
+
+    try:
+        group_by = [dim.strip() for dim in request.args.get('group_by', ','.join(DEFAULT_GROUP_BY)).split(',')
+                    if dim.strip()]
+        filters = {dim: request.args[dim] for dim in DIMENSIONS if dim in request.args}
+
+        cube = statistics_service.get_cube()
+        statistics_data = records_for_json(cube.rollup(group_by, filters))
+        return jsonify({
+            'status': 'success',
+            'group_by': group_by,
+            'data': statistics_data,
+            'total': len(statistics_data)
+        })
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
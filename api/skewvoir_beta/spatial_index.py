@@ -0,0 +1,178 @@
+"""
+Uniform-grid spatial index over MSR stage coordinates.
+
+Points are bucketed into square cells and sorted by cell key, so a region query
+only touches the cells overlapping the query circle (one searchsorted per row
+of cells) instead of scanning every measurement row. Indexes are built lazily
+per MSR or per recipe and cached per MSR index version.
+"""
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+
+TARGET_POINTS_PER_CELL = 16
+SPATIAL_INDEX_CACHE_SIZE = 128
+RESULT_COLUMNS = ['MSR', 'sequence', 'parameter', 'cd_value', 'chip_number_x', 'chip_number_y',
+                  'stage_coordinate_x', 'stage_coordinate_y']
+
+
+class GridIndex:
+    """
+    Uniform grid over 2D integer points.
+
+    Args:
+        x, y: Point coordinates
+        rows: Row positions the points refer to (returned by queries)
+        cell_size: Cell edge length; chosen from the point density if None
+    """
+
+    def __init__(self, x, y, rows, cell_size=None):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.rows = np.asarray(rows, dtype=np.int64)
+
+        if len(self.x):
+            self.x0, self.y0 = self.x.min(), self.y.min()
+            extent = max(self.x.max() - self.x0, self.y.max() - self.y0, 1.0)
+        else:
+            self.x0 = self.y0 = 0.0
+            extent = 1.0
+
+        if cell_size is None:
+            cells_per_side = max(1, math.ceil(math.sqrt(len(self.x) / TARGET_POINTS_PER_CELL)))
+            cell_size = max(1.0, math.ceil(extent / cells_per_side))
+        self.cell_size = float(cell_size)
+        self.nx = int(extent // self.cell_size) + 1
+        self.ny = self.nx
+
+        cx = ((self.x - self.x0) // self.cell_size).astype(np.int64)
+        cy = ((self.y - self.y0) // self.cell_size).astype(np.int64)
+        keys = cy * self.nx + cx
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+
+    def __len__(self):
+        return len(self.x)
+
+    def _candidates(self, x, y, radius):
+        """Point indices in the cells overlapping the square around (x, y)"""
+        cx0 = max(int((x - radius - self.x0) // self.cell_size), 0)
+        cx1 = min(int((x + radius - self.x0) // self.cell_size), self.nx - 1)
+        cy0 = max(int((y - radius - self.y0) // self.cell_size), 0)
+        cy1 = min(int((y + radius - self.y0) // self.cell_size), self.ny - 1)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.array([], dtype=np.int64)
+
+        # Cells of one grid row are contiguous in key order
+        row_keys = np.arange(cy0, cy1 + 1, dtype=np.int64) * self.nx
+        starts = np.searchsorted(self.keys, row_keys + cx0, side='left')
+        stops = np.searchsorted(self.keys, row_keys + cx1, side='right')
+        return np.concatenate([self.order[start:stop] for start, stop in zip(starts, stops)])
+
+    def within(self, x, y, radius):
+        """
+        Points within `radius` of (x, y), nearest first.
+
+        Returns:
+            tuple: (rows, distances) as numpy arrays
+        """
+        candidates = self._candidates(x, y, radius)
+        distances = np.hypot(self.x[candidates] - x, self.y[candidates] - y)
+        inside = distances <= radius
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return self.rows[candidates[order]], distances[order]
+
+    def nearest(self, x, y, k=1):
+        """
+        The k nearest points to (x, y), plus any further points tied with the k-th distance.
+
+        Returns:
+            tuple: (rows, distances) as numpy arrays
+        """
+        if not len(self.x):
+            return self.rows[:0], np.array([], dtype=np.float64)
+
+        # Grow the search circle until it holds k points; those are then the exact k nearest
+        outside = math.hypot(max(self.x0 - x, 0.0, x - (self.x0 + self.nx * self.cell_size)),
+                             max(self.y0 - y, 0.0, y - (self.y0 + self.ny * self.cell_size)))
+        max_radius = outside + math.hypot(self.nx, self.ny) * self.cell_size
+        radius = outside + self.cell_size
+        while True:
+            rows, distances = self.within(x, y, radius)
+            if len(rows) >= k or radius >= max_radius:
+                break
+            radius *= 2
+
+        if len(rows) > k:
+            keep = distances <= distances[k - 1]
+            rows, distances = rows[keep], distances[keep]
+        return rows, distances
+
+
+class SpatialIndexService:
+    """Builds and caches stage coordinate GridIndexes per MSR and per recipe"""
+
+    def __init__(self, msr_store, cache_size=SPATIAL_INDEX_CACHE_SIZE):
+        self.msr_store = msr_store
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _recipe_positions(self, index, recipe):
+        msrs = index.meas_hist_df.loc[index.meas_hist_df['Recipe'] == recipe, 'MSR'].unique()
+        ranges = [index.msr_ranges[msr] for msr in msrs if msr in index.msr_ranges]
+        if not len(msrs):
+            return None
+        if not ranges:
+            return np.array([], dtype=np.int64)
+        return np.concatenate([np.arange(start, stop) for start, stop in ranges])
+
+    def get_index(self, msr_id=None, recipe=None):
+        """
+        Get the spatial index for one MSR or for every MSR of a recipe.
+
+        Returns:
+            tuple: (GridIndex, msr_df) or (None, None) if the MSR/recipe is unknown
+        """
+        if (msr_id is None) == (recipe is None):
+            raise ValueError("Specify exactly one of msr or recipe")
+
+        index = self.msr_store.get()
+        key = (index.version, 'MSR', msr_id) if msr_id is not None else (index.version, 'Recipe', recipe)
+        with self._lock:
+            grid = self._cache.get(key)
+            if grid is not None:
+                self._cache.move_to_end(key)
+                return grid, index.msr_df
+
+        if msr_id is not None:
+            if msr_id not in index:
+                return None, None
+            start, stop = index.msr_ranges.get(msr_id, (0, 0))
+            positions = np.arange(start, stop)
+        else:
+            positions = self._recipe_positions(index, recipe)
+            if positions is None:
+                return None, None
+
+        grid = GridIndex(index.msr_df['stage_coordinate_x'].to_numpy()[positions],
+                         index.msr_df['stage_coordinate_y'].to_numpy()[positions],
+                         positions)
+
+        with self._lock:
+            self._cache[key] = grid
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return grid, index.msr_df
+
+    def cache_info(self):
+        return {'entries': len(self._cache), 'max_entries': self.cache_size}
+
+
+def result_rows(msr_df, rows, distances):
+    """Measurement rows for query results, with their distance to the query point"""
+    result = msr_df.iloc[rows][RESULT_COLUMNS].reset_index(drop=True)
+    result['distance'] = np.round(distances, 3)
+    return result
@@ -0,0 +1,129 @@
+"""
+Server-side wafer map aggregation.
+Aggregates cd_value per chip (mean, std, count) on the integer chip grid so the
+browser receives one dense grid per (MSR, parameter) instead of every point.
+"""
+import threading
+from collections import OrderedDict
+import numpy as np
+
+WAFER_MAP_CACHE_SIZE = 256
+
+
+def _grid_to_list(grid):
+    """Dense 2D array -> nested lists with NaN as None"""
+    return [[None if np.isnan(value) else round(float(value), 4) for value in row] for row in grid]
+
+
+def build_wafer_map(msr_rows, parameter):
+    """
+    Aggregate cd_value per chip for one parameter.
+
+    Args:
+        msr_rows: MSR measurement rows with chip_number_x, chip_number_y, parameter, cd_value
+        parameter: Parameter to map
+
+    Returns:
+        dict: x_axis/y_axis chip numbers, dense mean/std/count grids indexed
+              [y][x], heatmap triples [x_index, y_index, mean] for ECharts,
+              and the value range for a visualMap
+    """
+    rows = msr_rows[msr_rows['parameter'] == parameter]
+    if rows.empty:
+        return {
+            'parameter': parameter,
+            'x_axis': [], 'y_axis': [],
+            'mean': [], 'std': [], 'count': [],
+            'heatmap': [], 'min': None, 'max': None, 'points': 0
+        }
+
+    per_chip = rows.groupby(['chip_number_y', 'chip_number_x'], sort=False).agg(
+        mean=('cd_value', 'mean'),
+        std=('cd_value', 'std'),
+        count=('cd_value', 'size'),
+    ).reset_index()
+
+    chip_x = per_chip['chip_number_x'].to_numpy()
+    chip_y = per_chip['chip_number_y'].to_numpy()
+    x_min, y_min = chip_x.min(), chip_y.min()
+    x_axis = np.arange(x_min, chip_x.max() + 1)
+    y_axis = np.arange(y_min, chip_y.max() + 1)
+    x_idx = chip_x - x_min
+    y_idx = chip_y - y_min
+
+    shape = (len(y_axis), len(x_axis))
+    mean_grid = np.full(shape, np.nan)
+    std_grid = np.full(shape, np.nan)
+    count_grid = np.zeros(shape, dtype=np.int64)
+    mean_grid[y_idx, x_idx] = per_chip['mean'].to_numpy()
+    std_grid[y_idx, x_idx] = per_chip['std'].to_numpy()
+    count_grid[y_idx, x_idx] = per_chip['count'].to_numpy()
+
+    means = np.round(per_chip['mean'].to_numpy(), 4)
+    heatmap = np.column_stack([x_idx, y_idx]).tolist()
+    for triple, value in zip(heatmap, means.tolist()):
+        triple.append(value)
+
+    return {
+        'parameter': parameter,
+        'x_axis': x_axis.tolist(),
+        'y_axis': y_axis.tolist(),
+        'mean': _grid_to_list(mean_grid),
+        'std': _grid_to_list(std_grid),
+        'count': count_grid.tolist(),
+        'heatmap': heatmap,
+        'min': float(means.min()),
+        'max': float(means.max()),
+        'points': int(count_grid.sum())
+    }
+
+
+class WaferMapService:
+    """Builds wafer maps from a ReloadingMsrIndex and caches them per (MSR, parameter)"""
+
+    def __init__(self, msr_store, cache_size=WAFER_MAP_CACHE_SIZE):
+        self.msr_store = msr_store
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_wafer_map(self, msr_id, parameter=None):
+        """
+        Get the wafer map for an MSR and parameter.
+
+        Args:
+            msr_id: MSR ID
+            parameter: Parameter to map; defaults to the MSR's first parameter
+
+        Returns:
+            dict or None: Wafer map (see build_wafer_map) plus the MSR's
+                available parameters, or None if the MSR is unknown
+        """
+        index = self.msr_store.get()
+        msr_rows = index.get_msr_rows(msr_id)
+        if msr_rows is None:
+            return None
+
+        parameters = list(dict.fromkeys(msr_rows['parameter'].tolist()))
+        if parameter is None and parameters:
+            parameter = parameters[0]
+
+        key = (index.version, msr_id, parameter)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        wafer_map = build_wafer_map(msr_rows, parameter)
+        wafer_map['MSR'] = msr_id
+        wafer_map['parameters'] = parameters
+
+        with self._lock:
+            self._cache[key] = wafer_map
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return wafer_map
+
+    def cache_info(self):
+        return {'entries': len(self._cache), 'max_entries': self.cache_size}
@@ -3,9 +3,11 @@ Authentication and authorization utilities
 """
 from flask import request, jsonify
 from functools import wraps
+import hmac
 import platform
 import os
 from loguru import logger
+from config import Config
 
 def is_development_environment():
     """
@@ -84,4 +86,40 @@ def require_access(f):
         
         return f(*args, **kwargs)
     
-    return decorated_function
\ No newline at end of file
+    return decorated_function
+
+def check_admin_access():
+    """
+    Check if the current request may use administrative endpoints.
+    The development bypass does not apply: the request must carry Config.ADMIN_TOKEN
+    in the X-Admin-Token header or come from a LASTUSER listed in Config.ADMIN_USERS.
+    Returns tuple (has_access: bool, user_id: str)
+    """
+    token = request.headers.get('X-Admin-Token', '')
+    if Config.ADMIN_TOKEN and hmac.compare_digest(token.encode(), Config.ADMIN_TOKEN.encode()):
+        return True, "admin_token"
+
+    user_id = get_user_from_cookie()
+    if user_id and user_id in Config.ADMIN_USERS:
+        return True, user_id
+
+    logger.warning(f"Admin access denied for user: {user_id}")
+    return False, user_id
+
+def require_admin(f):
+    """
+    Decorator to restrict routes to administrators
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        has_access, user_id = check_admin_access()
+
+        if not has_access:
+            return jsonify({
+                'error': 'Access denied',
+                'message': 'This resource is restricted to administrators'
+            }), 403
+
+        return f(*args, **kwargs)
+
+    return decorated_function
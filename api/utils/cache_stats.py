@@ -0,0 +1,207 @@
+"""
+Cache instrumentation aggregated across worker processes.
+
+Each CacheMetrics counts hits, misses, stale serves, evictions and fill
+latencies in-process and periodically adds the deltas to a Redis hash
+(cache:stats:<namespace>), so every worker can report cluster-wide totals.
+Fill latencies are kept as a bucketed histogram, from which p50/p99 are
+estimated as the upper bound of the bucket holding that percentile.
+Per-worker gauges (local entries and bytes) are stored in a second hash keyed
+by host and pid and summed over workers seen in the last WORKER_STALE_AFTER
+seconds.
+
+In-process memo caches without a Redis tier can register an entry-count
+callback with register_memo_cache so they are reported too.
+"""
+import os
+import json
+import time
+import socket
+import threading
+from collections import deque
+from redis.exceptions import RedisError
+from .redis_client import redis_client, pool, binary_pool
+
+STATS_KEY_PREFIX = 'cache:stats'
+FLUSH_INTERVAL = 10  # seconds between Redis updates per namespace
+WORKER_STALE_AFTER = 300  # seconds after which a worker's gauges are ignored
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+LATENCY_SAMPLE_SIZE = 1000
+COUNTERS = ['local_hits', 'redis_hits', 'misses', 'stale', 'evictions', 'fills']
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+_memo_caches = {}
+
+
+def _bucket_field(latency_ms):
+    for bound in LATENCY_BUCKETS_MS:
+        if latency_ms <= bound:
+            return f"fill_le_{bound}"
+    return 'fill_le_inf'
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list, rounded to 3 decimals (None if empty)"""
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))], 3)
+
+
+def histogram_percentile(buckets, fraction):
+    """Upper bound (ms) of the bucket containing the given fraction of fills, or None"""
+    total = sum(buckets.values())
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    for bound in LATENCY_BUCKETS_MS + ['inf']:
+        seen += buckets.get(f"fill_le_{bound}", 0)
+        if seen >= target:
+            return bound if bound != 'inf' else None
+    return None
+
+
+class CacheMetrics:
+    """
+    Counters and fill latencies of one cache namespace in this worker.
+
+    Args:
+        namespace: Cache namespace
+        gauges: Callable returning {'entries': int, 'bytes': int} for this worker
+    """
+
+    def __init__(self, namespace, gauges=None):
+        self.namespace = namespace
+        self.gauges = gauges
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def key(self):
+        return f"{STATS_KEY_PREFIX}:{self.namespace}"
+
+    def incr(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] += amount
+            self._pending[counter] = self._pending.get(counter, 0) + amount
+        self._maybe_flush()
+
+    def record_fill(self, seconds):
+        """Record the time taken to compute a value that was then stored in the cache"""
+        latency_ms = seconds * 1000
+        field = _bucket_field(latency_ms)
+        with self._lock:
+            self.counters['fills'] += 1
+            self.latencies.append(latency_ms)
+            for name in ('fills', field):
+                self._pending[name] = self._pending.get(name, 0) + 1
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Add pending deltas and this worker's gauges to Redis; deltas are kept on failure"""
+        from .two_tier_cache import redis_available, mark_redis_down
+
+        if not redis_available() or not self._flush_lock.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = time.monotonic()
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for field, amount in pending.items():
+                    pipe.hincrby(self.key, field, amount)
+                gauges = dict(self.gauges() if self.gauges else {}, updated_at=time.time())
+                pipe.hset(f"{self.key}:workers", WORKER_ID, json.dumps(gauges))
+                pipe.execute()
+                return True
+            except RedisError as e:
+                mark_redis_down(e)
+                with self._lock:
+                    for field, amount in pending.items():
+                        self._pending[field] = self._pending.get(field, 0) + amount
+                return False
+        finally:
+            self._flush_lock.release()
+
+    def local_stats(self):
+        """Counters and exact fill latency percentiles for this worker"""
+        with self._lock:
+            counters = dict(self.counters)
+            latencies = sorted(self.latencies)
+        return dict(counters, fill_latency_ms={
+            'p50': percentile(latencies, 0.5),
+            'p99': percentile(latencies, 0.99),
+            'samples': len(latencies),
+        })
+
+    def cluster_stats(self):
+        """
+        Totals across all workers from Redis.
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unreachable
+        """
+        self.flush()
+        totals = {field: int(value) for field, value in redis_client.hgetall(self.key).items()}
+        workers = redis_client.hgetall(f"{self.key}:workers")
+
+        now = time.time()
+        live = []
+        for worker_id, value in workers.items():
+            gauges = json.loads(value)
+            if now - gauges.get('updated_at', 0) <= WORKER_STALE_AFTER:
+                live.append(gauges)
+
+        buckets = {field: count for field, count in totals.items() if field.startswith('fill_le_')}
+        lookups = totals.get('local_hits', 0) + totals.get('redis_hits', 0) + totals.get('misses', 0)
+        hits = lookups - totals.get('misses', 0)
+        return {
+            **{counter: totals.get(counter, 0) for counter in COUNTERS},
+            'hits': hits,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None,
+            'entries': sum(gauges.get('entries', 0) for gauges in live),
+            'bytes': sum(gauges.get('bytes', 0) for gauges in live),
+            'workers': len(live),
+            'fill_latency_ms': {
+                'p50': histogram_percentile(buckets, 0.5),
+                'p99': histogram_percentile(buckets, 0.99),
+                'samples': totals.get('fills', 0),
+            },
+        }
+
+    def reset(self):
+        """Clear the cluster-wide counters of this namespace"""
+        with self._lock:
+            self._pending = {}
+        redis_client.delete(self.key)
+
+
+def register_memo_cache(name, stats):
+    """Report an in-process memo cache; stats returns {'entries': int, 'max_entries': int}"""
+    _memo_caches[name] = stats
+
+
+def memo_cache_stats():
+    return {name: stats() for name, stats in list(_memo_caches.items())}
+
+
+def redis_pool_stats():
+    """Connection counts of the shared Redis pools in this worker"""
+    def describe(connection_pool):
+        return {
+            'max_connections': connection_pool.max_connections,
+            'created': connection_pool._created_connections,
+            'available': len(connection_pool._available_connections),
+            'in_use': len(connection_pool._in_use_connections),
+        }
+    return {'text': describe(pool), 'binary': describe(binary_pool)}
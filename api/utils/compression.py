@@ -0,0 +1,90 @@
+"""
+HTTP response compression negotiated with Accept-Encoding.
+
+gzip is always available; zstd is used when the optional `zstandard` package is
+installed and the client accepts it. The after_request hook compresses
+uncompressed JSON/CSV/text responses; responses that already carry a
+Content-Encoding (such as pre-compressed cache entries) are left untouched.
+"""
+import gzip
+from flask import request
+from config import Config
+
+# Optional zstd support
+try:
+    import zstandard
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    _ZSTD_AVAILABLE = False
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html',
+    'text/css', 'application/javascript',
+}
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller bodies are not worth the header overhead
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 6
+
+
+def available_encodings():
+    """Encodings this server can produce, in order of preference"""
+    return ['zstd', 'gzip'] if _ZSTD_AVAILABLE else ['gzip']
+
+
+def storage_encoding():
+    """Encoding used for compressed cache entries (Config.CACHE_COMPRESSION, falling back to gzip)"""
+    return Config.CACHE_COMPRESSION if Config.CACHE_COMPRESSION in available_encodings() else 'gzip'
+
+
+def compress(data, encoding):
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def decompress(data, encoding):
+    if encoding == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def accepts_encoding(encoding):
+    """True if the current request's Accept-Encoding allows encoding (q > 0)"""
+    return request.accept_encodings[encoding] > 0
+
+
+def negotiate_encoding():
+    """Best encoding for the current request, or None for identity"""
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_response(response):
+    """after_request hook: compress eligible responses with the negotiated encoding"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,110 @@
+"""
+ETags and 304 Not Modified responses for data routes.
+
+A route's ETag comes from a version token of the data it serves (for example a
+content hash of a module-level DataFrame), checked before the view runs, so an
+unchanged poll skips the query and the serialization entirely. Routes without
+a version token fall back to the ETag stored with their cached response, or to
+a hash of the response body.
+
+ETags are weak because the same content may be sent gzip-compressed or not.
+"""
+import hashlib
+import weakref
+from functools import wraps
+import pandas as pd
+from flask import request, make_response
+from .response_cache import build_cache_key
+
+# id(frame) -> (weak reference, content hash); data modules replace their frames rather than mutate them.
+# An entry is removed when its frame is garbage collected, before the id can be reused.
+_frame_versions = {}
+
+
+def content_hash(data):
+    """Short hex digest of bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _frame_version(frame):
+    cached = _frame_versions.get(id(frame))
+    if cached is not None and cached[0]() is frame:
+        return cached[1]
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(repr(list(frame.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+    version = digest.hexdigest()
+    _frame_versions[id(frame)] = (weakref.ref(frame), version)
+    weakref.finalize(frame, _frame_versions.pop, id(frame), None)
+    return version
+
+
+def dataframe_version(*frames):
+    """
+    Content hash of one or more DataFrames, computed once per DataFrame object.
+
+    Returns:
+        str: Version token that changes whenever a frame's content changes
+    """
+    return ':'.join(_frame_version(frame) for frame in frames)
+
+
+def make_etag(*parts):
+    """ETag value (unquoted) for the current request's endpoint and arguments plus version parts"""
+    key = '|'.join([build_cache_key(), *(str(part) for part in parts)])
+    return content_hash(key.encode())
+
+
+def _not_modified(etag):
+    response = make_response('', 304)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def _version_etag(version, args, kwargs):
+    if version is None:
+        return None
+    try:
+        token = version(*args, **kwargs)
+    except Exception:
+        return None  # The view reports the data error itself
+    return make_etag(token) if token is not None else None
+
+
+def conditional_response(version=None):
+    """
+    Add an ETag to a route's successful responses and answer matching If-None-Match with 304.
+
+    Place it below @require_access and above @cached_response.
+
+    Args:
+        version: Callable taking the view arguments and returning a version token
+            of the underlying data (see also response_cache.cached_etag). It is asked
+            again after the view runs; if it is missing, fails or still returns None,
+            the ETag is taken from the response (cached entry ETag or body hash).
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            etag = _version_etag(version, args, kwargs)
+            if etag is not None and request.if_none_match.contains_weak(etag):
+                return _not_modified(etag)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            if etag is None:
+                # The view may have produced the version (e.g. filled the response cache)
+                etag = _version_etag(version, args, kwargs)
+                if etag is None:
+                    etag, _ = response.get_etag()
+                if etag is None:
+                    etag = content_hash(response.get_data())
+                if request.if_none_match.contains_weak(etag):
+                    return _not_modified(etag)
+            response.set_etag(etag, weak=True)
+            return response
+
+        return wrapper
+    return decorator
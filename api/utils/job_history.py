@@ -0,0 +1,125 @@
+"""
+Run history of scheduled jobs in a local SQLite table.
+
+Enabled with SCHEDULER_JOBSTORE=sqlite. The job_runs table lives in the same
+database file as APScheduler's persistent job store, so run history and
+timing survive restarts and the scheduler can tell at startup whether a
+missed run was already made up. Every finished, failed and missed run is one
+row; rows older than JOB_HISTORY_KEEP_DAYS are deleted at startup.
+
+Rows are written from worker threads and process pool children alike, so
+each call opens its own connection (WAL mode, busy timeout).
+"""
+import os
+import socket
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from config import Config
+from .app_logger import logger
+
+BUSY_TIMEOUT = 10  # seconds to wait for another writer
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    duration REAL,
+    error TEXT,
+    worker TEXT
+);
+CREATE INDEX IF NOT EXISTS job_runs_job_key_started_at ON job_runs (job_key, started_at);
+"""
+
+_schema_pid = None
+_schema_lock = threading.Lock()
+
+
+def history_enabled():
+    return Config.SCHEDULER_JOBSTORE == 'sqlite'
+
+
+def _connect():
+    global _schema_pid
+    if _schema_pid != os.getpid():
+        os.makedirs(os.path.dirname(Config.SCHEDULER_DB_PATH) or '.', exist_ok=True)
+    conn = sqlite3.connect(Config.SCHEDULER_DB_PATH, timeout=BUSY_TIMEOUT)
+    with _schema_lock:
+        if _schema_pid != os.getpid():
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            _schema_pid = os.getpid()
+    return conn
+
+
+def _row(row):
+    return {
+        'job_key': row[0],
+        'status': row[1],
+        'started_at': row[2],
+        'duration': row[3],
+        'error': row[4],
+        'worker': row[5],
+    }
+
+
+def record(job_key, status, started_at, duration=None, error=None):
+    """
+    Append a run; status is 'success', 'failure' or 'missed' (started_at: scheduled time).
+    A no-op unless history is enabled; write errors are logged, never raised.
+    """
+    if not history_enabled():
+        return
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT INTO job_runs (job_key, status, started_at, duration, error, worker) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (job_key, status, started_at.astimezone(timezone.utc).isoformat(),
+                     round(duration, 3) if duration is not None else None,
+                     error, f"{socket.gethostname()}:{os.getpid()}"))
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("Failed to record job run history", job_key=job_key, error=str(e))
+
+
+def recent_runs(job_key, limit=20):
+    """The latest runs of a job, newest first"""
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            'SELECT job_key, status, started_at, duration, error, worker FROM job_runs '
+            'WHERE job_key = ? ORDER BY started_at DESC LIMIT ?', (job_key, limit)).fetchall()
+    finally:
+        conn.close()
+    return [_row(row) for row in rows]
+
+
+def last_success(job_key):
+    """Start time (UTC) of the job's latest successful run, or None"""
+    if not history_enabled():
+        return None
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT MAX(started_at) FROM job_runs WHERE job_key = ? AND status = 'success'",
+            (job_key,)).fetchone()
+    finally:
+        conn.close()
+    return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+
+def prune(keep_days=Config.JOB_HISTORY_KEEP_DAYS):
+    """Delete rows older than keep_days; returns the number deleted"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=keep_days)).isoformat()
+    conn = _connect()
+    try:
+        with conn:
+            return conn.execute('DELETE FROM job_runs WHERE started_at < ?', (cutoff,)).rowcount
+    finally:
+        conn.close()
@@ -0,0 +1,153 @@
+"""
+Scheduled job run metrics shared across workers through Redis.
+
+Every run recorded by the scheduler's job wrapper updates a Redis hash per
+job (success/failure/missed counts, last run, duration, error and peak RSS
+delta) and a capped list of recent durations for the rolling p50/p95. While
+Redis is unavailable, runs are recorded in this worker only. With the SQLite
+job store, every run is also appended to the run history (job_history.py).
+"""
+import time
+import threading
+from datetime import datetime, timedelta
+from redis.exceptions import RedisError
+from .redis_client import redis_client
+from .two_tier_cache import redis_available, mark_redis_down
+from . import job_history
+from .cache_stats import WORKER_ID, percentile
+
+try:
+    import resource
+    _RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    _RESOURCE_AVAILABLE = False
+
+METRICS_KEY_PREFIX = 'scheduler:metrics'
+DURATION_WINDOW = 100  # recent runs used for the rolling percentiles
+MAX_ERROR_LENGTH = 2000
+
+_local_metrics = {}
+_local_lock = threading.Lock()
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB (ru_maxrss is KB on Linux), None where unavailable"""
+    if not _RESOURCE_AVAILABLE:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _metrics_key(job_key):
+    return f"{METRICS_KEY_PREFIX}:{job_key}"
+
+
+def _record_local(job_key, fields, counter, duration=None):
+    with _local_lock:
+        metrics = _local_metrics.setdefault(job_key, {'durations': []})
+        metrics[counter] = metrics.get(counter, 0) + 1
+        metrics.update(fields)
+        if duration is not None:
+            metrics['durations'] = ([duration] + metrics['durations'])[:DURATION_WINDOW]
+
+
+def _record(job_key, fields, counter, duration=None):
+    if redis_available():
+        try:
+            key = _metrics_key(job_key)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hincrby(key, counter, 1)
+            pipe.hset(key, mapping=fields)
+            if duration is not None:
+                pipe.lpush(f"{key}:durations", duration)
+                pipe.ltrim(f"{key}:durations", 0, DURATION_WINDOW - 1)
+            pipe.execute()
+            return
+        except RedisError as e:
+            mark_redis_down(e)
+    _record_local(job_key, fields, counter, duration)
+
+
+def record_run(job_key, duration, error=None, rss_delta_kb=0):
+    """Record a finished run; error is the exception of a failed run"""
+    fields = {
+        'last_run_at': datetime.now().isoformat(),
+        'last_status': 'failure' if error is not None else 'success',
+        'last_duration': round(duration, 3),
+        'last_worker': WORKER_ID,
+    }
+    if rss_delta_kb is not None:
+        fields['last_rss_delta_kb'] = rss_delta_kb
+    if error is not None:
+        fields['last_error'] = str(error)[:MAX_ERROR_LENGTH]
+        fields['last_error_at'] = fields['last_run_at']
+    _record(job_key, fields, 'failure' if error is not None else 'success', round(duration, 3))
+    job_history.record(job_key, fields['last_status'], datetime.now().astimezone() - timedelta(seconds=duration),
+                       duration, fields.get('last_error'))
+
+
+def record_missed(job_key, scheduled_time=None):
+    """Record a run APScheduler skipped because it was past its misfire grace time"""
+    scheduled_time = scheduled_time or datetime.now().astimezone()
+    _record(job_key, {'last_missed_at': scheduled_time.isoformat()}, 'missed')
+    job_history.record(job_key, 'missed', scheduled_time)
+
+
+def _summarize(fields, durations):
+    durations = sorted(durations)
+    return {
+        'success': int(fields.get('success', 0)),
+        'failure': int(fields.get('failure', 0)),
+        'missed': int(fields.get('missed', 0)),
+        'last_run_at': fields.get('last_run_at'),
+        'last_status': fields.get('last_status'),
+        'last_duration': float(fields['last_duration']) if 'last_duration' in fields else None,
+        'duration_p50': percentile(durations, 0.5),
+        'duration_p95': percentile(durations, 0.95),
+        'last_error': fields.get('last_error'),
+        'last_error_at': fields.get('last_error_at'),
+        'last_missed_at': fields.get('last_missed_at'),
+        'last_rss_delta_kb': int(fields['last_rss_delta_kb']) if 'last_rss_delta_kb' in fields else None,
+        'last_worker': fields.get('last_worker'),
+    }
+
+
+def get_job_metrics(job_key):
+    """
+    Metrics for one job across all workers, or for this worker while Redis is unavailable.
+
+    Returns:
+        dict: Counts, last run details and rolling duration percentiles, with 'scope'
+    """
+    if redis_available():
+        try:
+            key = _metrics_key(job_key)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hgetall(key)
+            pipe.lrange(f"{key}:durations", 0, DURATION_WINDOW - 1)
+            fields, durations = pipe.execute()
+            return dict(_summarize(fields, [float(value) for value in durations]), scope='cluster')
+        except RedisError as e:
+            mark_redis_down(e)
+
+    with _local_lock:
+        metrics = dict(_local_metrics.get(job_key, {'durations': []}))
+    return dict(_summarize(metrics, metrics.pop('durations')), scope='worker')
+
+
+class RunMeter:
+    """Measures the duration and peak RSS growth of one job run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.peak_rss_before = peak_rss_kb()
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rss_delta_kb(self):
+        """Peak RSS growth in KB, None where peak RSS is unavailable"""
+        if self.peak_rss_before is None:
+            return None
+        return max(0, peak_rss_kb() - self.peak_rss_before)
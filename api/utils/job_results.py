@@ -0,0 +1,258 @@
+"""
+Versioned job result store shared across workers.
+
+A scheduled job publishes its output (a JSON-serializable payload or a
+DataFrame) as a new numbered version; request handlers in any worker read the
+latest version instead of recomputing it. Versions live in Redis (default) or
+in a directory on shared disk (JOB_RESULT_BACKEND=disk), and each publish
+prunes versions beyond JOB_RESULT_KEEP or older than JOB_RESULT_MAX_AGE seconds,
+always keeping the latest.
+
+Payloads are stored compressed (JSON) or as Parquet (DataFrames). Readers keep
+the decoded latest version in memory and only re-read it when a newer version
+has been published.
+"""
+import io
+import os
+import json
+import glob
+import time
+import threading
+from datetime import datetime
+import pandas as pd
+from config import Config
+from .redis_client import binary_redis_client
+from .compression import compress, decompress, storage_encoding
+
+KEY_PREFIX = 'job_results'
+
+
+def _result(job, stored, payload):
+    return {
+        'job': job,
+        'version': stored['version'],
+        'created_at': stored['created_at'],
+        'kind': stored['kind'],
+        'meta': stored.get('meta', {}),
+        'payload': payload,
+    }
+
+
+def describe(result):
+    """Version metadata of a result without the payload"""
+    return dict({name: value for name, value in result.items() if name != 'payload'},
+                created_at=datetime.fromtimestamp(result['created_at']).isoformat())
+
+
+def _encode(payload):
+    if isinstance(payload, pd.DataFrame):
+        buffer = io.BytesIO()
+        payload.to_parquet(buffer, index=False)
+        return 'dataframe', None, buffer.getvalue()
+    encoding = storage_encoding()
+    return 'json', encoding, compress(json.dumps(payload, default=str).encode(), encoding)
+
+
+def _decode(kind, encoding, data):
+    if kind == 'dataframe':
+        return pd.read_parquet(io.BytesIO(data))
+    return json.loads(decompress(data, encoding))
+
+
+class RedisResultBackend:
+    """Versions in Redis: a sorted set of versions by creation time, a metadata hash and one key per payload"""
+
+    def __init__(self, client=None):
+        self.client = client if client is not None else binary_redis_client
+
+    def _key(self, job, suffix):
+        return f"{KEY_PREFIX}:{job}:{suffix}"
+
+    def write(self, job, meta, data):
+        version = self.client.incr(self._key(job, 'seq'))
+        meta = dict(meta, version=version)
+        pipe = self.client.pipeline()
+        pipe.set(self._key(job, f"v:{version}"), data)
+        pipe.hset(self._key(job, 'meta'), version, json.dumps(meta))
+        pipe.zadd(self._key(job, 'versions'), {version: meta['created_at']})
+        pipe.execute()
+        return meta
+
+    def latest_version(self, job):
+        latest = self.client.zrevrange(self._key(job, 'versions'), 0, 0)
+        return int(latest[0]) if latest else None
+
+    def read_meta(self, job, version):
+        meta = self.client.hget(self._key(job, 'meta'), version)
+        return json.loads(meta) if meta is not None else None
+
+    def read_data(self, job, version):
+        return self.client.get(self._key(job, f"v:{version}"))
+
+    def list_meta(self, job):
+        versions = [int(version) for version in self.client.zrevrange(self._key(job, 'versions'), 0, -1)]
+        if not versions:
+            return []
+        metas = self.client.hmget(self._key(job, 'meta'), versions)
+        return [json.loads(meta) for meta in metas if meta is not None]
+
+    def delete(self, job, versions):
+        pipe = self.client.pipeline()
+        pipe.delete(*[self._key(job, f"v:{version}") for version in versions])
+        pipe.hdel(self._key(job, 'meta'), *versions)
+        pipe.zrem(self._key(job, 'versions'), *versions)
+        pipe.execute()
+
+
+class DiskResultBackend:
+    """Versions as <root>/<job>/<version>.bin files with a .json metadata file next to each"""
+
+    def __init__(self, root_dir=Config.JOB_RESULT_DIR):
+        self.root_dir = root_dir
+
+    def _path(self, job, version, ext):
+        return os.path.join(self.root_dir, job, f"{version:08d}.{ext}")
+
+    def _versions(self, job):
+        paths = glob.glob(os.path.join(self.root_dir, job, '*.json'))
+        return sorted((int(os.path.basename(path)[:-5]) for path in paths), reverse=True)
+
+    def write(self, job, meta, data):
+        os.makedirs(os.path.join(self.root_dir, job), exist_ok=True)
+        versions = self._versions(job)
+        version = (versions[0] if versions else 0) + 1
+        # Reserve the version by creating its data file exclusively, so concurrent writers never share one
+        while True:
+            try:
+                with open(self._path(job, version, 'bin'), 'xb'):
+                    break
+            except FileExistsError:
+                version += 1
+        meta = dict(meta, version=version)
+        # Data first, metadata last: a version is only visible once both are complete
+        for ext, content in (('bin', data), ('json', json.dumps(meta).encode())):
+            path = self._path(job, version, ext)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return meta
+
+    def latest_version(self, job):
+        versions = self._versions(job)
+        return versions[0] if versions else None
+
+    def read_meta(self, job, version):
+        try:
+            with open(self._path(job, version, 'json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def read_data(self, job, version):
+        try:
+            with open(self._path(job, version, 'bin'), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def list_meta(self, job):
+        metas = (self.read_meta(job, version) for version in self._versions(job))
+        return [meta for meta in metas if meta is not None]
+
+    def delete(self, job, versions):
+        for version in versions:
+            for ext in ('json', 'bin'):
+                try:
+                    os.remove(self._path(job, version, ext))
+                except FileNotFoundError:
+                    pass
+
+
+class JobResultStore:
+    """
+    Publish and read versioned job results.
+
+    Args:
+        backend: RedisResultBackend or DiskResultBackend
+        keep: Versions kept per job
+        max_age: Seconds after which versions other than the latest are pruned
+    """
+
+    def __init__(self, backend, keep=Config.JOB_RESULT_KEEP, max_age=Config.JOB_RESULT_MAX_AGE):
+        self.backend = backend
+        self.keep = keep
+        self.max_age = max_age
+        self._latest = {}  # job -> decoded latest version read or published in this process
+        self._lock = threading.Lock()
+
+    def publish(self, job, payload, meta=None):
+        """
+        Store payload as the job's newest version and prune old versions.
+
+        Returns:
+            dict: The published version (job, version, created_at, kind, meta, payload)
+        """
+        kind, encoding, data = _encode(payload)
+        stored = self.backend.write(job, {
+            'created_at': time.time(),
+            'kind': kind,
+            'encoding': encoding,
+            'size': len(data),
+            'meta': meta or {},
+        }, data)
+        result = _result(job, stored, payload)
+        with self._lock:
+            self._latest[job] = result
+        self.prune(job)
+        return result
+
+    def get(self, job, version=None):
+        """
+        Read a version of a job's result (the latest by default).
+
+        Returns:
+            dict or None: As returned by publish, or None if the job or version has not been published
+        """
+        latest_version = self.backend.latest_version(job)
+        version = latest_version if version is None else version
+        if version is None:
+            return None
+
+        with self._lock:
+            cached = self._latest.get(job)
+        if cached is not None and cached['version'] == version:
+            return cached
+
+        meta = self.backend.read_meta(job, version)
+        data = self.backend.read_data(job, version) if meta is not None else None
+        if data is None:
+            return None
+        result = _result(job, meta, _decode(meta['kind'], meta.get('encoding'), data))
+        if version == latest_version:
+            with self._lock:
+                self._latest[job] = result
+        return result
+
+    def versions(self, job):
+        """Metadata of the stored versions, newest first"""
+        return self.backend.list_meta(job)
+
+    def prune(self, job):
+        """Delete versions beyond keep or older than max_age, never the latest"""
+        metas = self.versions(job)
+        now = time.time()
+        expired = [meta['version'] for index, meta in enumerate(metas)
+                   if index > 0 and (index >= self.keep or now - meta['created_at'] > self.max_age)]
+        if expired:
+            self.backend.delete(job, expired)
+        return len(expired)
+
+
+def create_store():
+    backend = DiskResultBackend() if Config.JOB_RESULT_BACKEND == 'disk' else RedisResultBackend()
+    return JobResultStore(backend)
+
+
+# Process-wide store
+job_results = create_store()
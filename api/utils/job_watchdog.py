@@ -0,0 +1,216 @@
+"""
+Time budgets, cooperative cancellation and stall detection for scheduled jobs.
+
+Every job run is watched with a timeout. A watchdog thread in each process
+that runs jobs checks its runs every WATCHDOG_INTERVAL seconds: once a run is
+past its deadline its cancel flag is set, which jobs observe by calling
+check_cancelled() between units of work. If the run is still going
+Config.JOB_KILL_GRACE seconds later, a process pool run is killed together
+with its worker process (APScheduler replaces the broken pool on the next
+submit), while a thread pool run, which cannot be killed, is reported as
+stalled.
+
+Run state is mirrored to a Redis key per job (scheduler:running:<job_key>)
+that expires unless the watchdog refreshes it, so /api/jobs/status shows
+running and stalled jobs from any worker, including process pool children.
+"""
+import os
+import json
+import time
+import signal
+import socket
+import threading
+from datetime import datetime, timedelta
+from redis.exceptions import RedisError
+from config import Config
+from .redis_client import redis_client
+from .two_tier_cache import redis_available, mark_redis_down
+from .job_metrics import record_run
+from .app_logger import logger
+
+RUNNING_KEY_PREFIX = 'scheduler:running'
+WATCHDOG_INTERVAL = 5  # seconds between checks
+RUNNING_KEY_TTL = WATCHDOG_INTERVAL * 3  # a run's key outlives a few missed refreshes only
+
+_runs = {}  # id(run) -> run watched in this process
+_runs_lock = threading.Lock()
+_current = threading.local()
+_watchdog_pid = None
+
+
+class JobCancelled(Exception):
+    """Raised by check_cancelled() in a run that exceeded its timeout"""
+
+
+def _running_key(job_key):
+    return f"{RUNNING_KEY_PREFIX}:{job_key}"
+
+
+def _describe(run):
+    return {
+        'job_key': run['job_key'],
+        'job_name': run['job_name'],
+        'state': run['state'],
+        'worker': f"{socket.gethostname()}:{os.getpid()}",
+        'kill_on_timeout': run['kill_on_timeout'],
+        'started_at': run['started_at'].isoformat(),
+        'timeout': run['timeout'],
+        'deadline': (run['started_at'] + timedelta(seconds=run['timeout'])).isoformat()
+        if run['timeout'] else None,
+    }
+
+
+def _publish(run):
+    if not redis_available():
+        return
+    try:
+        redis_client.set(_running_key(run['job_key']), json.dumps(_describe(run)), ex=RUNNING_KEY_TTL)
+    except RedisError as e:
+        mark_redis_down(e)
+
+
+def _clear(run):
+    if not redis_available():
+        return
+    try:
+        redis_client.delete(_running_key(run['job_key']))
+    except RedisError as e:
+        mark_redis_down(e)
+
+
+def _kill(run):
+    """Record the run as failed and kill this process (only called in process pool workers)"""
+    run['state'] = 'killed'
+    logger.error("Killing job process after its timeout", job_key=run['job_key'], job_name=run['job_name'],
+                 pid=os.getpid(), timeout=run['timeout'])
+    record_run(run['job_key'], time.monotonic() - run['started'],
+               error=TimeoutError(f"Killed after exceeding its {run['timeout']}s timeout"))
+    with _runs_lock:
+        runs = list(_runs.values())
+    for other in runs:
+        _clear(other)
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def check_runs():
+    """Cancel, kill or flag overdue runs in this process and refresh their Redis state"""
+    now = time.monotonic()
+    with _runs_lock:
+        runs = list(_runs.values())
+
+    for run in runs:
+        overdue = now - run['started'] - run['timeout'] if run['timeout'] else None
+        if overdue is not None and overdue >= 0 and run['state'] == 'running':
+            run['state'] = 'cancelling'
+            run['cancel'].set()
+            logger.warning("Job exceeded its timeout, cancelling", job_key=run['job_key'],
+                           job_name=run['job_name'], timeout=run['timeout'])
+        elif overdue is not None and overdue >= Config.JOB_KILL_GRACE and run['state'] == 'cancelling':
+            if run['kill_on_timeout']:
+                _kill(run)
+                continue
+            run['state'] = 'stalled'
+            logger.error("Job stalled, still running after cancellation", job_key=run['job_key'],
+                         job_name=run['job_name'], timeout=run['timeout'],
+                         overdue=round(overdue, 1))
+        _publish(run)
+
+
+def _watch():
+    while True:
+        time.sleep(WATCHDOG_INTERVAL)
+        try:
+            check_runs()
+        except Exception:
+            logger.exception("Job watchdog check failed")
+
+
+def start_watchdog():
+    """Start this process's watchdog thread once (again after a fork)"""
+    global _watchdog_pid
+    with _runs_lock:
+        if _watchdog_pid == os.getpid():
+            return
+        _watchdog_pid = os.getpid()
+    threading.Thread(target=_watch, name='job-watchdog', daemon=True).start()
+
+
+class WatchedRun:
+    """
+    Registers one job run with the watchdog for the duration of a with block.
+
+    Args:
+        job_key: Cluster-wide job key
+        job_name: Display name
+        timeout: Seconds before the run is cancelled (None or 0: no limit)
+        kill_on_timeout: Kill this process if the run ignores cancellation (process pool runs)
+    """
+
+    def __init__(self, job_key, job_name, timeout=Config.JOB_TIMEOUT, kill_on_timeout=False):
+        self.run = {
+            'job_key': job_key,
+            'job_name': job_name,
+            'timeout': timeout,
+            'kill_on_timeout': kill_on_timeout,
+            'state': 'running',
+            'started': time.monotonic(),
+            'started_at': datetime.now(),
+            'cancel': threading.Event(),
+        }
+        self._previous = None
+
+    def __enter__(self):
+        start_watchdog()
+        with _runs_lock:
+            _runs[id(self.run)] = self.run
+        self._previous = getattr(_current, 'run', None)
+        _current.run = self.run
+        _publish(self.run)
+        return self.run
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.run = self._previous
+        with _runs_lock:
+            _runs.pop(id(self.run), None)
+        _clear(self.run)
+        if self.run['state'] == 'stalled':
+            logger.warning("Stalled job finished", job_key=self.run['job_key'], job_name=self.run['job_name'],
+                           duration=round(time.monotonic() - self.run['started'], 3))
+
+
+def cancel_requested():
+    """True if the run on this thread is past its timeout"""
+    run = getattr(_current, 'run', None)
+    return run is not None and run['cancel'].is_set()
+
+
+def check_cancelled():
+    """
+    Cancellation point for long-running jobs; a no-op outside a watched run.
+
+    Raises:
+        JobCancelled: If the run on this thread is past its timeout
+    """
+    run = getattr(_current, 'run', None)
+    if run is not None and run['cancel'].is_set():
+        raise JobCancelled(f"Job '{run['job_key']}' cancelled after exceeding its {run['timeout']}s timeout")
+
+
+def get_running(job_key):
+    """
+    The current run of a job on any worker (this worker only while Redis is unavailable).
+
+    Returns:
+        dict or None: Job key, state ('running', 'cancelling', 'stalled' or 'killed'),
+            worker, start time, timeout and deadline
+    """
+    if redis_available():
+        try:
+            value = redis_client.get(_running_key(job_key))
+            return json.loads(value) if value is not None else None
+        except RedisError as e:
+            mark_redis_down(e)
+
+    with _runs_lock:
+        runs = [run for run in _runs.values() if run['job_key'] == job_key]
+    return _describe(runs[0]) if runs else None
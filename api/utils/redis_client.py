@@ -12,9 +12,24 @@ pool = ConnectionPool(
     decode_responses=True
 )
 
+# Separate pool for raw bytes values (compressed payloads)
+binary_pool = ConnectionPool(
+    host=Config.REDIS_HOST,
+    port=Config.REDIS_PORT,
+    db=Config.REDIS_DB,
+    password=Config.REDIS_PASSWORD,
+    max_connections=10,
+    decode_responses=False
+)
+
 def get_redis_client():
     """Get Redis client instance from pool"""
     return redis.Redis(connection_pool=pool)
 
-# Global redis client
-redis_client = get_redis_client()
\ No newline at end of file
+def get_binary_redis_client():
+    """Get Redis client instance that returns bytes instead of str"""
+    return redis.Redis(connection_pool=binary_pool)
+
+# Global redis clients
+redis_client = get_redis_client()
+binary_redis_client = get_binary_redis_client()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Redis lock owned by a random token, with background renewal for long holders.
+
+The lock key is set with NX and a short TTL, and a daemon thread extends the
+TTL while the holder is alive, so a crashed worker releases the lock within
+LOCK_TTL seconds while a long job keeps it for up to max_hold seconds
+(Config.LOCK_EXPIRE_TIME by default). Release and renewal are Lua scripts that
+only act if the key still holds this lock's token.
+"""
+import time
+import uuid
+import threading
+from config import Config
+from .redis_client import redis_client
+from .app_logger import logger
+
+LOCK_TTL = 60  # seconds the key lives without renewal
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisLock:
+    """
+    Distributed lock with automatic renewal.
+
+    Args:
+        name: Redis key of the lock
+        ttl: Seconds the key lives between renewals
+        max_hold: Seconds after which renewal stops (None: renew until released)
+        client: Redis client (decode_responses=True)
+    """
+
+    def __init__(self, name, ttl=LOCK_TTL, max_hold=Config.LOCK_EXPIRE_TIME, client=None):
+        self.name = name
+        self.ttl = min(ttl, max_hold) if max_hold else ttl
+        self.max_hold = max_hold
+        self.client = client if client is not None else redis_client
+        self.token = None
+        self.lost = False
+        self._stop = threading.Event()
+        self._renewer = None
+
+    def acquire(self, retry_times=Config.LOCK_RETRY_TIMES, retry_delay=Config.LOCK_RETRY_DELAY):
+        """
+        Try to take the lock, retrying retry_times times retry_delay seconds apart.
+
+        Returns:
+            bool: True if the lock was acquired
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unreachable
+        """
+        token = uuid.uuid4().hex
+        for attempt in range(retry_times + 1):
+            if self.client.set(self.name, token, nx=True, px=int(self.ttl * 1000)):
+                self.token = token
+                self.lost = False
+                self._start_renewal()
+                return True
+            if attempt < retry_times:
+                time.sleep(retry_delay)
+        return False
+
+    def extend(self):
+        """Reset the key's TTL; False if the lock is no longer ours"""
+        extended = self.client.eval(_EXTEND_SCRIPT, 1, self.name, self.token, int(self.ttl * 1000))
+        return bool(extended)
+
+    def release(self):
+        """Stop renewal and delete the key if it still holds our token"""
+        self._stop.set()
+        if self._renewer is not None and self._renewer is not threading.current_thread():
+            self._renewer.join(timeout=1)
+        if self.token is None:
+            return False
+        try:
+            return bool(self.client.eval(_RELEASE_SCRIPT, 1, self.name, self.token))
+        finally:
+            self.token = None
+
+    def _start_renewal(self):
+        self._stop.clear()
+        self._renewer = threading.Thread(target=self._renew, name=f"lock-renewal:{self.name}", daemon=True)
+        self._renewer.start()
+
+    def _renew(self):
+        started = time.monotonic()
+        while not self._stop.wait(self.ttl / 3):
+            if self.max_hold and time.monotonic() - started >= self.max_hold:
+                logger.warning("Lock held past its maximum, no longer renewing", lock=self.name,
+                               max_hold=self.max_hold)
+                return
+            try:
+                if not self.extend():
+                    self.lost = True
+                    logger.warning("Lock lost before release", lock=self.name)
+                    return
+            except Exception as e:
+                # Keep trying: the key survives until its TTL runs out
+                logger.warning("Lock renewal failed", lock=self.name, error=str(e))
+
+    def __enter__(self):
+        if not self.acquire():
+            raise TimeoutError(f"Could not acquire lock: {self.name}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
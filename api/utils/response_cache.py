@@ -0,0 +1,194 @@
+"""
+Redis-backed response cache for Flask routes.
+
+Responses are cached per endpoint, view arguments and normalized query string
+in a TwoTierCache, so a worker serves its own fresh copies from memory and
+only falls back to Redis on a local miss. Each entry has a soft TTL after
+which it is considered stale, and is kept in Redis for a further stale window.
+When an entry goes stale, only the worker that wins a Redis lock recomputes
+it; the others serve the stale copy, or, if there is none yet, wait for the
+winner for up to LOCK_RETRY_TIMES * LOCK_RETRY_DELAY seconds. If Redis is
+unavailable only the local tier is used.
+
+Bodies are stored compressed (Config.CACHE_COMPRESSION) and sent as-is to
+clients that accept that encoding; other clients get them decompressed.
+Each entry also keeps an ETag of its uncompressed body, so conditional
+requests can be answered without touching the body.
+"""
+import json
+import hashlib
+import time
+from functools import wraps
+from flask import request, make_response
+from redis.exceptions import RedisError
+from config import Config
+from .redis_client import redis_client, binary_redis_client
+from .two_tier_cache import get_cache, redis_available, mark_redis_down
+from .compression import compress, decompress, accepts_encoding, storage_encoding, MIN_COMPRESS_SIZE
+
+KEY_PREFIX = 'response_cache'
+LOCK_TIMEOUT = 30  # seconds a recompute may hold the lock
+
+
+def _dumps(entry):
+    """Serialize an entry as a JSON header line followed by the raw (compressed) body"""
+    meta = {name: value for name, value in entry.items() if name != 'body'}
+    return json.dumps(meta).encode() + b'\n' + entry['body']
+
+
+def _loads(serialized):
+    meta, body = serialized.split(b'\n', 1)
+    entry = json.loads(meta)
+    entry['body'] = body
+    return entry
+
+
+# Local copies are only kept while fresh; stale entries are always re-read from Redis
+response_cache = get_cache(KEY_PREFIX, local_ttl=lambda entry: entry['fresh_until'] - time.time(),
+                           dumps=_dumps, loads=_loads, client=binary_redis_client)
+
+
+def build_cache_key(endpoint=None, view_args=None, args=None):
+    """Cache key from the endpoint, view arguments and query arguments (sorted, repeated values kept)"""
+    endpoint = endpoint or request.endpoint
+    view_args = request.view_args if view_args is None else view_args
+    args = request.args if args is None else args
+
+    parts = [f"{name}={view_args[name]}" for name in sorted(view_args or {})]
+    query = sorted((name, value) for name in args for value in args.getlist(name))
+    parts += [f"{name}={value}" for name, value in query]
+    return f"{endpoint}:{'&'.join(parts)}"
+
+
+def _to_entry(response, ttl):
+    body = response.get_data()
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    encoding = None
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding = storage_encoding()
+        body = compress(body, encoding)
+    return {
+        'body': body,
+        'encoding': encoding,
+        'etag': etag,
+        'status': response.status_code,
+        'mimetype': response.mimetype,
+        'fresh_until': time.time() + ttl,
+    }
+
+
+def _set_body(response, entry):
+    """Send the stored body as-is if the client accepts its encoding, else decompressed"""
+    encoding = entry['encoding']
+    if encoding is None:
+        response.set_data(entry['body'])
+        return
+    response.vary.add('Accept-Encoding')
+    if accepts_encoding(encoding):
+        response.set_data(entry['body'])
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response.set_data(decompress(entry['body'], encoding))
+
+
+def _to_response(entry, cache_status, tier=None):
+    response = make_response('', entry['status'])
+    response.mimetype = entry['mimetype']
+    _set_body(response, entry)
+    response.set_etag(entry['etag'], weak=True)
+    response.headers['X-Cache'] = cache_status
+    if tier:
+        response.headers['X-Cache-Tier'] = tier
+    return response
+
+
+def cached_etag(*args, **kwargs):
+    """
+    Version token for @conditional_response: the ETag of this worker's fresh cached
+    response to the current request, or None. Only the local tier is checked, and
+    the lookup is not counted as a cache hit or miss.
+    """
+    entry = response_cache.local.get(response_cache.key(build_cache_key()))
+    if entry is None or time.time() >= entry['fresh_until']:
+        return None
+    return entry['etag']
+
+
+def invalidate_endpoint(endpoint=''):
+    """Drop cached responses for an endpoint (all endpoints by default) in every worker"""
+    return response_cache.invalidate_prefix(f"{endpoint}:" if endpoint else '')
+
+
+def cached_response(ttl, stale_ttl=None):
+    """
+    Cache a route's successful responses.
+
+    Place it below @require_access so access checks run on every request.
+
+    Args:
+        ttl: Seconds a cached response is served as fresh
+        stale_ttl: Further seconds a stale response may be served while one
+            worker recomputes it (default: ttl)
+    """
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            key = build_cache_key()
+
+            def compute(cache_status):
+                started = time.perf_counter()
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    entry = _to_entry(response, ttl)
+                    response_cache.set(key, entry, ex=ttl + stale_ttl)
+                    response_cache.metrics.record_fill(time.perf_counter() - started)
+                    response.set_etag(entry['etag'], weak=True)
+                    if entry['encoding'] is not None and accepts_encoding(entry['encoding']):
+                        _set_body(response, entry)  # Reuse the compressed body
+                response.headers['X-Cache'] = cache_status
+                return response
+
+            if request.environ.get('app.cache_refresh'):
+                return compute('REFRESH')  # Warm-up after a data refresh
+
+            entry, tier = response_cache.get(key)
+            if entry is not None and time.time() < entry['fresh_until']:
+                return _to_response(entry, 'HIT', tier)
+
+            if not redis_available():
+                return compute('BYPASS')
+
+            try:
+                lock = redis_client.lock(f"{response_cache.key(key)}:lock",
+                                         timeout=min(Config.LOCK_EXPIRE_TIME, LOCK_TIMEOUT))
+                acquired = lock.acquire(blocking=False)
+            except RedisError as e:
+                mark_redis_down(e)
+                return compute('BYPASS')
+
+            if acquired:
+                try:
+                    return compute('MISS')
+                finally:
+                    try:
+                        lock.release()
+                    except RedisError:
+                        pass  # Expired or Redis went away; the lock times out on its own
+
+            # Another worker is recomputing: serve stale, or wait briefly for its result
+            if entry is not None:
+                response_cache.metrics.incr('stale')
+                return _to_response(entry, 'STALE', tier)
+            for _ in range(Config.LOCK_RETRY_TIMES):
+                time.sleep(Config.LOCK_RETRY_DELAY)
+                entry, tier = response_cache.get(key)
+                if entry is not None:
+                    return _to_response(entry, 'HIT', tier)
+                if not redis_available():
+                    break
+            return compute('MISS')
+
+        return wrapper
+    return decorator
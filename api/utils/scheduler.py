@@ -1,23 +1,417 @@
 """
 APScheduler configuration with proper logging support.
 This module handles all scheduled background tasks with centralized logging.
+
+Every worker may host a scheduler. Interval triggers are anchored to a shared
+start date, so all workers fire on the same grid. Each job run takes a Redis
+lock and then claims its trigger period (the latest fire time at or before the
+run) with SET NX, so a job executes once per period across all workers and
+nodes, even when workers boot or recycle at different times.
+
+Jobs run on one of two executors: a thread pool (default) for I/O-bound jobs
+and a process pool for CPU-bound jobs, so heavy pandas work does not hold the
+GIL against request threads. Process pool jobs must be module-level functions.
+
+Jobs that depend on each other are declared as a JobPipeline and scheduled
+with add_scheduled_pipeline: the pipeline takes one lock per run and starts
+each step once its upstream steps have succeeded.
+
+Every job and pipeline step runs with a time budget (timeout=, default
+Config.JOB_TIMEOUT) enforced by the watchdog in job_watchdog.py, so a hung
+run cannot hold the job's max_instances slot forever.
+
+With SCHEDULER_JOBSTORE=sqlite, jobs are kept in a SQLite job store and every
+run in a run-history table (job_history.py). APScheduler does not support
+several schedulers on one persistent store, so only the worker holding the
+Redis leader lock uses it; the others keep their jobs in memory. The
+scheduler starts paused; once
+the jobs are registered, recover_missed_runs() schedules one staggered
+catch-up run for each job that missed a run while no scheduler was up, then
+starts running jobs.
 """
 import os
+import time
+import math
+import functools
 import atexit
-from datetime import datetime
+import threading
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from redis.exceptions import RedisError
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import BasePoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.util import obj_to_ref
+from config import Config
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
 from .app_logger import get_app_logger, get_task_logger
+from .redis_client import redis_client
+from .redis_lock import RedisLock
+from .job_metrics import RunMeter, record_run, record_missed
+from .job_watchdog import WatchedRun, WATCHDOG_INTERVAL, cancel_requested, check_cancelled
+from . import job_history
+
+try:
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    _SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    _SQLALCHEMY_AVAILABLE = False
 
 # Get the main application logger
 logger = get_app_logger()
 
+JOB_LOCK_PREFIX = 'scheduler:job'
+
+# Shared start date of interval triggers, so every worker computes the same fire times
+INTERVAL_ANCHOR = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# Executor aliases for add_scheduled_job(..., executor=...)
+THREAD_EXECUTOR = 'default'
+PROCESS_EXECUTOR = 'processpool'
+
+# Catch-up runs are one-off and never persisted
+CATCHUP_JOBSTORE = 'catchup'
+
+# Held for the worker's lifetime by the one scheduler that owns the SQLite job store
+JOBSTORE_LEADER_LOCK = 'scheduler:jobstore:leader'
+
+
+class SharedPoolExecutor(BasePoolExecutor):
+    """
+    APScheduler executor whose concurrent.futures pool also runs pipeline steps,
+    so scheduled jobs and steps share one MAX_THREADS / MAX_PROCESSES budget.
+    A process pool broken by a killed run is replaced on the next submit.
+
+    Args:
+        pool_factory: Callable returning a new concurrent.futures executor
+    """
+
+    def __init__(self, pool_factory):
+        self.pool_factory = pool_factory
+        self._replace_lock = threading.Lock()
+        super().__init__(pool_factory())
+
+    def _replace_broken_pool(self, broken_pool):
+        with self._replace_lock:
+            if self._pool is broken_pool:
+                logger.warning("Process pool is broken, replacing it")
+                self._pool = self.pool_factory()
+
+    def _do_submit_job(self, job, run_times):
+        pool = self._pool
+        try:
+            super()._do_submit_job(job, run_times)
+        except BrokenProcessPool:
+            self._replace_broken_pool(pool)
+            super()._do_submit_job(job, run_times)
+
+    def submit(self, fn, *args):
+        """Submit a pipeline step to the shared pool"""
+        pool = self._pool
+        try:
+            return pool.submit(fn, *args)
+        except BrokenProcessPool:
+            self._replace_broken_pool(pool)
+            return self._pool.submit(fn, *args)
+
+
+def create_executors():
+    """Thread pool (default) and spawn-based process pool shared by jobs and pipeline steps"""
+    return {
+        THREAD_EXECUTOR: SharedPoolExecutor(functools.partial(
+            concurrent.futures.ThreadPoolExecutor, Config.MAX_THREADS)),
+        PROCESS_EXECUTOR: SharedPoolExecutor(functools.partial(
+            concurrent.futures.ProcessPoolExecutor, Config.MAX_PROCESSES,
+            mp_context=multiprocessing.get_context('spawn'))),
+    }
+
+
+def acquire_jobstore_leadership():
+    """
+    Try once to become the scheduler that owns the persistent job store.
+
+    Returns:
+        RedisLock or None: The held leader lock (renewed until released), or None
+    """
+    lock = RedisLock(JOBSTORE_LEADER_LOCK, max_hold=None)
+    try:
+        if lock.acquire(retry_times=0):
+            return lock
+        logger.info("Another scheduler owns the SQLite job store, using the in-memory job store")
+    except RedisError as e:
+        logger.warning("Redis unavailable, cannot elect the SQLite job store owner; "
+                       "using the in-memory job store", error=str(e))
+    return None
+
+
+def create_jobstores():
+    """
+    Job stores for the scheduler: SQLite for SCHEDULER_JOBSTORE=sqlite when SQLAlchemy
+    is installed and this worker holds the job store leader lock, in-memory otherwise.
+
+    Returns:
+        tuple: (jobstores dict, leader RedisLock if the default store is persistent, else None)
+    """
+    jobstores = {CATCHUP_JOBSTORE: MemoryJobStore(), 'default': MemoryJobStore()}
+    if Config.SCHEDULER_JOBSTORE != 'sqlite':
+        return jobstores, None
+    if not _SQLALCHEMY_AVAILABLE:
+        logger.warning("SQLAlchemy is not installed, using the in-memory job store",
+                       jobstore=Config.SCHEDULER_JOBSTORE)
+        return jobstores, None
+
+    leader_lock = acquire_jobstore_leadership()
+    if leader_lock is not None:
+        db_path = os.path.abspath(Config.SCHEDULER_DB_PATH)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        jobstores['default'] = SQLAlchemyJobStore(url=f"sqlite:///{db_path}")
+    return jobstores, leader_lock
+
+
+def run_spacing(trigger):
+    """Seconds between two consecutive fire times of a trigger (0 for one-off triggers)"""
+    now = datetime.now(timezone.utc)
+    first = trigger.get_next_fire_time(None, now)
+    second = trigger.get_next_fire_time(first, first) if first else None
+    if first is None or second is None:
+        return 0
+    return (second - first).total_seconds()
+
+
+def period_start(trigger, now=None):
+    """
+    Start of the trigger period containing now: the latest fire time at or before now.
+
+    Returns:
+        datetime or None: None for one-off triggers
+    """
+    now = now or datetime.now(timezone.utc)
+    if isinstance(trigger, IntervalTrigger):
+        elapsed = (now - trigger.start_date).total_seconds()
+        return trigger.start_date + timedelta(seconds=elapsed - elapsed % trigger.interval_length)
+    spacing = run_spacing(trigger)
+    if not spacing:
+        return None
+    fire_time = trigger.get_next_fire_time(None, now - timedelta(seconds=spacing))
+    return fire_time if fire_time is not None and fire_time <= now else None
+
+
+def acquire_job_run(job_key, trigger, task_logger):
+    """
+    Take the cluster-wide lock for one run of a job and claim the current trigger period.
+
+    Returns:
+        RedisLock | None | bool: The held lock, None if Redis is unreachable (run
+            unlocked), or False if another worker is running or has run the job this period
+    """
+    lock = RedisLock(f"{JOB_LOCK_PREFIX}:{job_key}:lock")
+    try:
+        if not lock.acquire():
+            task_logger.info("Skipping run, job is running on another worker")
+            return False
+        started_period = period_start(trigger) if trigger is not None else None
+        if started_period is not None:
+            ttl = max(1, math.ceil(run_spacing(trigger)))
+            if not redis_client.set(f"{JOB_LOCK_PREFIX}:{job_key}:ran:{int(started_period.timestamp())}",
+                                    datetime.now().isoformat(), nx=True, ex=ttl):
+                lock.release()
+                task_logger.info("Skipping run, job already ran this period on another worker",
+                                 period_start=started_period)
+                return False
+        return lock
+    except RedisError as e:
+        task_logger.warning("Redis unavailable, running job without lock", error=str(e))
+        return None
+
+
+def finish_job_run(lock):
+    """Release the job lock; the claimed period stays marked until it ends"""
+    try:
+        lock.release()
+    except RedisError:
+        pass  # The lock expires on its own
+
+
+def logged_job_wrapper(func, job_name, job_key, trigger, timeout=Config.JOB_TIMEOUT, kill_on_timeout=False):
+    """
+    Run a scheduled job with the cluster-wide lock, logging context, run metrics and
+    a watchdog time budget. Module level so process pool jobs can be pickled.
+    """
+    task_logger = get_task_logger(job_name)
+    lock = acquire_job_run(job_key, trigger, task_logger)
+    if lock is False:
+        return None
+    task_logger.info(f"Starting scheduled task: {job_name}")
+    meter = RunMeter()
+
+    try:
+        with WatchedRun(job_key, job_name, timeout, kill_on_timeout):
+            result = func()
+        record_run(job_key, meter.duration, rss_delta_kb=meter.rss_delta_kb)
+        task_logger.success(f"Completed scheduled task: {job_name}")
+        return result
+    except Exception as e:
+        record_run(job_key, meter.duration, error=e, rss_delta_kb=meter.rss_delta_kb)
+        task_logger.exception(f"Error in scheduled task: {job_name}")
+        raise
+    finally:
+        if lock is not None:
+            finish_job_run(lock)
+
+
+def run_pipeline_step(func, step_name, step_key, timeout=Config.JOB_TIMEOUT, kill_on_timeout=False):
+    """
+    Run one pipeline step with logging context and run metrics (the pipeline holds the lock).
+    Module level so process pool steps can be pickled.
+    """
+    task_logger = get_task_logger(step_name)
+    task_logger.info(f"Starting pipeline step: {step_name}")
+    meter = RunMeter()
+
+    try:
+        with WatchedRun(step_key, step_name, timeout, kill_on_timeout):
+            result = func()
+        record_run(step_key, meter.duration, rss_delta_kb=meter.rss_delta_kb)
+        task_logger.success(f"Completed pipeline step: {step_name}")
+        return result
+    except Exception as e:
+        record_run(step_key, meter.duration, error=e, rss_delta_kb=meter.rss_delta_kb)
+        task_logger.exception(f"Error in pipeline step: {step_name}")
+        raise
+
+
+class JobPipeline:
+    """
+    Jobs declared as a DAG and scheduled as one unit.
+
+    Each run starts the steps without dependencies, then every step as soon as
+    all of its upstream steps succeed, so independent branches run in parallel
+    on the scheduler's own executors, within MAX_THREADS / MAX_PROCESSES (the
+    pipeline run itself holds one thread while it waits for its steps). A
+    failed step marks all of its dependents 'skipped'; if the pipeline run
+    exceeds its own timeout, steps not yet started are marked 'cancelled'.
+    Steps must be added after their dependencies, which keeps the graph
+    acyclic.
+
+    Args:
+        pipeline_id: Pipeline id, also the prefix of the step metrics keys
+        name: Display name
+    """
+
+    def __init__(self, pipeline_id, name=None):
+        self.id = pipeline_id
+        self.name = name or pipeline_id
+        self.steps = {}  # step name -> {'func', 'depends_on', 'executor', 'timeout'}, in declaration order
+        self.last_run = None
+
+    def add_step(self, step_name, func, depends_on=(), executor=THREAD_EXECUTOR, timeout=Config.JOB_TIMEOUT):
+        """
+        Declare a step.
+
+        Args:
+            step_name: Step name, unique in the pipeline
+            func: The function to run
+            depends_on: Names of steps that must succeed first (already added)
+            executor: THREAD_EXECUTOR or PROCESS_EXECUTOR (func must be module level)
+            timeout: Seconds before the step is cancelled (process pool steps are killed)
+
+        Raises:
+            ValueError: If the step exists, a dependency is unknown or the executor is invalid
+        """
+        if step_name in self.steps:
+            raise ValueError(f"Duplicate pipeline step: {step_name}")
+        unknown = [name for name in depends_on if name not in self.steps]
+        if unknown:
+            raise ValueError(f"Pipeline step '{step_name}' depends on unknown steps: {', '.join(unknown)}")
+        if executor not in (THREAD_EXECUTOR, PROCESS_EXECUTOR):
+            raise ValueError(f"Unknown executor: {executor}")
+        if executor == PROCESS_EXECUTOR:
+            obj_to_ref(func)  # Raises ValueError now rather than when the step is pickled
+        self.steps[step_name] = {'func': func, 'depends_on': list(depends_on), 'executor': executor,
+                                 'timeout': timeout}
+        return self
+
+    def step_key(self, step_name):
+        return f"{self.id}.{step_name}"
+
+    def run(self, submit):
+        """
+        Run every step once.
+
+        Args:
+            submit: Callable (executor alias, fn, *args) -> concurrent.futures.Future
+
+        Returns:
+            dict: Step name -> {'status': 'success'|'failed'|'skipped'|'cancelled', 'duration', 'error'}
+
+        Raises:
+            RuntimeError: If any step failed, after all other runnable steps have finished
+            JobCancelled: If the pipeline run exceeded its timeout
+        """
+        task_logger = get_task_logger(self.id)
+        pending = list(self.steps)
+        results = {}
+        running = {}
+
+        while pending or running:
+            if pending and cancel_requested():
+                for step_name in pending:
+                    results[step_name] = {'status': 'cancelled', 'duration': None, 'error': None}
+                task_logger.warning("Pipeline run exceeded its timeout, not starting remaining steps",
+                                    steps=pending)
+                pending = []
+
+            for step_name in list(pending):
+                depends_on = self.steps[step_name]['depends_on']
+                if any(results.get(name, {}).get('status') in ('failed', 'skipped') for name in depends_on):
+                    pending.remove(step_name)
+                    results[step_name] = {'status': 'skipped', 'duration': None, 'error': None}
+                    task_logger.warning(f"Skipping pipeline step: {step_name}, an upstream step failed")
+                elif all(results.get(name, {}).get('status') == 'success' for name in depends_on):
+                    pending.remove(step_name)
+                    step = self.steps[step_name]
+                    future = submit(step['executor'], run_pipeline_step, step['func'], step_name,
+                                    self.step_key(step_name), step['timeout'],
+                                    step['executor'] == PROCESS_EXECUTOR)
+                    running[future] = (step_name, time.perf_counter())
+
+            if not running:
+                break
+            # Wake up periodically to notice the pipeline's own cancellation
+            done, _ = concurrent.futures.wait(running, timeout=WATCHDOG_INTERVAL,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                step_name, started = running.pop(future)
+                error = future.exception()
+                results[step_name] = {
+                    'status': 'failed' if error is not None else 'success',
+                    'duration': round(time.perf_counter() - started, 3),
+                    'error': str(error) if error is not None else None,
+                }
+
+        self.last_run = {'finished_at': datetime.now().isoformat(), 'steps': results}
+        failed = [name for name, result in results.items() if result['status'] == 'failed']
+        if failed:
+            raise RuntimeError(f"Pipeline '{self.id}' failed steps: {', '.join(failed)}")
+        check_cancelled()
+        return results
+
 class SchedulerManager:
     """Manages the APScheduler instance with proper logging"""
     
     def __init__(self):
         self.scheduler = None
         self._initialized = False
+        self.job_keys = {}  # APScheduler job id -> cluster-wide job key (locks, metrics)
+        self.pipelines = {}  # APScheduler job id -> JobPipeline
+        self.executors = {}
+        self.persistent = False
+        self.jobstore_lock = None  # leader lock held while using the persistent job store
+        self.missed_runs = {}  # job id -> fire time missed while no scheduler was up
+        self.catchup = {}  # job id -> whether a missed run is caught up
         
     def init_scheduler(self):
         """Initialize the scheduler with proper configuration"""
@@ -27,9 +421,14 @@ class SchedulerManager:
             
         try:
             # Create scheduler instance
+            self.executors = create_executors()
+            jobstores, self.jobstore_lock = create_jobstores()
+            self.persistent = self.jobstore_lock is not None
             self.scheduler = BackgroundScheduler(
                 daemon=True,
                 timezone='UTC',
+                jobstores=jobstores,
+                executors=self.executors,
                 job_defaults={
                     'coalesce': True,
                     'max_instances': 1,
@@ -51,15 +450,16 @@ class SchedulerManager:
                 EVENT_JOB_MISSED
             )
             
-            # Start the scheduler
-            self.scheduler.start()
+            # Start the scheduler paused; recover_missed_runs() resumes it once jobs are registered
+            self.scheduler.start(paused=True)
             self._initialized = True
             
             # Register cleanup on exit
             atexit.register(self.shutdown)
             
             logger.success("Scheduler initialized successfully", 
-                         jobs_count=len(self.scheduler.get_jobs()))
+                         jobs_count=len(self.scheduler.get_jobs()),
+                         persistent=self.persistent)
             
             return self.scheduler
             
@@ -90,6 +490,7 @@ class SchedulerManager:
     def _job_missed_listener(self, event):
         """Log missed job executions"""
         job = self.scheduler.get_job(event.job_id)
+        record_missed(self.job_keys.get(event.job_id, event.job_id), event.scheduled_run_time)
         if job:
             logger.warning("Scheduled job execution missed",
                           job_id=event.job_id,
@@ -103,43 +504,159 @@ class SchedulerManager:
         Args:
             func: The function to schedule
             trigger: The trigger type ('interval', 'cron', 'date')
-            **kwargs: Additional arguments for add_job
+            **kwargs: Additional arguments for add_job, including
+                executor=THREAD_EXECUTOR (default, I/O-bound jobs) or
+                PROCESS_EXECUTOR (CPU-bound jobs; func must be module level), and
+                timeout=Config.JOB_TIMEOUT seconds after which the run is cancelled
+                (killed if it runs in the process pool), and catchup=True/False to
+                override whether a run missed while down is caught up (default: jobs
+                spaced at least Config.SCHEDULER_CATCHUP_MIN_SPACING apart)
         """
         # Get job name from function or kwargs
-        job_name = kwargs.get('name', func.__name__)
+        job_name = kwargs.get('name') or func.__name__
         job_id = kwargs.get('id')
+        if self.persistent and not job_id:
+            # Stored jobs are matched by id on the next start
+            job_id = kwargs['id'] = job_name
         
         # Check if job already exists
-        if job_id and self.scheduler.get_job(job_id):
+        existing = self.scheduler.get_job(job_id) if job_id else None
+        if existing is not None and job_id in self.job_keys:
             logger.warning(f"Job with id '{job_id}' already exists, skipping registration",
                           job_id=job_id,
                           job_name=job_name)
-            return self.scheduler.get_job(job_id)
-        
-        # Create a wrapper that adds logging context
-        def logged_job_wrapper():
-            task_logger = get_task_logger(job_name)
-            task_logger.info(f"Starting scheduled task: {job_name}")
-            
-            try:
-                result = func()
-                task_logger.success(f"Completed scheduled task: {job_name}")
-                return result
-            except Exception as e:
-                task_logger.exception(f"Error in scheduled task: {job_name}")
-                raise
+            return existing
+        if existing is not None:
+            # Loaded from the persistent store: replace it, remembering a run missed while down
+            if existing.next_run_time is not None and existing.next_run_time <= datetime.now(timezone.utc):
+                self.missed_runs[job_id] = existing.next_run_time
+            kwargs['replace_existing'] = True
         
-        # Add the wrapped job
+        # Lock key must be identical in every worker, so it uses the explicit id
+        job_key = job_id or job_name
+        executor = kwargs.setdefault('executor', THREAD_EXECUTOR)
+        timeout = kwargs.pop('timeout', Config.JOB_TIMEOUT)
+        kill_on_timeout = executor == PROCESS_EXECUTOR
+        catchup = kwargs.pop('catchup', None)
+        if executor == PROCESS_EXECUTOR or self.persistent:
+            # Raises ValueError now rather than when the job is pickled
+            obj_to_ref(func.func if isinstance(func, functools.partial) else func)
+
+        # All workers share the fire-time grid of interval triggers
+        if trigger == 'interval':
+            kwargs.setdefault('start_date', INTERVAL_ANCHOR)
+
+        # Add the job through the wrapper; the trigger object exists once the job does
         kwargs['name'] = job_name
-        job = self.scheduler.add_job(logged_job_wrapper, trigger, **kwargs)
+        job = self.scheduler.add_job(logged_job_wrapper, trigger,
+                                     args=[func, job_name, job_key, None, timeout, kill_on_timeout], **kwargs)
+        spacing = run_spacing(job.trigger)
+        job.modify(args=[func, job_name, job_key, job.trigger, timeout, kill_on_timeout])
+        self.job_keys[job.id] = job_key
+        self.catchup[job.id] = catchup if catchup is not None else spacing >= Config.SCHEDULER_CATCHUP_MIN_SPACING
         
         logger.info(f"Added scheduled job: {job_name}",
                    trigger=trigger,
                    job_id=job.id,
+                   executor=executor,
+                   timeout=timeout,
                    next_run=job.next_run_time)
         
         return job
     
+    def submit_step(self, executor, fn, *args):
+        """Submit a pipeline step to the scheduler's executor of the same alias"""
+        return self.executors[executor].submit(fn, *args)
+
+    def run_pipeline(self, pipeline):
+        """Run all steps of a pipeline once"""
+        return pipeline.run(self.submit_step)
+
+    def add_pipeline(self, pipeline, trigger, **kwargs):
+        """
+        Schedule a JobPipeline as one job; the pipeline id is the job id.
+
+        Args:
+            pipeline: The JobPipeline to run
+            trigger: The trigger type ('interval', 'cron', 'date')
+            **kwargs: Additional arguments for add_job (the pipeline itself always
+                runs on the thread executor, its steps on their own executors)
+        """
+        if not pipeline.steps:
+            raise ValueError(f"Pipeline '{pipeline.id}' has no steps")
+        kwargs.update(id=pipeline.id, executor=THREAD_EXECUTOR)
+        kwargs.setdefault('name', pipeline.name)
+        self.pipelines[pipeline.id] = pipeline
+        job = self.add_job(functools.partial(run_pipeline_job, pipeline.id), trigger, **kwargs)
+        logger.info(f"Added pipeline: {pipeline.name}",
+                    job_id=job.id,
+                    steps={name: step['depends_on'] for name, step in pipeline.steps.items()})
+        return job
+
+    def recover_missed_runs(self):
+        """
+        Schedule catch-up runs for runs missed while no scheduler was up, drop stored
+        jobs that are no longer registered, and start running jobs.
+
+        A missed run is caught up once (however many fire times were missed) if the
+        job allows catch-up, it was missed less than SCHEDULER_CATCHUP_MAX_AGE ago
+        and the run history has no successful run since. Catch-up runs start
+        SCHEDULER_CATCHUP_DELAY seconds after startup, SCHEDULER_CATCHUP_STAGGER
+        seconds apart, oldest miss first.
+
+        Returns:
+            list: Ids of the scheduled catch-up jobs
+        """
+        now = datetime.now(timezone.utc)
+        catchups = []
+
+        for job_id, missed_at in sorted(self.missed_runs.items(), key=lambda item: item[1]):
+            job = self.scheduler.get_job(job_id)
+            if job is None:
+                continue
+            job_key = self.job_keys[job_id]
+            record_missed(job_key, missed_at)
+            last_success = job_history.last_success(job_key)
+            if not self.catchup.get(job_id):
+                reason = 'catch-up disabled for this job'
+            elif (now - missed_at).total_seconds() > Config.SCHEDULER_CATCHUP_MAX_AGE:
+                reason = 'missed run is too old'
+            elif last_success is not None and last_success >= missed_at:
+                reason = 'already ran since'
+            else:
+                catchups.append(job)
+                continue
+            logger.info(f"Not catching up missed run: {job.name}", job_id=job_id,
+                        missed_at=missed_at, reason=reason)
+
+        scheduled = []
+        for index, job in enumerate(catchups):
+            run_date = now + timedelta(seconds=Config.SCHEDULER_CATCHUP_DELAY
+                                       + index * Config.SCHEDULER_CATCHUP_STAGGER)
+            catchup_job = self.scheduler.add_job(job.func, 'date', run_date=run_date, args=job.args,
+                                                 id=f"{job.id}:catchup", name=f"{job.name} (catch-up)",
+                                                 executor=job.executor, jobstore=CATCHUP_JOBSTORE,
+                                                 misfire_grace_time=None, replace_existing=True)
+            self.job_keys[catchup_job.id] = self.job_keys[job.id]
+            scheduled.append(catchup_job.id)
+            logger.info(f"Scheduled catch-up run: {job.name}", job_id=job.id,
+                        missed_at=self.missed_runs[job.id], run_date=run_date)
+
+        for job in self.scheduler.get_jobs(jobstore='default'):
+            if job.id not in self.job_keys:
+                logger.info(f"Removing stored job that is no longer registered: {job.name}", job_id=job.id)
+                job.remove()
+
+        if job_history.history_enabled():
+            try:
+                job_history.prune()
+            except Exception as e:
+                logger.warning("Failed to prune job run history", error=str(e))
+
+        self.missed_runs = {}
+        self.scheduler.resume()
+        return scheduled
+
     def get_jobs_status(self):
         """Get status of all scheduled jobs"""
         if not self.scheduler:
@@ -166,6 +683,12 @@ class SchedulerManager:
         if self.scheduler and self.scheduler.running:
             logger.info("Shutting down scheduler...")
             self.scheduler.shutdown(wait=wait)
+            if self.jobstore_lock is not None:
+                try:
+                    self.jobstore_lock.release()
+                except RedisError:
+                    pass  # The lock expires on its own
+                self.jobstore_lock = None
             self._initialized = False
             logger.success("Scheduler shutdown complete")
 
@@ -180,4 +703,12 @@ def get_scheduler():
 
 def add_scheduled_job(func, trigger, **kwargs):
     """Convenience function to add a job to the global scheduler"""
-    return scheduler_manager.add_job(func, trigger, **kwargs)
\ No newline at end of file
+    return scheduler_manager.add_job(func, trigger, **kwargs)
+
+def add_scheduled_pipeline(pipeline, trigger, **kwargs):
+    """Convenience function to add a pipeline to the global scheduler"""
+    return scheduler_manager.add_pipeline(pipeline, trigger, **kwargs)
+
+def run_pipeline_job(pipeline_id):
+    """Run a registered pipeline by id; the scheduled callable, so stored jobs stay picklable"""
+    return scheduler_manager.run_pipeline(scheduler_manager.pipelines[pipeline_id])
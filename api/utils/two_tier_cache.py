@@ -0,0 +1,361 @@
+"""
+Two-tier cache: a bounded in-process LRU in front of Redis.
+
+Reads check the local tier first and only go to Redis on a local miss, so hot
+entries cost neither a network round trip nor deserialization. Writes and
+invalidations are broadcast on a Redis pub/sub channel; every worker process
+runs a listener thread that drops the affected local entries, so all workers
+stop serving an old value together. If Redis is unavailable, the local tier
+keeps working on its own and Redis is retried after REDIS_RETRY_INTERVAL.
+Hit/miss/eviction counters are kept per namespace by CacheMetrics.
+"""
+import os
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from redis.exceptions import RedisError
+from config import Config
+from .redis_client import redis_client
+from .cache_stats import CacheMetrics
+from .app_logger import logger
+
+INVALIDATION_CHANNEL = 'cache:invalidate'
+REDIS_RETRY_INTERVAL = 30  # seconds to skip Redis after a connection error
+
+_redis_down_until = 0.0
+_state_lock = threading.Lock()
+
+
+def redis_available():
+    """False while Redis is being skipped after a recent connection error"""
+    return time.monotonic() >= _redis_down_until
+
+
+def mark_redis_down(error):
+    """Skip Redis for REDIS_RETRY_INTERVAL seconds after an error"""
+    global _redis_down_until
+    with _state_lock:
+        if redis_available():
+            logger.warning("Redis unavailable, using local cache only", error=str(error),
+                           retry_in=REDIS_RETRY_INTERVAL)
+        _redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+
+class LocalLRU:
+    """Thread-safe LRU bounded by entry count and total size in bytes, with per-entry expiry"""
+
+    def __init__(self, max_entries, max_bytes, on_evict=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, size, ttl=None):
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size, expires_at)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                evicted += 1
+        if evicted and self.on_evict:
+            self.on_evict(evicted)
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self.bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+class TwoTierCache:
+    """
+    Local LRU + Redis cache for serializable values.
+
+    Args:
+        namespace: Key prefix; also used to route invalidation messages
+        max_entries: Local tier entry limit
+        max_bytes: Local tier size limit (measured on the serialized value)
+        local_ttl: Seconds an entry stays in the local tier, or a callable
+            taking the value and returning seconds (None: until evicted)
+        dumps, loads: Serializer pair for the Redis tier
+        client: Redis client for values (binary_redis_client if dumps returns bytes)
+    """
+
+    def __init__(self, namespace, max_entries=Config.LOCAL_CACHE_MAX_ENTRIES,
+                 max_bytes=Config.LOCAL_CACHE_MAX_BYTES, local_ttl=None, dumps=json.dumps, loads=json.loads,
+                 client=None):
+        self.namespace = namespace
+        self.client = client
+        self.metrics = CacheMetrics(namespace, gauges=lambda: {'entries': len(self.local),
+                                                                'bytes': self.local.bytes})
+        self.local = LocalLRU(max_entries, max_bytes,
+                              on_evict=lambda count: self.metrics.incr('evictions', count))
+        self.local_ttl = local_ttl
+        self.dumps = dumps
+        self.loads = loads
+        self.instance_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def _client(self):
+        return self.client if self.client is not None else redis_client
+
+    def _count(self, counter):
+        self.metrics.incr(counter)
+
+    def _store_local(self, key, value, size):
+        ttl = self.local_ttl(value) if callable(self.local_ttl) else self.local_ttl
+        if ttl is None or ttl > 0:
+            self.local.set(key, value, size, ttl)
+
+    def get(self, key):
+        """
+        Look a key up in the local tier, then Redis.
+
+        Returns:
+            tuple: (value, tier) with tier 'local' or 'redis', or (None, None) on a miss
+        """
+        _listener.ensure_started()
+        full_key = self.key(key)
+
+        value = self.local.get(full_key)
+        if value is not None:
+            self._count('local_hits')
+            return value, 'local'
+
+        if redis_available():
+            try:
+                serialized = self._client().get(full_key)
+            except RedisError as e:
+                mark_redis_down(e)
+                serialized = None
+            if serialized is not None:
+                value = self.loads(serialized)
+                self._store_local(full_key, value, len(serialized))
+                self._count('redis_hits')
+                return value, 'redis'
+
+        self._count('misses')
+        return None, None
+
+    def set(self, key, value, ex=None):
+        """Store in both tiers and tell other workers to drop their local copy"""
+        _listener.ensure_started()
+        full_key = self.key(key)
+        serialized = self.dumps(value)
+        self._store_local(full_key, value, len(serialized))
+        if redis_available():
+            try:
+                self._client().set(full_key, serialized, ex=ex)
+                self._publish({'keys': [full_key]})
+            except RedisError as e:
+                mark_redis_down(e)
+
+    def delete(self, *keys):
+        """Remove keys from Redis and from every worker's local tier"""
+        full_keys = [self.key(key) for key in keys]
+        for full_key in full_keys:
+            self.local.delete(full_key)
+        if full_keys and redis_available():
+            try:
+                self._client().delete(*full_keys)
+                self._publish({'keys': full_keys})
+            except RedisError as e:
+                mark_redis_down(e)
+
+    def invalidate_prefix(self, prefix=''):
+        """
+        Remove every key starting with prefix (all keys by default) from both tiers in all workers.
+
+        Returns:
+            int: Number of Redis keys deleted
+        """
+        full_prefix = self.key(prefix)
+        self.local.delete_prefix(full_prefix)
+        deleted = 0
+        if redis_available():
+            try:
+                batch = []
+                for full_key in redis_client.scan_iter(match=f"{full_prefix}*", count=500):
+                    batch.append(full_key)
+                    if len(batch) >= 500:
+                        deleted += redis_client.delete(*batch)
+                        batch = []
+                if batch:
+                    deleted += redis_client.delete(*batch)
+                self._publish({'prefix': full_prefix})
+            except RedisError as e:
+                mark_redis_down(e)
+        return deleted
+
+    def _publish(self, message):
+        message.update({'namespace': self.namespace, 'origin': self.instance_id})
+        redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+
+    def handle_invalidation(self, message):
+        if message.get('origin') == self.instance_id:
+            return
+        for full_key in message.get('keys', []):
+            self.local.delete(full_key)
+        if 'prefix' in message:
+            self.local.delete_prefix(message['prefix'])
+
+    def stats(self):
+        """Per-tier hit counts and ratios for this worker process"""
+        counters = self.metrics.local_stats()
+        lookups = counters['local_hits'] + counters['redis_hits'] + counters['misses']
+        redis_lookups = lookups - counters['local_hits']
+        return {
+            'namespace': self.namespace,
+            'lookups': lookups,
+            'local': {
+                'hits': counters['local_hits'],
+                'hit_ratio': round(counters['local_hits'] / lookups, 4) if lookups else None,
+                'entries': len(self.local),
+                'bytes': self.local.bytes,
+                'max_entries': self.local.max_entries,
+                'max_bytes': self.local.max_bytes,
+            },
+            'redis': {
+                'hits': counters['redis_hits'],
+                'hit_ratio': round(counters['redis_hits'] / redis_lookups, 4) if redis_lookups else None,
+            },
+            'misses': counters['misses'],
+            'stale': counters['stale'],
+            'evictions': counters['evictions'],
+            'hit_ratio': round((lookups - counters['misses']) / lookups, 4) if lookups else None,
+            'fill_latency_ms': counters['fill_latency_ms'],
+        }
+
+
+class InvalidationListener:
+    """Per-process pub/sub listener thread that applies invalidations to local tiers"""
+
+    def __init__(self):
+        self.caches = {}
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def register(self, cache):
+        self.caches[cache.namespace] = cache
+
+    def ensure_started(self):
+        # Started lazily (and again after a fork) so every uWSGI worker gets its own thread
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='cache-invalidation', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        reconnect = False
+        while True:
+            if not redis_available():
+                time.sleep(REDIS_RETRY_INTERVAL)
+                continue
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                if reconnect:
+                    # Invalidations may have been missed while disconnected
+                    for cache in list(self.caches.values()):
+                        cache.local.clear()
+                reconnect = True
+                for message in pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    data = json.loads(message['data'])
+                    cache = self.caches.get(data.get('namespace'))
+                    if cache is not None:
+                        cache.handle_invalidation(data)
+            except RedisError as e:
+                mark_redis_down(e)
+            except Exception:
+                logger.exception("Cache invalidation listener error")
+                time.sleep(1)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+
+_listener = InvalidationListener()
+
+
+def get_cache(namespace, **kwargs):
+    """Return the process-wide TwoTierCache for namespace, creating it on first use"""
+    cache = _listener.caches.get(namespace)
+    if cache is None:
+        with _state_lock:
+            cache = _listener.caches.get(namespace)
+            if cache is None:
+                cache = TwoTierCache(namespace, **kwargs)
+                _listener.register(cache)
+    return cache
+
+
+def find_cache(namespace):
+    """The TwoTierCache registered for namespace in this process, or None"""
+    return _listener.caches.get(namespace)
+
+
+def get_all_stats():
+    """
+    Stats for every cache created in this process: totals across all workers
+    (None while Redis is unavailable) and this worker's own numbers.
+    """
+    stats = []
+    for cache in list(_listener.caches.values()):
+        cluster = None
+        if redis_available():
+            try:
+                cluster = cache.metrics.cluster_stats()
+            except RedisError as e:
+                mark_redis_down(e)
+        stats.append({'namespace': cache.namespace, 'cluster': cluster, 'worker': cache.stats()})
+    return stats
@@ -0,0 +1,163 @@
+"""
+Cache warm-up at startup and after scheduled data refreshes.
+
+The most-requested cached routes (device data for every fab, recipe lists for
+every fab and tool category, equipment storage/not_available, and the top-N
+opened recipes) are requested through the app's test client, which fills the
+response cache. Until the startup warm-up finishes, or WARMUP_TIMEOUT passes,
+other requests get 503 so a cold worker does not take traffic. The timeout
+is enforced by a timer, so one slow path cannot hold the worker past it.
+
+Recipe popularity is counted in a Redis sorted set by @track_popularity,
+for successful (200) responses only.
+"""
+import time
+import threading
+from functools import wraps
+from flask import request, make_response
+from redis.exceptions import RedisError
+from config import Config
+from .routes import FAB_LIST
+from .utils.redis_client import redis_client
+from .utils.two_tier_cache import redis_available, mark_redis_down
+from .utils.job_watchdog import check_cancelled
+from .utils.app_logger import logger
+
+TOOL_CATEGORIES = ['cd-sem', 'hv-sem', 'verity', 'provision']
+POPULARITY_KEY = 'warmup:popularity'
+READINESS_EXEMPT_PATHS = {'/', '/api/health', '/api/ready'}
+
+# Marks the test client's requests; cache_refresh makes cached routes recompute instead of reading
+WARMUP_ENVIRON = {'REMOTE_ADDR': '127.0.0.1', 'app.warmup': True}
+
+_ready = threading.Event()
+_app = None
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def is_warmup_request():
+    return bool(request.environ.get('app.warmup'))
+
+
+def track_popularity(name):
+    """Count successful requests per path in Redis so warm-up can pick the most-requested ones"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200 and not is_warmup_request() and redis_available():
+                try:
+                    redis_client.zincrby(f"{POPULARITY_KEY}:{name}", 1, request.path)
+                except RedisError as e:
+                    mark_redis_down(e)
+            return response
+        return wrapper
+    return decorator
+
+
+def most_requested(name, limit):
+    """The limit most-requested paths recorded by @track_popularity(name)"""
+    if limit <= 0 or not redis_available():
+        return []
+    try:
+        return redis_client.zrevrange(f"{POPULARITY_KEY}:{name}", 0, limit - 1)
+    except RedisError as e:
+        mark_redis_down(e)
+        return []
+
+
+def warmup_paths():
+    """Paths to precompute, cheapest and most shared first"""
+    paths = ['/api/equipment-status/storage', '/api/equipment-status/not_available']
+    paths += [f"/api/device-statistics/device-data?fac_id={fab}" for fab in FAB_LIST]
+    paths += [f"/api/recipe-search/{fab}/{category}" for fab in FAB_LIST for category in TOOL_CATEGORIES]
+    paths += most_requested('recipe_open', Config.WARMUP_TOP_RECIPES)
+    return paths
+
+
+def warm_cache(app, refresh=False, timeout=None):
+    """
+    Request every warm-up path through the test client.
+
+    Args:
+        app: Flask application
+        refresh: Recompute cached entries even if they are still fresh
+        timeout: Seconds after which the remaining paths are skipped
+
+    Returns:
+        dict: Counts of warmed, failed and skipped paths and the duration
+    """
+    started = time.monotonic()
+    environ = dict(WARMUP_ENVIRON, **{'app.cache_refresh': refresh})
+    client = app.test_client()
+    # The test client sends cookies from its own jar only, so a Cookie header would be dropped
+    client.set_cookie('LASTUSER', 'warmup')
+    result = {'warmed': 0, 'failed': 0, 'skipped': 0}
+
+    paths = warmup_paths()
+    for index, path in enumerate(paths):
+        check_cancelled()
+        if timeout is not None and time.monotonic() - started > timeout:
+            result['skipped'] = len(paths) - index
+            break
+        try:
+            response = client.get(path, environ_base=environ)
+            if response.status_code == 200:
+                result['warmed'] += 1
+            else:
+                result['failed'] += 1
+                logger.warning("Warm-up request failed", path=path, status=response.status_code)
+        except Exception as e:
+            result['failed'] += 1
+            logger.warning("Warm-up request failed", path=path, error=str(e))
+
+    result['duration'] = round(time.monotonic() - started, 3)
+    return result
+
+
+def _startup_warmup(app):
+    try:
+        result = warm_cache(app, timeout=Config.WARMUP_TIMEOUT)
+        if result['failed']:
+            logger.warning("Cache warm-up completed with failed paths", **result)
+        else:
+            logger.success("Cache warm-up completed", **result)
+    except Exception:
+        logger.exception("Cache warm-up failed")
+    finally:
+        _ready.set()
+
+
+def _warmup_deadline():
+    if not _ready.is_set():
+        logger.warning("Cache warm-up still running after its timeout, accepting traffic",
+                       timeout=Config.WARMUP_TIMEOUT)
+        _ready.set()
+
+
+def start_warmup(app):
+    """
+    Warm the cache in a background thread; the worker reports ready when it finishes
+    or after WARMUP_TIMEOUT seconds, whichever comes first.
+    """
+    global _app
+    _app = app
+    if not Config.WARMUP_ENABLED:
+        _ready.set()
+        return None
+    deadline = threading.Timer(Config.WARMUP_TIMEOUT, _warmup_deadline)
+    deadline.daemon = True
+    deadline.start()
+    thread = threading.Thread(target=_startup_warmup, args=(app,), name='cache-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def rewarm_cache():
+    """Recompute the warm-up entries after a data refresh (no-op before start_warmup)"""
+    if _app is None or not Config.WARMUP_ENABLED:
+        return None
+    return warm_cache(_app, refresh=True, timeout=Config.WARMUP_TIMEOUT)
@@ -9,6 +9,10 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key')
     DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
 
+    # Administrative endpoints (cache invalidation): LASTUSER IDs, comma-separated, or the X-Admin-Token header
+    ADMIN_USERS = [user.strip() for user in os.environ.get('ADMIN_USERS', '').split(',') if user.strip()]
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
     # Redis settings
     REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
     REDIS_PORT = int(os.environ.get('REDIS_PORT', 6379))
@@ -28,6 +32,56 @@ class Config:
     LOCK_RETRY_TIMES = 3
     LOCK_RETRY_DELAY = 1
 
+    # Scheduled job time budgets (add_scheduled_job(..., timeout=...) overrides per job)
+    JOB_TIMEOUT = int(os.environ.get('JOB_TIMEOUT', 1800))  # seconds before a run is cancelled
+    JOB_KILL_GRACE = int(os.environ.get('JOB_KILL_GRACE', 60))  # seconds after cancelling before kill/stalled
+
+    # Scheduler job store: memory, or sqlite (needs SQLAlchemy) to keep jobs and run history across restarts.
+    # APScheduler cannot share one persistent store between schedulers, so with several workers only the
+    # worker holding the Redis leader lock uses SQLite (and catches up missed runs); the others keep their
+    # jobs in memory. Without Redis every worker falls back to memory. Run history is written by all workers.
+    SCHEDULER_JOBSTORE = os.environ.get('SCHEDULER_JOBSTORE', 'memory')
+    SCHEDULER_DB_PATH = os.environ.get('SCHEDULER_DB_PATH', 'data/scheduler.sqlite')
+    JOB_HISTORY_KEEP_DAYS = int(os.environ.get('JOB_HISTORY_KEEP_DAYS', 30))
+    # Runs missed while the scheduler was down are caught up once, for jobs spaced at least
+    # CATCHUP_MIN_SPACING apart and missed within CATCHUP_MAX_AGE, CATCHUP_STAGGER seconds apart
+    SCHEDULER_CATCHUP_MIN_SPACING = int(os.environ.get('SCHEDULER_CATCHUP_MIN_SPACING', 3600))
+    SCHEDULER_CATCHUP_MAX_AGE = int(os.environ.get('SCHEDULER_CATCHUP_MAX_AGE', 24 * 3600))
+    SCHEDULER_CATCHUP_DELAY = int(os.environ.get('SCHEDULER_CATCHUP_DELAY', 60))  # seconds after startup
+    SCHEDULER_CATCHUP_STAGGER = int(os.environ.get('SCHEDULER_CATCHUP_STAGGER', 120))
+
+    # In-process cache tier in front of Redis (per worker)
+    LOCAL_CACHE_MAX_ENTRIES = int(os.environ.get('LOCAL_CACHE_MAX_ENTRIES', 1000))
+    LOCAL_CACHE_MAX_BYTES = int(os.environ.get('LOCAL_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    CACHE_COMPRESSION = os.environ.get('CACHE_COMPRESSION', 'gzip')  # gzip or zstd (needs zstandard)
+
+    # Cache warm-up at startup and after data refreshes
+    WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'true').lower() == 'true'
+    WARMUP_TOP_RECIPES = int(os.environ.get('WARMUP_TOP_RECIPES', 20))
+    WARMUP_TIMEOUT = int(os.environ.get('WARMUP_TIMEOUT', 120))  # seconds before traffic is let through anyway
+
+    # Versioned results published by scheduled jobs (redis or disk)
+    JOB_RESULT_BACKEND = os.environ.get('JOB_RESULT_BACKEND', 'redis')
+    JOB_RESULT_DIR = os.environ.get('JOB_RESULT_DIR', 'data/job_results')  # shared disk for the disk backend
+    JOB_RESULT_KEEP = int(os.environ.get('JOB_RESULT_KEEP', 10))  # versions kept per job
+    JOB_RESULT_MAX_AGE = int(os.environ.get('JOB_RESULT_MAX_AGE', 7 * 24 * 3600))  # seconds
+
+    # Recipe file parsing (real data source)
+    RECIPE_ROOT = os.environ.get('RECIPE_ROOT', '')
+    RECIPE_PARSE_TIMEOUT = int(os.environ.get('RECIPE_PARSE_TIMEOUT', 30))  # seconds per file
+
+    # SkewVoir columnar storage (Parquet files converted from CSV imports)
+    SKEWVOIR_DATA_DIR = os.environ.get('SKEWVOIR_DATA_DIR', 'data/skewvoir')
+    SKEWVOIR_INGEST_DIR = os.environ.get('SKEWVOIR_INGEST_DIR', '')  # Incoming per-lot MSR result files
+    SKEWVOIR_INGEST_CHUNK_SIZE = int(os.environ.get('SKEWVOIR_INGEST_CHUNK_SIZE', 100000))  # rows per chunk
+    SKEWVOIR_MEAS_HIST_CSV = os.environ.get('SKEWVOIR_MEAS_HIST_CSV', '')  # Measurement history export
+
+    # Measurement image serving (SEM images referenced by MSR data and recipes)
+    IMAGE_ROOT = os.environ.get('IMAGE_ROOT', '')
+    THUMBNAIL_CACHE_DIR = os.environ.get('THUMBNAIL_CACHE_DIR', 'data/thumbnails')
+    THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get('THUMBNAIL_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+    THUMBNAIL_TIMEOUT = int(os.environ.get('THUMBNAIL_TIMEOUT', 30))  # seconds per thumbnail
+
     # Data source configuration
     # Controlled by DATA_SOURCE_MODE environment variable
     @staticmethod
@@ -1,15 +1,20 @@
 import os
 import atexit
-from flask import Flask, request, redirect
+from flask import Flask, request, redirect, jsonify
 from flask_cors import CORS
 from config import Config
 from api.routes import api_bp
 from api.equipment_status.routes import equipment_status_bp
 from api.device_statistics.routes import device_statistics_bp
 from api.recipe_search.routes import recipe_search_bp
+from api.skewvoir_beta.routes import skewvoir_bp
+from api.fail_issue.routes import fail_issue_bp
+from api.images.routes import images_bp
 from api.utils.app_logger import logger, cleanup_logger
+from api.utils.compression import compress_response
 from api.utils.scheduler import scheduler_manager, get_scheduler
 from api.scheduled_tasks import register_scheduled_tasks
+from api.warmup import start_warmup, is_ready, is_warmup_request, READINESS_EXEMPT_PATHS
 
 
 def create_app():
@@ -31,6 +36,9 @@ def create_app():
     app.register_blueprint(equipment_status_bp, url_prefix='/api/equipment-status')
     app.register_blueprint(device_statistics_bp, url_prefix='/api/device-statistics')
     app.register_blueprint(recipe_search_bp, url_prefix='/api/recipe-search')
+    app.register_blueprint(skewvoir_bp, url_prefix='/api/skewvoir')
+    app.register_blueprint(fail_issue_bp, url_prefix='/api/fail-issue')
+    app.register_blueprint(images_bp, url_prefix='/api/images')
 
     @app.before_request
     def force_http():
@@ -38,6 +46,19 @@ def create_app():
         if request.is_secure:
             return redirect(request.url.replace('https://', 'http://'), code=301)
 
+    @app.before_request
+    def hold_until_ready():
+        """Answer 503 until this worker's cache warm-up has finished"""
+        if is_ready() or request.path in READINESS_EXEMPT_PATHS or is_warmup_request():
+            return None
+        return jsonify({
+            'status': 'error',
+            'message': 'Server is warming up, retry shortly'
+        }), 503, {'Retry-After': '5'}
+
+    # Compress JSON/CSV responses for clients that accept gzip (or zstd)
+    app.after_request(compress_response)
+
     @app.route('/')
     def index():
         return {'message': 'Flask server with scheduler is running'}
@@ -48,25 +69,19 @@ def create_app():
 def setup_scheduler(app):
     """
     Initialize and configure the APScheduler.
+
+    Every worker runs a scheduler; duplicate runs are prevented by the
+    per-job Redis lock taken in SchedulerManager.add_job.
     """
-    # In production with uWSGI, check if we're in the main worker
-    # to avoid duplicate scheduled tasks
-    try:
-        import uwsgi
-        # Only initialize scheduler in the first worker
-        if uwsgi.worker_id() != 1:
-            logger.info(f"Skipping scheduler initialization in worker {uwsgi.worker_id()}")
-            return None
-    except ImportError:
-        # Not running under uWSGI (development mode)
-        pass
-    
     try:
         # Initialize the scheduler
         scheduler = scheduler_manager.init_scheduler()
         
         # Register all scheduled tasks
         register_scheduled_tasks()
+
+        # Catch up runs missed while down, then start running jobs
+        scheduler_manager.recover_missed_runs()
         
         # Store scheduler reference in app
         app.scheduler = scheduler
@@ -88,9 +103,11 @@ application = create_app()
 if __name__ == '__main__':
     # Development mode (not uWSGI)
     setup_scheduler(application)
+    start_warmup(application)
     # Register cleanup on exit
     atexit.register(cleanup_logger)
     application.run(host='0.0.0.0', port=5000, debug=True)
 else:
     # Production mode (uWSGI)
-    setup_scheduler(application)
\ No newline at end of file
+    setup_scheduler(application)
+    start_warmup(application)